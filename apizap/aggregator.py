@@ -0,0 +1,148 @@
+"""Потоковая агрегация результатов тестирования за один проход."""
+
+import threading
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from .histogram import LatencyHistogram
+from .results import status_class
+
+
+OUTCOMES = ('PASS', 'WARN', 'FAIL')
+
+# Измерения, по которым группируются результаты
+GROUP_DIMENSIONS = ('tag', 'path', 'status_class', 'method')
+
+
+class GroupStats:
+    """Счетчики исходов и гистограмма задержек одной группы."""
+
+    __slots__ = ('count', 'outcomes', 'latency')
+
+    def __init__(self):
+        self.count = 0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.latency = LatencyHistogram()
+
+    def add(self, outcome: str, response_time: Optional[float]) -> None:
+        self.count += 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if response_time:
+            self.latency.record(response_time)
+
+    def merge(self, other: 'GroupStats') -> None:
+        """Добавляет счетчики и задержки другой группы."""
+        self.count += other.count
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'total': self.count,
+            'passed': self.outcomes['PASS'],
+            'warnings': self.outcomes['WARN'],
+            'failed': self.outcomes['FAIL'],
+            'success_rate': round(self.outcomes['PASS'] / self.count * 100, 2) if self.count else 0.0
+        }
+        data.update(self.latency.to_dict())
+        return data
+
+
+class ResultAggregator:
+    """Инкрементальный агрегатор результатов.
+
+    Принимает результаты по мере их появления (подходит в качестве хука
+    APITester) и за один проход поддерживает сводку, распределение
+    статус-кодов, гистограмму задержек и группировки по тегу, пути, классу
+    статус-кода и методу. Все форматы отчетов строятся из агрегатора.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.total_time = 0.0
+        self.status_codes: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.groups: Dict[str, Dict[str, GroupStats]] = {name: {} for name in GROUP_DIMENSIONS}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_results(cls, results: Iterable[Mapping[str, Any]]) -> 'ResultAggregator':
+        """Строит агрегатор по готовому списку результатов."""
+        aggregator = cls()
+        for result in results:
+            aggregator.add(result)
+        return aggregator
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """Учитывает один результат."""
+        outcome = result['status']
+        response_time = result.get('response_time')
+        status_code = result.get('status_code')
+        keys = (
+            ('path', result['path']),
+            ('status_class', status_class(status_code)),
+            ('method', result['method']),
+        )
+        tags = result.get('tags') or ('default',)
+
+        with self._lock:
+            self.total += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            if response_time:
+                self.total_time += response_time
+                self.latency.record(response_time)
+            if status_code:
+                code = str(status_code)
+                self.status_codes[code] = self.status_codes.get(code, 0) + 1
+
+            for tag in tags:
+                self._group('tag', tag).add(outcome, response_time)
+            for dimension, key in keys:
+                self._group(dimension, key).add(outcome, response_time)
+
+    __call__ = add
+
+    def _group(self, dimension: str, key: str) -> GroupStats:
+        groups = self.groups[dimension]
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = GroupStats()
+        return stats
+
+    # --- Представления для отчетов --------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Сводная статистика в полях JSON отчета."""
+        total = self.total
+        passed = self.outcomes['PASS']
+        return {
+            "total_tests": total,
+            "passed": passed,
+            "warnings": self.outcomes['WARN'],
+            "failed": self.outcomes['FAIL'],
+            "success_rate": round(passed / total * 100, 2) if total else 0.0,
+            "total_time_ms": round(self.total_time, 2),
+            "average_time_ms": round(self.total_time / total, 2) if total else 0.0
+        }
+
+    def status_code_distribution(self) -> Dict[str, int]:
+        """Распределение статус-кодов в порядке первого появления."""
+        return dict(self.status_codes)
+
+    def response_time_stats(self) -> Dict[str, float]:
+        """Минимум, максимум, среднее и перцентили измеренных задержек."""
+        return self.latency.to_dict()
+
+    def group_stats(self, dimension: str) -> Dict[str, Dict[str, Any]]:
+        """Статистика по группам одного измерения, отсортированная по ключу."""
+        return {key: stats.to_dict() for key, stats in sorted(self.groups[dimension].items())}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Полная сводка агрегатора."""
+        return {
+            'summary': self.summary(),
+            'status_code_distribution': self.status_code_distribution(),
+            'response_time_stats': self.response_time_stats(),
+            'groups': {f"by_{dimension}": self.group_stats(dimension) for dimension in GROUP_DIMENSIONS}
+        }
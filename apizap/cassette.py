@@ -0,0 +1,229 @@
+"""Кассеты: запись HTTP обменов и их воспроизведение без сети.
+
+Кассета подключается к сессии requests в APITester как транспортный адаптер.
+В режиме записи запросы уходят в сеть, а каждый обмен дописывается в файл
+одной строкой JSON (тело ответа сжато zlib). В режиме воспроизведения
+ответы отдаются из файла с записанной или нулевой задержкой, так что
+прогоны разных версий и настроек APIZap сравниваются на одних и тех же
+ответах, без зависимости от живого API.
+
+В конце записи в файл добавляется индекс: ключ запроса -> смещения строк.
+При воспроизведении в памяти держится только индекс, а строка ответа
+читается по смещению, поэтому поиск не зависит от размера кассеты. Если
+запись была прервана и индекса нет, он восстанавливается одним проходом
+по файлу.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import timedelta
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from loguru import logger
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+CASSETTE_MODES = ('record', 'replay')
+CASSETTE_LATENCIES = ('recorded', 'zero')
+
+# Последняя строка файла: смещение строки индекса фиксированной ширины
+_FOOTER_PREFIX = b'APIZAP-CASSETTE-INDEX '
+_FOOTER_SIZE = len(_FOOTER_PREFIX) + 20 + 1
+
+
+class CassetteMiss(RequestsConnectionError):
+    """В кассете нет ответа на запрос."""
+
+
+def request_key(request: PreparedRequest) -> str:
+    """Ключ запроса: метод, URL с упорядоченной query-строкой и хэш тела.
+
+    Заголовки в ключ не входят: traceparent и подобные меняются от прогона
+    к прогону.
+    """
+    parts = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{request.method} {parts.scheme}://{parts.netloc}{parts.path}"
+    if query:
+        key += f"?{query}"
+    body = request.body
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += f" #{hashlib.sha1(body).hexdigest()[:16]}"
+    return key
+
+
+class Cassette:
+    """Файл кассеты в режиме записи или воспроизведения."""
+
+    def __init__(self, path: str, mode: str = 'replay', latency: str = 'recorded'):
+        """Открывает кассету.
+
+        Args:
+            path: Путь к файлу кассеты
+            mode: record - записывать обмены, replay - отдавать ответы из файла
+            latency: При воспроизведении: recorded - выдерживать записанную
+                задержку ответа, zero - отвечать сразу
+
+        Raises:
+            ValueError: Если режим неизвестен или файл не является кассетой
+            OSError: Если файл не удалось открыть
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        if latency not in CASSETTE_LATENCIES:
+            raise ValueError(f"Неизвестный режим задержки кассеты: {latency}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.index: Dict[str, List[int]] = {}
+        self.misses = 0
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if mode == 'record':
+            self._file = open(path, 'wb')
+        else:
+            self._file = open(path, 'rb')
+            self._load_index()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self.index.values())
+
+    def __enter__(self) -> 'Cassette':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def adapter(self) -> 'CassetteAdapter':
+        """Транспортный адаптер для сессии requests."""
+        return CassetteAdapter(self)
+
+    def record(self, key: str, response: Response) -> None:
+        """Дописывает обмен в кассету."""
+        entry = {
+            'k': key,
+            's': response.status_code,
+            'r': response.reason,
+            'h': dict(response.headers),
+            'e': round(response.elapsed.total_seconds() * 1000, 3),
+            'b': base64.b64encode(zlib.compress(response.content or b'')).decode('ascii')
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._lock:
+            self.index.setdefault(key, []).append(self._file.tell())
+            self._file.write(line)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Следующий записанный ответ на запрос с этим ключом.
+
+        Повторные одинаковые запросы получают ответы в порядке записи, а
+        после последнего - снова последний.
+
+        Returns:
+            Запись обмена или None, если ключа нет в кассете
+        """
+        with self._lock:
+            offsets = self.index.get(key)
+            if not offsets:
+                self.misses += 1
+                return None
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            self._file.seek(offsets[min(position, len(offsets) - 1)])
+            line = self._file.readline()
+        return json.loads(line)
+
+    def close(self) -> None:
+        """Закрывает файл; при записи добавляет индекс."""
+        with self._lock:
+            if self._file.closed:
+                return
+            if self.mode == 'record':
+                offset = self._file.tell()
+                self._file.write(json.dumps({'index': self.index}, separators=(',', ':')).encode('utf-8') + b'\n')
+                self._file.write(_FOOTER_PREFIX + f"{offset:020d}".encode('ascii') + b'\n')
+            self._file.close()
+
+    def _load_index(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        if size >= _FOOTER_SIZE:
+            self._file.seek(size - _FOOTER_SIZE)
+            footer = self._file.read(_FOOTER_SIZE)
+            if footer.startswith(_FOOTER_PREFIX):
+                self._file.seek(int(footer[len(_FOOTER_PREFIX):]))
+                self.index = json.loads(self._file.readline())['index']
+                return
+
+        # Запись прервана до индекса: восстанавливаем его по строкам обменов
+        # (последняя строка могла оборваться на середине - она пропускается)
+        self._file.seek(0)
+        offset = 0
+        for number, line in enumerate(self._file, 1):
+            try:
+                key = json.loads(line)['k']
+            except (ValueError, KeyError, TypeError):
+                if number == 1:
+                    raise ValueError(f"{self.path}: файл не является кассетой APIZap") from None
+                logger.warning(f"{self.path}:{number}: поврежденная запись кассеты пропущена")
+            else:
+                self.index.setdefault(key, []).append(offset)
+            offset += len(line)
+
+
+class CassetteAdapter(BaseAdapter):
+    """Транспортный адаптер requests поверх кассеты."""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+        self._http = HTTPAdapter() if cassette.mode == 'record' else None
+
+    def send(self, request: PreparedRequest, stream: bool = False, timeout: Any = None,
+             verify: Any = True, cert: Any = None, proxies: Any = None) -> Response:
+        key = request_key(request)
+        if self._http is not None:
+            response = self._http.send(request, stream=stream, timeout=timeout,
+                                       verify=verify, cert=cert, proxies=proxies)
+            self.cassette.record(key, response)
+            return response
+
+        entry = self.cassette.lookup(key)
+        if entry is None:
+            raise CassetteMiss(f"Запрос отсутствует в кассете: {key}", request=request)
+        if self.cassette.latency == 'recorded' and entry['e']:
+            time.sleep(entry['e'] / 1000)
+        return self._build_response(request, entry)
+
+    def _build_response(self, request: PreparedRequest, entry: Dict[str, Any]) -> Response:
+        content = zlib.decompress(base64.b64decode(entry['b']))
+        response = Response()
+        response.status_code = entry['s']
+        response.reason = entry.get('r')
+        response.headers = CaseInsensitiveDict(entry['h'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(milliseconds=entry['e'])
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        if self._http is not None:
+            self._http.close()
@@ -0,0 +1,142 @@
+"""Контрольные точки прогона для продолжения после прерывания.
+
+Каждый завершенный запрос дописывается в файл JSON Lines (ключ операции и
+результат). Запись буферизуется и сбрасывается на диск каждые несколько
+результатов или секунд, так что при падении теряется не больше одной
+порции. Файл только дописывается, поэтому оборванная последняя строка не
+портит предыдущие: при чтении она пропускается, а перед продолжением
+записи отрезается. С --resume завершенные операции пропускаются, а их
+результаты попадают в итоговый отчет.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from .results import TestResult
+
+
+def checkpoint_key(item: Mapping[str, Any]) -> str:
+    """Ключ операции или результата в контрольной точке.
+
+    Описание входит в ключ, чтобы различать наборы параметров одной операции
+    (--pairwise добавляет их к summary).
+    """
+    return f"{item.get('operation_id') or item['method'] + ' ' + item['path']} {item.get('summary') or ''}".rstrip()
+
+
+def load_checkpoint(path: str) -> Dict[str, TestResult]:
+    """Читает результаты из файла контрольной точки.
+
+    Returns:
+        Отображение ключ операции -> результат (пустое, если файла нет)
+    """
+    completed: Dict[str, TestResult] = {}
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return completed
+
+    with f:
+        for number, line in enumerate(f, 1):
+            try:
+                entry = json.loads(line)
+                completed[entry['key']] = TestResult.from_dict(entry['result'])
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"{path}:{number}: поврежденная запись контрольной точки пропущена")
+    return completed
+
+
+def _trim_partial_line(path: str, chunk_size: int = 65536) -> None:
+    """Отрезает оборванную последнюю строку, чтобы новые записи не склеились с ней."""
+    try:
+        f = open(path, 'rb+')
+    except FileNotFoundError:
+        return
+
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            logger.warning(f"{path}: оборванная последняя запись контрольной точки удалена")
+            f.truncate(position)
+
+
+class Checkpoint:
+    """Дописывает результаты в файл контрольной точки (хук результатов)."""
+
+    def __init__(self, path: str, resume: bool = False, flush_every: int = 50, flush_interval: float = 5.0):
+        """Открывает файл контрольной точки.
+
+        Args:
+            path: Путь к файлу JSON Lines
+            resume: Дописывать к существующему файлу (иначе он перезаписывается)
+            flush_every: Сбрасывать на диск после стольких результатов
+            flush_interval: Сбрасывать на диск не реже раза в столько секунд
+        """
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._pending = 0
+        self._next_flush = time.monotonic() + flush_interval
+        self._lock = threading.Lock()
+        if resume:
+            _trim_partial_line(path)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def __call__(self, result: Mapping[str, Any]) -> None:
+        self.add(result)
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """Записывает завершенный запрос."""
+        data = result.to_dict() if isinstance(result, TestResult) else dict(result)
+        data.pop('exchange', None)
+        line = json.dumps({'key': checkpoint_key(result), 'result': data}, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.written += 1
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= self.flush_every or now >= self._next_flush:
+                self._file.flush()
+                self._pending = 0
+                self._next_flush = now + self.flush_interval
+
+    def close(self) -> None:
+        """Сбрасывает буфер и закрывает файл."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def split_completed(
+    operations: List[Dict[str, Any]],
+    completed: Mapping[str, TestResult]
+) -> Tuple[List[Dict[str, Any]], List[TestResult]]:
+    """Делит операции на оставшиеся и уже выполненные.
+
+    Returns:
+        (операции для запуска, результаты выполненных в порядке операций)
+    """
+    remaining = []
+    previous: List[TestResult] = []
+    for operation_info in operations:
+        result: Optional[TestResult] = completed.get(checkpoint_key(operation_info))
+        if result is None:
+            remaining.append(operation_info)
+        else:
+            previous.append(result)
+    return remaining, previous
@@ -1,20 +1,46 @@
 #!/usr/bin/env python3
-"""Главный CLI интерфейс для APIZap."""
+"""Главный CLI интерфейс для APIZap.
+
+На уровне модуля импортируется только click: requests, pydantic и loguru
+загружаются внутри команд, которым они нужны. Благодаря этому --version,
+--help и легкие команды запускаются быстро. Время импорта отслеживается
+скриптом benchmarks/import_time.py и тестом tests/test_cli_startup.py.
+"""
 
-import json
 import sys
-from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
-from loguru import logger
 
-from .parser import OpenAPIParser
-from .tester import APITester
-from .reporter import TestReporter
+
+class DefaultCommandGroup(click.Group):
+    """Группа команд, которая по умолчанию запускает команду тестирования.
+
+    Сохраняет прежний вызов ``apizap --url ...`` без имени подкоманды.
+    """
+
+    def __init__(self, *args, default_command: str = 'run', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list) -> list:
+        if not args or (args[0] not in self.commands and args[0] not in ('--help', '--version')):
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup)
+@click.version_option(version='1.0.0', prog_name='APIZap')
+def main():
+    """APIZap - Автоматический генератор тестов для API.
+    
+    Без имени команды выполняется команда run:
+    
+        apizap --url https://petstore.swagger.io/v2/swagger.json
+    """
 
 
-@click.command()
+@main.command('run', short_help='Тестирует все эндпоинты API (команда по умолчанию).')
 @click.option(
     '--url', '-u',
     required=True,
@@ -55,8 +81,224 @@ from .reporter import TestReporter
     is_flag=True,
     help='Подробный вывод с дополнительной информацией'
 )
-@click.version_option(version='1.0.0', prog_name='APIZap')
-def main(
+@click.option(
+    '--metrics-port',
+    type=int,
+    help='Порт HTTP эндпоинта /metrics (OpenMetrics/Prometheus) во время тестирования'
+)
+@click.option(
+    '--metrics-host',
+    default='127.0.0.1',
+    help='Адрес эндпоинта /metrics (по умолчанию: 127.0.0.1)'
+)
+@click.option(
+    '--trace-file',
+    help='Файл для выгрузки span\'ов запросов в формате OTLP/JSON (работает без сети)'
+)
+@click.option(
+    '--otlp-endpoint',
+    help='Адрес OTLP/HTTP коллектора для выгрузки span\'ов (например: http://localhost:4318)'
+)
+@click.option(
+    '--profile', 'profile',
+    is_flag=True,
+    help='Профилировать фазы APIZap (load, validate, enumerate, prepare, send, analyze, report)'
+)
+@click.option(
+    '--profile-file',
+    default='apizap_profile.json',
+    help='Файл профиля фаз (по умолчанию: apizap_profile.json)'
+)
+@click.option(
+    '--profile-cprofile',
+    is_flag=True,
+    help='Дополнительно сохранить статистику cProfile по каждой фазе (*.<фаза>.prof)'
+)
+@click.option(
+    '--profile-memory',
+    is_flag=True,
+    help='Дополнительно измерять пик памяти (tracemalloc) по каждой фазе'
+)
+@click.option(
+    '--columnar-file',
+    help='Сохранить результаты в колоночном формате (.npz или .parquet) для анализа в блокнотах'
+)
+@click.option(
+    '--log-mode',
+    type=click.Choice(['full', 'hot']),
+    default='full',
+    help='Логирование: full - строка на каждый запрос; hot - выборочные строки, прогресс и запись через очередь'
+)
+@click.option(
+    '--log-sample',
+    default=100,
+    help='В режиме hot логировать каждый N-й запрос (FAIL - всегда, по умолчанию: 100)'
+)
+@click.option(
+    '--progress-interval',
+    default=5.0,
+    help='В режиме hot период строки прогресса в секундах (по умолчанию: 5)'
+)
+@click.option(
+    '--include-tag',
+    multiple=True,
+    help='Тестировать только операции с тегом (можно указать несколько раз)'
+)
+@click.option(
+    '--exclude-tag',
+    multiple=True,
+    help='Пропустить операции с тегом (можно указать несколько раз)'
+)
+@click.option(
+    '--path',
+    'path_patterns',
+    multiple=True,
+    help='Префикс пути или glob-шаблон по сегментам, например /pets, /pets/*/photos или /pets/** (можно указать несколько раз)'
+)
+@click.option(
+    '--method',
+    multiple=True,
+    help='Тестировать только указанные HTTP методы (можно указать несколько раз)'
+)
+@click.option(
+    '--operation-id',
+    multiple=True,
+    help='Тестировать только операции с указанным operationId (можно указать несколько раз)'
+)
+@click.option(
+    '--sample',
+    help='Стратифицированная выборка операций: количество (200) или доля (5%)'
+)
+@click.option(
+    '--sample-seed',
+    default=0,
+    help='Seed выборки операций (по умолчанию: 0)'
+)
+@click.option(
+    '--history',
+    'history_file',
+    help='JSON отчет прошлого прогона: веса выборки и порядок операций'
+)
+@click.option(
+    '--workers', '-w',
+    default=1,
+    help='Количество параллельных исполнителей (по умолчанию: 1)'
+)
+@click.option(
+    '--order',
+    type=click.Choice(['spec', 'slowest-first', 'failures-first']),
+    default='spec',
+    help='Порядок запуска: spec - как в спецификации; slowest-first и failures-first - по --history'
+)
+@click.option(
+    '--fail-fast',
+    type=int,
+    help='Не запускать новые операции после указанного количества неудачных'
+)
+@click.option(
+    '--workflow',
+    is_flag=True,
+    help='Связывать операции (POST -> /{id}, OpenAPI links) и выполнять их как граф с очисткой в конце'
+)
+@click.option(
+    '--validate-responses',
+    is_flag=True,
+    help='Проверять тела успешных ответов по схемам из спецификации'
+)
+@click.option(
+    '--validate-sample',
+    default=1,
+    help='Проверять схему у каждого N-го ответа (по умолчанию: 1 - у всех)'
+)
+@click.option(
+    '--data-seed',
+    default=0,
+    help='Seed генерации параметров и тел запросов по схемам (по умолчанию: 0)'
+)
+@click.option(
+    '--pairwise',
+    is_flag=True,
+    help='Покрывать комбинации значений параметров (enum, границы, отсутствие необязательных)'
+)
+@click.option(
+    '--strength',
+    default=2,
+    help='Сила покрытия для --pairwise: 2 - все пары параметров, 3 - все тройки (по умолчанию: 2)'
+)
+@click.option(
+    '--max-combinations',
+    default=32,
+    help='Предельное количество запросов на операцию для --pairwise (по умолчанию: 32)'
+)
+@click.option(
+    '--all-servers',
+    is_flag=True,
+    help='Тестировать все серверы спецификации одновременно и сравнить задержки'
+)
+@click.option(
+    '--compare',
+    'compare_urls',
+    nargs=2,
+    metavar='URL_A URL_B',
+    help='A/B сравнение: отправлять каждый запрос на два базовых URL поочередно'
+)
+@click.option(
+    '--compare-rounds',
+    default=10,
+    help='Количество пар запросов на операцию в режиме --compare (по умолчанию: 10)'
+)
+@click.option(
+    '--rate',
+    help='Нагрузка с открытым циклом: постоянная интенсивность, например 500/s или 30000/min'
+)
+@click.option(
+    '--duration',
+    default='30s',
+    help='Длительность нагрузки --rate: 30s, 5m, 1h (по умолчанию: 30s)'
+)
+@click.option(
+    '--max-in-flight',
+    default=100,
+    help='Наибольшее число одновременных запросов в режиме --rate (по умолчанию: 100)'
+)
+@click.option(
+    '--load-profile',
+    help='Профиль нагрузки: файл YAML/JSON со стадиями или запись вида ramp:500/s:2m,hold:500/s:10m,soak:50u:12h'
+)
+@click.option(
+    '--timeseries-file',
+    help='Файл JSON Lines для посекундного временного ряда --load-profile'
+)
+@click.option(
+    '--mix',
+    'mix_rules',
+    multiple=True,
+    help='Вес операций в нагрузке: getItems=80, "GET /items=80", tag:admin=0, method:DELETE=1 или файл YAML/JSON'
+)
+@click.option(
+    '--record-cassette',
+    help='Записать все HTTP обмены прогона в файл кассеты'
+)
+@click.option(
+    '--replay-cassette',
+    help='Отвечать на запросы из файла кассеты без обращения к API'
+)
+@click.option(
+    '--cassette-latency',
+    type=click.Choice(['recorded', 'zero']),
+    default='recorded',
+    help='Задержка ответов из кассеты: recorded - как при записи, zero - без задержки (по умолчанию: recorded)'
+)
+@click.option(
+    '--checkpoint-file',
+    help='Дописывать результаты завершенных операций в файл контрольной точки (JSON Lines)'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Продолжить прерванный прогон: пропустить операции из --checkpoint-file и включить их результаты в отчет'
+)
+def run(
     url: str,
     auth_type: str,
     auth_token: Optional[str],
@@ -64,7 +306,51 @@ def main(
     output: str,
     output_file: Optional[str],
     timeout: int,
-    verbose: bool
+    verbose: bool,
+    metrics_port: Optional[int],
+    metrics_host: str,
+    trace_file: Optional[str],
+    otlp_endpoint: Optional[str],
+    profile: bool,
+    profile_file: str,
+    profile_cprofile: bool,
+    profile_memory: bool,
+    columnar_file: Optional[str],
+    log_mode: str,
+    log_sample: int,
+    progress_interval: float,
+    include_tag: Tuple[str, ...],
+    exclude_tag: Tuple[str, ...],
+    path_patterns: Tuple[str, ...],
+    method: Tuple[str, ...],
+    operation_id: Tuple[str, ...],
+    sample: Optional[str],
+    sample_seed: int,
+    history_file: Optional[str],
+    workers: int,
+    order: str,
+    fail_fast: Optional[int],
+    workflow: bool,
+    validate_responses: bool,
+    validate_sample: int,
+    data_seed: int,
+    pairwise: bool,
+    strength: int,
+    max_combinations: int,
+    all_servers: bool,
+    compare_urls: Optional[Tuple[str, str]],
+    compare_rounds: int,
+    rate: Optional[str],
+    duration: str,
+    max_in_flight: int,
+    load_profile: Optional[str],
+    timeseries_file: Optional[str],
+    mix_rules: Tuple[str, ...],
+    record_cassette: Optional[str],
+    replay_cassette: Optional[str],
+    cassette_latency: str,
+    checkpoint_file: Optional[str],
+    resume: bool
 ):
     """APIZap - Автоматический генератор тестов для API.
     
@@ -79,11 +365,22 @@ def main(
         
         apizap --url https://api.example.com/swagger.json --output json --output-file results.json
     """
+    from pathlib import Path
+    
+    from loguru import logger
+    
+    from .aggregator import ResultAggregator
+    from .log import configure_logging
+    from .parser import OpenAPIParser
+    from .profiling import profile_phase
+    from .reporter import TestReporter
+    from .selection import OperationSelector
+    from .tester import APITester
+    
     # Настройка логирования
-    if verbose:
-        logger.add(sys.stderr, level="DEBUG")
-    else:
-        logger.add(sys.stderr, level="INFO")
+    hot_path = log_mode == 'hot'
+    configure_logging(verbose=verbose, enqueue=hot_path)
+    checkpoint = None
     
     try:
         # Валидация параметров аутентификации
@@ -91,12 +388,27 @@ def main(
             click.echo("❌ Ошибка: Для типа аутентификации '{}' необходимо указать токен с помощью --auth-token".format(auth_type), err=True)
             sys.exit(1)
         
+        profiler = None
+        if profile or profile_cprofile or profile_memory:
+            from .profiling import PhaseProfiler
+            
+            profiler = PhaseProfiler(cprofile=profile_cprofile, memory=profile_memory)
+        
         click.echo("🚀 Запуск APIZap...")
         click.echo(f"📡 Загрузка OpenAPI спецификации: {url}")
         
+        # Отбор операций выполняется по сырой спецификации до валидации
+        selector = OperationSelector(
+            include_tags=include_tag,
+            exclude_tags=exclude_tag,
+            paths=path_patterns,
+            methods=method,
+            operation_ids=operation_id
+        )
+        
         # Парсинг OpenAPI спецификации
-        parser = OpenAPIParser()
-        spec = parser.parse(url)
+        parser = OpenAPIParser(profiler=profiler)
+        spec = parser.parse(url, selector=selector)
         
         if not spec:
             click.echo("❌ Не удалось загрузить или распарсить OpenAPI спецификацию", err=True)
@@ -105,6 +417,35 @@ def main(
         click.echo(f"✅ Спецификация успешно загружена: {spec.info.title} v{spec.info.version}")
         click.echo(f"📊 Найдено эндпоинтов: {len(spec.paths)}")
         
+        if not selector.is_empty and not spec.paths:
+            click.echo("❌ Ни одна операция не подходит под заданные фильтры", err=True)
+            sys.exit(1)
+        
+        history = None
+        if history_file:
+            from .history import RunHistory
+            
+            try:
+                history = RunHistory.load(history_file)
+            except ValueError as e:
+                click.echo(f"❌ {e}", err=True)
+                sys.exit(1)
+            click.echo(f"🕘 История прогона: {len(history)} операций из {history_file}")
+        
+        operations = parser.get_all_operations(spec)
+        if sample:
+            from .sampling import StratifiedSampler, parse_sample_size
+            
+            try:
+                sample_size = parse_sample_size(sample)
+            except ValueError:
+                click.echo(f"❌ Ошибка: некорректный размер выборки '{sample}', ожидается число или процент (например, 200 или 5%)", err=True)
+                sys.exit(1)
+            
+            total_operations = len(operations)
+            operations = StratifiedSampler(seed=sample_seed, history=history).sample(operations, sample_size)
+            click.echo(f"🎲 Выборка: {len(operations)} из {total_operations} операций (seed {sample_seed})")
+        
         # Настройка аутентификации
         auth_config = None
         if auth_type != 'none' and auth_token:
@@ -115,17 +456,298 @@ def main(
             }
             click.echo(f"🔐 Аутентификация: {auth_type}")
         
+        # Экспорт метрик в реальном времени
+        metrics_server = None
+        aggregator = ResultAggregator()
+        result_hooks = [aggregator.add]
+        if metrics_port is not None:
+            from .metrics import MetricsRegistry, MetricsServer
+            
+            registry = MetricsRegistry()
+            metrics_server = MetricsServer(registry, port=metrics_port, host=metrics_host).start()
+            result_hooks.append(registry.observe)
+            click.echo(f"📡 Метрики: http://{metrics_host}:{metrics_server.port}/metrics")
+        
+        # Трассировка запросов
+        tracer = None
+        if trace_file or otlp_endpoint:
+            from .tracing import FileSpanExporter, OTLPHttpSpanExporter, Tracer
+            
+            exporters = []
+            if trace_file:
+                exporters.append(FileSpanExporter(trace_file))
+            if otlp_endpoint:
+                exporters.append(OTLPHttpSpanExporter(otlp_endpoint))
+            tracer = Tracer(exporters)
+            click.echo(f"🔎 Трассировка: {', '.join(filter(None, [trace_file, otlp_endpoint]))}")
+        
+        # Генерация данных и проверка ответов по схемам
+        from .datagen import DataGenerator
+        from .schema import SchemaResolver
+        
+        schema_resolver = SchemaResolver.from_spec(spec)
+        data_generator = DataGenerator(schema_resolver, seed=data_seed)
+        response_validator = None
+        if validate_responses:
+            from .validation import ResponseValidator
+            
+            response_validator = ResponseValidator(schema_resolver, sample_every=validate_sample)
+            click.echo(f"📐 Проверка схем ответов: каждый {response_validator.sample_every}-й ответ")
+        
+        # Комбинаторное покрытие параметров
+        if pairwise and workflow:
+            click.echo("⚠️  В режиме --workflow комбинации параметров не перебираются, --pairwise не учитывается")
+        elif pairwise:
+            from .coverage import CoveragePlanner
+            
+            planner = CoveragePlanner(
+                strength=strength,
+                max_cases=max_combinations,
+                seed=data_seed,
+                resolver=schema_resolver
+            )
+            total_operations = len(operations)
+            operations = planner.expand(operations)
+            click.echo(f"🧩 Покрытие комбинаций (t={strength}): {len(operations)} запросов для {total_operations} операций")
+        
+        # Запись или воспроизведение HTTP обменов
+        cassette = None
+        if record_cassette and replay_cassette:
+            click.echo("❌ Ошибка: --record-cassette и --replay-cassette нельзя указывать вместе", err=True)
+            sys.exit(1)
+        elif record_cassette or replay_cassette:
+            from .cassette import Cassette
+            
+            try:
+                cassette = Cassette(
+                    record_cassette or replay_cassette,
+                    mode='record' if record_cassette else 'replay',
+                    latency=cassette_latency
+                )
+            except (OSError, ValueError) as e:
+                click.echo(f"❌ Ошибка кассеты: {e}", err=True)
+                sys.exit(1)
+            if replay_cassette:
+                click.echo(f"📼 Ответы из кассеты {replay_cassette}: {len(cassette)} обменов, задержка {cassette_latency}")
+            else:
+                click.echo(f"📼 Запись обменов в кассету: {record_cassette}")
+        
+        # Контрольные точки для продолжения прерванного прогона
+        previous_results = []
+        if resume and not checkpoint_file:
+            click.echo("❌ Ошибка: для --resume укажите файл контрольной точки --checkpoint-file", err=True)
+            sys.exit(1)
+        elif checkpoint_file and (workflow or load_profile or rate or compare_urls or all_servers):
+            click.echo("⚠️  Контрольные точки не поддерживаются в режимах --workflow, --rate, --load-profile, "
+                       "--compare и --all-servers, --checkpoint-file не учитывается")
+        elif checkpoint_file:
+            from .checkpoint import Checkpoint, load_checkpoint, split_completed
+            
+            if resume:
+                operations, previous_results = split_completed(operations, load_checkpoint(checkpoint_file))
+                for result in previous_results:
+                    aggregator.add(result)
+                click.echo(f"⏯️  Продолжение прогона: {len(previous_results)} операций уже выполнено, "
+                           f"осталось {len(operations)}")
+            checkpoint = Checkpoint(checkpoint_file, resume=resume)
+            result_hooks.append(checkpoint)
+        
         # Запуск тестов
         click.echo("🧪 Запуск тестов...")
-        tester = APITester(timeout=timeout, auth_config=auth_config)
-        results = tester.test_all_endpoints(spec)
+        tester_options = dict(
+            timeout=timeout,
+            auth_config=auth_config,
+            result_hooks=result_hooks,
+            tracer=tracer,
+            profiler=profiler,
+            log_sample_every=log_sample if hot_path else 1,
+            progress_interval=progress_interval if hot_path else None,
+            response_validator=response_validator,
+            data_generator=data_generator,
+            cassette=cassette
+        )
+        # Смесь трафика для нагрузочных режимов
+        load_picker = None
+        if mix_rules and not (rate or load_profile):
+            click.echo("⚠️  --mix учитывается только в режимах --rate и --load-profile")
+        elif rate or load_profile:
+            from .mix import TrafficMix, load_mix_rules
+            
+            if mix_rules or TrafficMix.has_weights(operations):
+                try:
+                    traffic_mix = TrafficMix(operations, load_mix_rules(mix_rules))
+                except (OSError, ValueError) as e:
+                    click.echo(f"❌ Ошибка смеси трафика: {e}", err=True)
+                    sys.exit(1)
+                load_picker = traffic_mix.picker(seed=data_seed)
+                click.echo(f"⚖️  Смесь трафика ({len(traffic_mix.operations)} операций):")
+                for operation_info, share in traffic_mix.shares()[:10]:
+                    click.echo(f"   {share * 100:5.1f}% {operation_info['method']} {operation_info['path']}")
+        
+        load_recorder = None
+        try:
+            if workflow:
+                from functools import partial
+                
+                from .workflow import WorkflowPlan, WorkflowRunner
+                
+                if order != 'spec':
+                    click.echo("⚠️  В режиме --workflow порядок определяется связями операций, --order не учитывается")
+                if all_servers or compare_urls:
+                    click.echo("⚠️  В режиме --workflow тестируется только первый сервер, "
+                               "--all-servers и --compare не учитываются")
+                plan = WorkflowPlan(operations)
+                click.echo(f"🔗 Workflow: связей {plan.link_count}, шагов очистки {len(plan.teardown_steps)}")
+                results = WorkflowRunner(
+                    partial(APITester, **tester_options),
+                    parser.get_base_url(spec),
+                    workers=workers,
+                    fail_fast=fail_fast,
+                    log_sample_every=tester_options['log_sample_every'],
+                    progress_interval=tester_options['progress_interval']
+                ).run(plan)
+            elif load_profile:
+                from functools import partial
+                
+                from .stages import LoadProfile, ProfileRecorder, ProfileRunner
+                
+                try:
+                    profile_stages = LoadProfile.parse(load_profile)
+                except (OSError, ValueError) as e:
+                    click.echo(f"❌ Ошибка профиля нагрузки: {e}", err=True)
+                    sys.exit(1)
+                
+                click.echo(f"🚀 Профиль нагрузки: {len(profile_stages.stages)} стадий, {profile_stages.duration:g} с")
+                for stage in profile_stages.stages:
+                    click.echo(f"   • {stage.describe()}")
+                timeseries_sink = open(timeseries_file, 'w', encoding='utf-8') if timeseries_file else None
+                try:
+                    load_recorder = ProfileRecorder(profile_stages, sink=timeseries_sink)
+                    ProfileRunner(
+                        partial(APITester, **dict(tester_options, result_hooks=[])),
+                        parser.get_base_url(spec),
+                        operations,
+                        load_recorder,
+                        max_in_flight=max_in_flight,
+                        result_hooks=result_hooks,
+                        log_sample_every=tester_options['log_sample_every'],
+                        progress_interval=tester_options['progress_interval'],
+                        picker=load_picker
+                    ).run()
+                finally:
+                    if timeseries_sink is not None:
+                        timeseries_sink.close()
+                        click.echo(f"📉 Временной ряд сохранен в: {Path(timeseries_file).absolute()}")
+                results = []
+            elif rate:
+                from functools import partial
+                
+                from .load import OpenLoopRunner, constant_arrivals, parse_duration, parse_rate
+                
+                try:
+                    arrival_rate = parse_rate(rate)
+                    load_duration = parse_duration(duration)
+                except ValueError as e:
+                    click.echo(f"❌ Ошибка: {e}", err=True)
+                    sys.exit(1)
+                
+                expected = int(arrival_rate * load_duration)
+                click.echo(f"🚀 Открытый цикл: {arrival_rate:g} запр/с в течение {load_duration:g} с "
+                           f"({expected} запросов, до {max_in_flight} одновременно)")
+                runner = OpenLoopRunner(
+                    partial(APITester, **dict(tester_options, result_hooks=[])),
+                    parser.get_base_url(spec),
+                    operations,
+                    max_in_flight=max_in_flight,
+                    result_hooks=result_hooks,
+                    picker=load_picker,
+                    log_sample_every=tester_options['log_sample_every'],
+                    progress_interval=tester_options['progress_interval']
+                )
+                results = runner.run(constant_arrivals(arrival_rate, load_duration), expected=expected)
+                load_summary = runner.summary()
+                click.echo(f"📶 Фактическая интенсивность: {load_summary['achieved_rate']:g} запр/с, "
+                           f"отставание планировщика p99 {load_summary['dispatch_lag'].get('p99_ms', 0):.2f}ms")
+            elif compare_urls:
+                from functools import partial
+                
+                from .compare import run_ab
+                
+                if workers > 1 or fail_fast or all_servers:
+                    click.echo("⚠️  В режиме --compare запросы идут последовательно, "
+                               "--workers, --fail-fast и --all-servers не учитываются")
+                base_a, base_b = (url.rstrip('/') for url in compare_urls)
+                click.echo(f"🆚 A/B: A={base_a}, B={base_b}, {compare_rounds} пар запросов на операцию")
+                results = run_ab(
+                    partial(APITester, **tester_options),
+                    (base_a, base_b),
+                    operations,
+                    rounds=compare_rounds,
+                    log_sample_every=tester_options['log_sample_every'],
+                    progress_interval=tester_options['progress_interval']
+                )
+            elif all_servers:
+                from functools import partial
+                
+                from .scheduler import Scheduler
+                from .servers import run_all_servers
+                
+                server_urls = parser.get_server_urls(spec)
+                click.echo(f"🌍 Серверы ({len(server_urls)}): {', '.join(server_urls)}")
+                results = run_all_servers(
+                    partial(APITester, **tester_options),
+                    server_urls,
+                    Scheduler(history=history, order=order).order(operations),
+                    workers=workers,
+                    fail_fast=fail_fast,
+                    log_sample_every=tester_options['log_sample_every'],
+                    progress_interval=tester_options['progress_interval']
+                )
+            elif workers > 1 or order != 'spec' or fail_fast:
+                from functools import partial
+                
+                from .scheduler import Scheduler, run_scheduled
+                
+                if order != 'spec' and history is None:
+                    click.echo("⚠️  Без --history операции запускаются в порядке спецификации")
+                scheduler = Scheduler(history=history, order=order)
+                operations = scheduler.order(operations)
+                if history is not None and workers > 1:
+                    click.echo(f"⏱️  Оценка времени запросов: {scheduler.estimate_makespan(operations, workers) / 1000:.1f} с")
+                results = run_scheduled(
+                    partial(APITester, **tester_options),
+                    parser.get_base_url(spec),
+                    operations,
+                    workers=workers,
+                    fail_fast=fail_fast,
+                    log_sample_every=tester_options['log_sample_every'],
+                    progress_interval=tester_options['progress_interval']
+                )
+            else:
+                tester = APITester(**tester_options)
+                results = tester.test_all_endpoints(spec, operations=operations)
+            results = previous_results + results
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            if cassette is not None:
+                cassette.close()
+                if cassette.misses:
+                    click.echo(f"⚠️  Запросов без ответа в кассете: {cassette.misses}")
+            if metrics_server is not None:
+                metrics_server.stop()
+            if tracer is not None:
+                tracer.shutdown()
         
         # Генерация отчета
         reporter = TestReporter()
-        if output == 'json':
-            report = reporter.generate_json_report(results)
-        else:
-            report = reporter.generate_text_report(results)
+        with profile_phase(profiler, 'report'):
+            if load_recorder is not None:
+                report = reporter.generate_load_report(aggregator, load_recorder, output)
+            elif output == 'json':
+                report = reporter.generate_json_report(results, aggregator=aggregator)
+            else:
+                report = reporter.generate_text_report(results, aggregator=aggregator)
         
         # Вывод или сохранение результатов
         if output_file:
@@ -138,18 +760,237 @@ def main(
             click.echo("="*60)
             click.echo(report)
         
+        if columnar_file and load_recorder is not None:
+            click.echo("⚠️  При --load-profile результаты запросов не хранятся, --columnar-file не учитывается")
+        elif columnar_file:
+            from .columnar import ResultColumns
+            
+            ResultColumns.from_results(results).save(columnar_file)
+            click.echo(f"🧮 Колоночные результаты сохранены в: {Path(columnar_file).absolute()}")
+        
         # Подсчет статистики
-        total_tests = len(results)
-        passed_tests = sum(1 for r in results if r['status'] == 'PASS')
+        summary = aggregator.summary()
+        total_tests = summary['total_tests']
+        passed_tests = summary['passed']
         failed_tests = total_tests - passed_tests
         
         click.echo(f"\n📈 Итого: {total_tests} тестов, {passed_tests} успешных, {failed_tests} неудачных")
         
+        if profiler is not None:
+            profiler.stop()
+            written = profiler.write(profile_file)
+            click.echo("\n" + profiler.format_summary(), err=True)
+            click.echo(f"🧾 Профиль сохранен в: {', '.join(str(path) for path in written)}", err=True)
+        
         if failed_tests > 0:
             sys.exit(1)
     
     except KeyboardInterrupt:
         click.echo("\n⏹️  Тестирование прервано пользователем", err=True)
+        if checkpoint is not None:
+            click.echo(f"💾 Завершенные операции сохранены в {checkpoint_file}, продолжите прогон с --resume", err=True)
+        sys.exit(1)
+    except Exception as e:
+        logger.exception("Неожиданная ошибка")
+        click.echo(f"❌ Критическая ошибка: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@main.command('replay', short_help='Воспроизводит трафик из журнала доступа.')
+@click.option(
+    '--url', '-u',
+    required=True,
+    help='URL OpenAPI/Swagger спецификации'
+)
+@click.option(
+    '--log', 'log_path',
+    required=True,
+    help='Журнал доступа: combined log format или JSON lines, .gz или - (stdin)'
+)
+@click.option(
+    '--format', 'log_format',
+    type=click.Choice(['auto', 'combined', 'jsonl']),
+    default='auto',
+    help='Формат журнала (по умолчанию: auto - по первой строке)'
+)
+@click.option(
+    '--speed',
+    default=1.0,
+    help='Скорость относительно журнала: 2 - вдвое быстрее, 0 - без пауз (по умолчанию: 1)'
+)
+@click.option(
+    '--target',
+    help='Базовый URL, на который воспроизводятся запросы (по умолчанию: из спецификации)'
+)
+@click.option(
+    '--limit',
+    type=int,
+    help='Наибольшее число воспроизводимых запросов'
+)
+@click.option(
+    '--max-in-flight',
+    default=100,
+    help='Наибольшее число одновременных запросов (по умолчанию: 100)'
+)
+@click.option(
+    '--auth-type', '-a',
+    type=click.Choice(['bearer', 'apikey', 'none']),
+    default='none',
+    help='Тип аутентификации: bearer, apikey или none'
+)
+@click.option(
+    '--auth-token', '-t',
+    help='Bearer токен или API ключ для аутентификации'
+)
+@click.option(
+    '--auth-header', '-h',
+    default='Authorization',
+    help='Название заголовка для API ключа (по умолчанию: Authorization)'
+)
+@click.option(
+    '--timeout', '-to',
+    default=30,
+    help='Таймаут для HTTP запросов в секундах (по умолчанию: 30)'
+)
+@click.option(
+    '--output', '-o',
+    type=click.Choice(['text', 'json']),
+    default='text',
+    help='Формат вывода результатов: text или json'
+)
+@click.option(
+    '--output-file', '-f',
+    help='Файл для сохранения результатов (по умолчанию: вывод в консоль)'
+)
+@click.option(
+    '--log-sample',
+    default=100,
+    help='Логировать каждый N-й запрос (FAIL - всегда, по умолчанию: 100)'
+)
+@click.option(
+    '--progress-interval',
+    default=5.0,
+    help='Период строки прогресса в секундах (по умолчанию: 5)'
+)
+@click.option(
+    '--verbose', '-v',
+    is_flag=True,
+    help='Подробный вывод с дополнительной информацией'
+)
+def replay(
+    url: str,
+    log_path: str,
+    log_format: str,
+    speed: float,
+    target: Optional[str],
+    limit: Optional[int],
+    max_in_flight: int,
+    auth_type: str,
+    auth_token: Optional[str],
+    auth_header: str,
+    timeout: int,
+    output: str,
+    output_file: Optional[str],
+    log_sample: int,
+    progress_interval: float,
+    verbose: bool
+):
+    """Воспроизводит запросы из журнала доступа с исходной или измененной скоростью.
+    
+    Журнал читается потоково, каждая строка сопоставляется с операцией
+    спецификации по шаблону пути; параметры пути и query-строки берутся из
+    журнала, тела запросов генерируются по схемам.
+    
+        apizap replay --url openapi.json --log access.log --speed 2
+    """
+    from functools import partial
+    from pathlib import Path
+    from urllib.parse import urlsplit
+    
+    from loguru import logger
+    
+    from .aggregator import ResultAggregator
+    from .datagen import DataGenerator
+    from .load import OpenLoopRunner
+    from .log import configure_logging
+    from .parser import OpenAPIParser
+    from .replay import LogReplayer, TemplateMatcher, open_log
+    from .reporter import TestReporter
+    from .schema import SchemaResolver
+    from .tester import APITester
+    
+    configure_logging(verbose=verbose, enqueue=True)
+    
+    try:
+        if auth_type != 'none' and not auth_token:
+            click.echo("❌ Ошибка: Для типа аутентификации '{}' необходимо указать токен с помощью --auth-token".format(auth_type), err=True)
+            sys.exit(1)
+        
+        parser = OpenAPIParser()
+        spec = parser.parse(url)
+        if not spec:
+            click.echo("❌ Не удалось загрузить или распарсить OpenAPI спецификацию", err=True)
+            sys.exit(1)
+        
+        operations = parser.get_all_operations(spec)
+        base_url = (target or parser.get_base_url(spec)).rstrip('/')
+        try:
+            replayer = LogReplayer(
+                TemplateMatcher(operations, base_path=urlsplit(parser.get_base_url(spec)).path),
+                speed=speed,
+                log_format=log_format,
+                limit=limit
+            )
+        except ValueError as e:
+            click.echo(f"❌ Ошибка: {e}", err=True)
+            sys.exit(1)
+        
+        auth_config = None
+        if auth_type != 'none' and auth_token:
+            auth_config = {'type': auth_type, 'token': auth_token, 'header': auth_header}
+        
+        click.echo(f"📼 Воспроизведение {log_path} на {base_url} "
+                   f"(скорость {'максимальная' if speed == 0 else f'x{speed:g}'}, до {max_in_flight} одновременно)",
+                   err=True)
+        aggregator = ResultAggregator()
+        runner = OpenLoopRunner(
+            partial(
+                APITester,
+                timeout=timeout,
+                auth_config=auth_config,
+                data_generator=DataGenerator(SchemaResolver.from_spec(spec))
+            ),
+            base_url,
+            operations,
+            max_in_flight=max_in_flight,
+            result_hooks=[aggregator.add],
+            log_sample_every=log_sample,
+            progress_interval=progress_interval,
+            keep_results=False,
+            max_pending=max_in_flight * 2
+        )
+        runner.run_schedule(replayer.schedule(open_log(log_path)), expected=limit or 0)
+        
+        stats = replayer.stats
+        if not stats.matched:
+            click.echo("⚠️  Ни одна строка журнала не сопоставлена с операциями спецификации", err=True)
+        
+        report = TestReporter().generate_load_report(aggregator, stats, output)
+        if output_file:
+            output_path = Path(output_file)
+            output_path.write_text(report, encoding='utf-8')
+            click.echo(f"📄 Результаты сохранены в: {output_path.absolute()}", err=True)
+        else:
+            click.echo(report)
+        
+        if aggregator.summary()['failed'] > 0:
+            sys.exit(1)
+    
+    except OSError as e:
+        click.echo(f"❌ Ошибка чтения журнала: {e}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        click.echo("\n⏹️  Воспроизведение прервано пользователем", err=True)
         sys.exit(1)
     except Exception as e:
         logger.exception("Неожиданная ошибка")
@@ -157,5 +998,219 @@ def main(
         sys.exit(1)
 
 
+@main.command('monitor', short_help='Синтетический мониторинг API в одном процессе.')
+@click.option(
+    '--url', '-u',
+    required=True,
+    help='URL OpenAPI/Swagger спецификации'
+)
+@click.option(
+    '--interval',
+    default='60s',
+    help='Период циклов проверки (по умолчанию: 60s)'
+)
+@click.option(
+    '--jitter',
+    default=0.1,
+    help='Случайный разброс периода, доля от --interval (по умолчанию: 0.1)'
+)
+@click.option(
+    '--window',
+    default='5m',
+    help='Длина скользящего окна результатов (по умолчанию: 5m)'
+)
+@click.option(
+    '--target',
+    help='Базовый URL API (по умолчанию: из спецификации)'
+)
+@click.option(
+    '--cycles',
+    default=0,
+    help='Количество циклов (по умолчанию: 0 - до остановки)'
+)
+@click.option(
+    '--metrics-port',
+    type=int,
+    help='Порт HTTP эндпоинтов /metrics и /status (скользящее окно в JSON)'
+)
+@click.option(
+    '--metrics-host',
+    default='127.0.0.1',
+    help='Адрес эндпоинтов /metrics и /status (по умолчанию: 127.0.0.1)'
+)
+@click.option(
+    '--auth-type', '-a',
+    type=click.Choice(['bearer', 'apikey', 'none']),
+    default='none',
+    help='Тип аутентификации: bearer, apikey или none'
+)
+@click.option(
+    '--auth-token', '-t',
+    help='Bearer токен или API ключ для аутентификации'
+)
+@click.option(
+    '--auth-header', '-h',
+    default='Authorization',
+    help='Название заголовка для API ключа (по умолчанию: Authorization)'
+)
+@click.option(
+    '--timeout', '-to',
+    default=30,
+    help='Таймаут для HTTP запросов в секундах (по умолчанию: 30)'
+)
+@click.option(
+    '--verbose', '-v',
+    is_flag=True,
+    help='Подробный вывод с дополнительной информацией'
+)
+def monitor(
+    url: str,
+    interval: str,
+    jitter: float,
+    window: str,
+    target: Optional[str],
+    cycles: int,
+    metrics_port: Optional[int],
+    metrics_host: str,
+    auth_type: str,
+    auth_token: Optional[str],
+    auth_header: str,
+    timeout: int,
+    verbose: bool
+):
+    """Проверяет все операции API по расписанию в одном долгоживущем процессе.
+    
+    Спецификация, операции и соединения сохраняются между циклами;
+    спецификация перезагружается только при изменении ETag. Результаты за
+    последнее окно доступны на /status, накопленные метрики - на /metrics.
+    
+        apizap monitor --url https://api.example.com/openapi.json --interval 30s --metrics-port 9100
+    """
+    import json
+    import signal
+    import threading
+    
+    from loguru import logger
+    
+    from .load import parse_duration
+    from .log import configure_logging
+    from .monitor import Monitor, RollingWindow, SpecWatcher
+    from .parser import OpenAPIParser
+    from .tester import APITester
+    
+    configure_logging(verbose=verbose)
+    
+    if auth_type != 'none' and not auth_token:
+        click.echo("❌ Ошибка: Для типа аутентификации '{}' необходимо указать токен с помощью --auth-token".format(auth_type), err=True)
+        sys.exit(1)
+    try:
+        interval_seconds = parse_duration(interval)
+        window_seconds = parse_duration(window)
+    except ValueError as e:
+        click.echo(f"❌ Ошибка: {e}", err=True)
+        sys.exit(1)
+    if interval_seconds <= 0 or window_seconds <= 0:
+        click.echo("❌ Ошибка: --interval и --window должны быть больше нуля", err=True)
+        sys.exit(1)
+    
+    auth_config = None
+    if auth_type != 'none' and auth_token:
+        auth_config = {'type': auth_type, 'token': auth_token, 'header': auth_header}
+    
+    rolling = RollingWindow(window_seconds)
+    result_hooks = [rolling.add]
+    metrics_server = None
+    if metrics_port is not None:
+        from .metrics import MetricsRegistry, MetricsServer
+        
+        registry = MetricsRegistry()
+        result_hooks.append(registry.observe)
+        metrics_server = MetricsServer(registry, port=metrics_port, host=metrics_host, status=rolling.to_dict).start()
+        click.echo(f"📡 Состояние: http://{metrics_host}:{metrics_server.port}/status, "
+                   f"метрики: http://{metrics_host}:{metrics_server.port}/metrics")
+    
+    runner = Monitor(
+        SpecWatcher(url, OpenAPIParser(timeout=timeout)),
+        APITester(timeout=timeout, auth_config=auth_config, result_hooks=result_hooks),
+        interval=interval_seconds,
+        jitter=jitter,
+        base_url=target.rstrip('/') if target else None
+    )
+    if not runner.reload():
+        click.echo("❌ Не удалось загрузить или распарсить OpenAPI спецификацию", err=True)
+        sys.exit(1)
+    
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    click.echo(f"👀 Мониторинг {len(runner.operations)} операций каждые {interval_seconds:g} с "
+               f"(±{runner.jitter * 100:g}%), окно {window_seconds:g} с")
+    try:
+        runner.run(stop, max_cycles=cycles or None)
+    except KeyboardInterrupt:
+        click.echo("\n⏹️  Мониторинг остановлен", err=True)
+    except Exception as e:
+        logger.exception("Неожиданная ошибка")
+        click.echo(f"❌ Критическая ошибка: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+    
+    click.echo(json.dumps(rolling.to_dict(), indent=2, ensure_ascii=False))
+
+
+@main.command('selftest-perf')
+@click.option(
+    '--requests', '-n', 'requests_count',
+    default=2000,
+    help='Количество запросов на каждый движок (по умолчанию: 2000)'
+)
+@click.option(
+    '--workers', '-w',
+    default=4,
+    help='Количество параллельных исполнителей для конкурентных движков (по умолчанию: 4)'
+)
+@click.option(
+    '--engine', '-e', 'engines',
+    type=click.Choice(['serial', 'threaded', 'async', 'process']),
+    multiple=True,
+    help='Движок для измерения (можно указать несколько, по умолчанию: все)'
+)
+@click.option(
+    '--output', '-o',
+    type=click.Choice(['text', 'json']),
+    default='text',
+    help='Формат вывода результатов: text или json'
+)
+def selftest_perf(requests_count: int, workers: int, engines: tuple, output: str):
+    """Измеряет накладные расходы APIZap на локальном null-сервере.
+    
+    Для каждого движка выполнения (serial, threaded, async, process) выводит
+    максимальную пропускную способность, процессорное время клиента на запрос
+    и задержку, добавленную инструментом относительно минимального HTTP клиента.
+    """
+    import json
+    
+    from loguru import logger
+    
+    from .engines import ENGINES
+    from .selftest import format_selftest_report, run_selftest
+    
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    
+    click.echo("⚙️  Запуск самотестирования производительности...", err=True)
+    report = run_selftest(
+        requests_count=requests_count,
+        workers=workers,
+        engines=engines or ENGINES
+    )
+    
+    if output == 'json':
+        click.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        click.echo(format_selftest_report(report))
+
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
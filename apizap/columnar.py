@@ -0,0 +1,230 @@
+"""Колоночное хранение результатов и векторизованная статистика.
+
+Результаты раскладываются по типизированным массивам NumPy: статус-коды,
+задержки, размеры ответов и метки времени хранятся плотно, а строковые
+поля (operation_id, метод, путь, исход) кодируются словарем. Такой формат
+быстро сохраняется в .npz (или Parquet при установленном pyarrow) и
+загружается в блокноты без разбора JSON отчета.
+
+NumPy - необязательная зависимость: pip install apizap[columnar].
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+OUTCOMES = ('PASS', 'WARN', 'FAIL')
+
+# Поля, кодируемые словарем: колонка кодов <name>_codes и список значений <name>_values
+DICTIONARY_FIELDS = ('operation_id', 'method', 'path', 'outcome')
+
+
+def require_numpy() -> None:
+    """Проверяет наличие NumPy и объясняет, как его установить."""
+    if not HAS_NUMPY:
+        raise ImportError("Для колоночного формата нужен NumPy: pip install apizap[columnar]")
+
+
+def _created_at(result: Mapping[str, Any]) -> float:
+    """Возвращает время результата в секундах Unix (TestResult или словарь с ISO строкой)."""
+    created_at = getattr(result, 'created_at', None)
+    if created_at is not None:
+        return created_at
+    timestamp = result.get('timestamp')
+    if not timestamp:
+        return float('nan')
+    created = datetime.fromisoformat(timestamp)
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return created.timestamp()
+
+
+class _DictionaryEncoder:
+    """Кодирует строки целыми индексами в порядке первого появления."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append('' if value is None else str(value))
+        return code
+
+
+class ResultColumns:
+    """Колоночное представление результатов тестирования.
+
+    Attributes:
+        status_code: int16, 0 - ответ не получен
+        response_time: float64 в миллисекундах, NaN - время не измерено
+        response_size: int64 в байтах
+        timestamp: float64, секунды Unix
+        <поле>_codes / <поле>_values: словарное кодирование строковых полей
+    """
+
+    def __init__(self, columns: Dict[str, Any], dictionaries: Dict[str, List[str]]):
+        require_numpy()
+        self.status_code = columns['status_code']
+        self.response_time = columns['response_time']
+        self.response_size = columns['response_size']
+        self.timestamp = columns['timestamp']
+        self.codes = {name: columns[f"{name}_codes"] for name in DICTIONARY_FIELDS}
+        self.dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return len(self.status_code)
+
+    @classmethod
+    def from_results(cls, results: Iterable[Mapping[str, Any]]) -> 'ResultColumns':
+        """Строит колонки за один проход по результатам."""
+        require_numpy()
+        encoders = {name: _DictionaryEncoder() for name in DICTIONARY_FIELDS}
+        for outcome in OUTCOMES:
+            encoders['outcome'].encode(outcome)
+
+        status_codes: List[int] = []
+        response_times: List[float] = []
+        response_sizes: List[int] = []
+        timestamps: List[float] = []
+        codes: Dict[str, List[int]] = {name: [] for name in DICTIONARY_FIELDS}
+
+        for result in results:
+            status_codes.append(result.get('status_code') or 0)
+            response_time = result.get('response_time')
+            response_times.append(float('nan') if response_time is None else response_time)
+            response_sizes.append(result.get('response_size') or 0)
+            timestamps.append(_created_at(result))
+            codes['operation_id'].append(encoders['operation_id'].encode(result.get('operation_id')))
+            codes['method'].append(encoders['method'].encode(result['method']))
+            codes['path'].append(encoders['path'].encode(result['path']))
+            codes['outcome'].append(encoders['outcome'].encode(result['status']))
+
+        columns = {
+            'status_code': np.array(status_codes, dtype=np.int16),
+            'response_time': np.array(response_times, dtype=np.float64),
+            'response_size': np.array(response_sizes, dtype=np.int64),
+            'timestamp': np.array(timestamps, dtype=np.float64),
+        }
+        for name in DICTIONARY_FIELDS:
+            columns[f"{name}_codes"] = np.array(codes[name], dtype=np.int32)
+
+        return cls(columns, {name: encoder.values for name, encoder in encoders.items()})
+
+    def decode(self, name: str) -> List[str]:
+        """Раскодирует строковую колонку в список строк."""
+        values = self.dictionaries[name]
+        return [values[code] for code in self.codes[name].tolist()]
+
+    # --- Векторизованная статистика -------------------------------------
+
+    def outcome_counts(self) -> Dict[str, int]:
+        """Количество результатов по исходу (PASS/WARN/FAIL)."""
+        counts = np.bincount(self.codes['outcome'], minlength=len(self.dictionaries['outcome']))
+        return {outcome: int(counts[i]) for i, outcome in enumerate(self.dictionaries['outcome'])}
+
+    def summary(self) -> Dict[str, Any]:
+        """Сводная статистика в тех же полях, что и JSON отчет."""
+        total = len(self)
+        counts = self.outcome_counts()
+        total_time = float(np.nansum(self.response_time))
+        return {
+            'total_tests': total,
+            'passed': counts.get('PASS', 0),
+            'warnings': counts.get('WARN', 0),
+            'failed': counts.get('FAIL', 0),
+            'success_rate': round(counts.get('PASS', 0) / total * 100, 2) if total else 0.0,
+            'total_time_ms': round(total_time, 2),
+            'average_time_ms': round(total_time / total, 2) if total else 0.0
+        }
+
+    def status_code_distribution(self) -> Dict[str, int]:
+        """Распределение статус-кодов в порядке первого появления."""
+        codes = self.status_code[self.status_code != 0]
+        if codes.size == 0:
+            return {}
+        values, first_index, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first_index, kind='stable')
+        return {str(int(values[i])): int(counts[i]) for i in order}
+
+    def response_time_stats(self, percentiles: Tuple[float, ...] = ()) -> Optional[Dict[str, float]]:
+        """Минимум, максимум, среднее и заданные перцентили измеренных задержек."""
+        times = self.response_time[~np.isnan(self.response_time) & (self.response_time != 0)]
+        if times.size == 0:
+            return None
+        stats = {
+            'min_ms': round(float(times.min()), 2),
+            'max_ms': round(float(times.max()), 2),
+            'avg_ms': round(float(times.mean()), 2)
+        }
+        if percentiles:
+            for p, value in zip(percentiles, np.percentile(times, percentiles)):
+                stats[f"p{p:g}_ms"] = round(float(value), 2)
+        return stats
+
+    # --- Сохранение и загрузка -----------------------------------------
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """Возвращает все колонки и словари в виде массивов NumPy."""
+        arrays = {
+            'status_code': self.status_code,
+            'response_time': self.response_time,
+            'response_size': self.response_size,
+            'timestamp': self.timestamp,
+        }
+        for name in DICTIONARY_FIELDS:
+            arrays[f"{name}_codes"] = self.codes[name]
+            arrays[f"{name}_values"] = np.array(self.dictionaries[name], dtype=np.str_)
+        return arrays
+
+    def save_npz(self, path: str) -> None:
+        """Сохраняет колонки в сжатый архив NumPy .npz."""
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **self.to_arrays())
+
+    @classmethod
+    def load_npz(cls, path: str) -> 'ResultColumns':
+        """Загружает колонки из архива .npz."""
+        require_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            columns = {key: data[key] for key in data.files if not key.endswith('_values')}
+            dictionaries = {name: data[f"{name}_values"].tolist() for name in DICTIONARY_FIELDS}
+        return cls(columns, dictionaries)
+
+    def save_parquet(self, path: str) -> None:
+        """Сохраняет колонки в Parquet со словарным кодированием строк (нужен pyarrow)."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Для Parquet нужен pyarrow: pip install apizap[parquet]") from None
+
+        status_code = self.status_code
+        fields = {
+            'status_code': pa.array(status_code, mask=status_code == 0),
+            'response_time_ms': pa.array(self.response_time, from_pandas=True),
+            'response_size_bytes': pa.array(self.response_size),
+            'timestamp': pa.array((self.timestamp * 1e6).astype('int64'), type=pa.timestamp('us', tz='UTC')),
+        }
+        for name in DICTIONARY_FIELDS:
+            fields[name] = pa.DictionaryArray.from_arrays(
+                pa.array(self.codes[name]), pa.array(self.dictionaries[name], type=pa.string())
+            )
+        pq.write_table(pa.table(fields), path)
+
+    def save(self, path: str) -> None:
+        """Сохраняет колонки в формате по расширению файла (.parquet или .npz)."""
+        if path.endswith('.parquet'):
+            self.save_parquet(path)
+        else:
+            self.save_npz(path)
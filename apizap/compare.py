@@ -0,0 +1,243 @@
+"""A/B сравнение двух развертываний API.
+
+Каждая операция отправляется на оба базовых URL поочередно несколько раундов
+подряд, причем порядок внутри раунда чередуется (AB, BA, AB, ...). Так
+дрейф во времени - прогрев кэшей, фоновая нагрузка - одинаково влияет на
+обе стороны. Задержки сравниваются по каждой операции: разница медиан
+с bootstrap доверительным интервалом и p-значение критерия Манна-Уитни.
+Отдельно отмечаются расхождения статус-кодов и размеров ответов.
+"""
+
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .log import RequestLogger
+
+
+VARIANTS = ('A', 'B')
+
+
+def run_ab(
+    tester_factory: Callable[[], Any],
+    base_urls: Tuple[str, str],
+    operations: List[Dict[str, Any]],
+    rounds: int = 10,
+    log_sample_every: int = 1,
+    progress_interval: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Выполняет операции на двух базовых URL вперемешку.
+
+    У каждой стороны свой тестер (и пул соединений). Тестеры получают
+    одинаковую последовательность операций, поэтому генератор данных
+    выдает обеим сторонам одинаковые параметры и тела запросов.
+
+    Args:
+        tester_factory: Фабрика тестеров (apizap.tester.APITester)
+        base_urls: Базовые URL вариантов A и B
+        operations: Операции в порядке запуска
+        rounds: Количество пар запросов на операцию
+        log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+        progress_interval: Период строки прогресса в секундах (None - выключена)
+
+    Returns:
+        Результаты с полем 'variant' ('A' или 'B')
+    """
+    testers = (tester_factory(), tester_factory())
+    request_log = RequestLogger(len(operations) * rounds * 2, log_sample_every, progress_interval)
+    results = []
+    index = 0
+
+    for operation_info in operations:
+        for round_index in range(rounds):
+            order = (0, 1) if round_index % 2 == 0 else (1, 0)
+            for variant in order:
+                index += 1
+                request_log.before(index, operation_info)
+                result = testers[variant].test_operation(base_urls[variant], operation_info)
+                result['variant'] = VARIANTS[variant]
+                results.append(result)
+                request_log.after(result)
+            if testers[0].request_delay:
+                time.sleep(testers[0].request_delay)
+
+    return results
+
+
+def _median(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def mann_whitney_p(a: Sequence[float], b: Sequence[float]) -> float:
+    """Двустороннее p-значение критерия Манна-Уитни.
+
+    Используется нормальное приближение с поправкой на связки и на
+    непрерывность; для сравнения задержек по 10+ замерам его достаточно.
+    """
+    n_a, n_b = len(a), len(b)
+    if not n_a or not n_b:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    n = n_a + n_b
+    rank_sum_a = 0.0
+    ties = 0.0
+    start = 0
+    while start < n:
+        end = start
+        while end + 1 < n and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        rank = (start + end) / 2 + 1
+        size = end - start + 1
+        ties += size ** 3 - size
+        rank_sum_a += rank * sum(1 for k in range(start, end + 1) if combined[k][1] == 0)
+        start = end + 1
+
+    u = rank_sum_a - n_a * (n_a + 1) / 2
+    mean = n_a * n_b / 2
+    variance = n_a * n_b / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = max(0.0, abs(u - mean) - 0.5) / math.sqrt(variance)
+    return math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_median_delta(
+    a: Sequence[float],
+    b: Sequence[float],
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """Bootstrap доверительный интервал разницы медиан (B - A).
+
+    Returns:
+        Нижняя и верхняя границы интервала
+    """
+    rng = random.Random(seed)
+    deltas = sorted(
+        _median(rng.choices(b, k=len(b))) - _median(rng.choices(a, k=len(a)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    low = deltas[int(tail * (resamples - 1))]
+    high = deltas[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return low, high
+
+
+class ABComparison:
+    """Сравнение вариантов A и B по операциям."""
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        size_tolerance: float = 0.1,
+        resamples: int = 2000,
+        seed: int = 0
+    ):
+        """Инициализация.
+
+        Args:
+            alpha: Уровень значимости критерия Манна-Уитни
+            size_tolerance: Допустимое относительное расхождение медиан размеров ответов
+            resamples: Количество bootstrap выборок
+            seed: Seed bootstrap
+        """
+        self.alpha = alpha
+        self.size_tolerance = size_tolerance
+        self.resamples = resamples
+        self.seed = seed
+        self.operations: Dict[Tuple[str, str], Dict[str, List[Mapping[str, Any]]]] = {}
+
+    @classmethod
+    def from_results(cls, results: List[Mapping[str, Any]], **options: Any) -> Optional['ABComparison']:
+        """Строит сравнение по результатам с полем 'variant' (None, если их нет)."""
+        comparison = cls(**options)
+        for result in results:
+            if result.get('variant') in VARIANTS:
+                comparison.add(result)
+        return comparison if comparison.operations else None
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """Учитывает один результат."""
+        key = (result['method'], result['path'])
+        by_variant = self.operations.setdefault(key, {variant: [] for variant in VARIANTS})
+        by_variant[result['variant']].append(result)
+
+    def compare(self, a: List[Mapping[str, Any]], b: List[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Сравнивает замеры одной операции."""
+        times_a = [r['response_time'] for r in a if r.get('response_time')]
+        times_b = [r['response_time'] for r in b if r.get('response_time')]
+        codes_a = sorted({r.get('status_code') or 0 for r in a})
+        codes_b = sorted({r.get('status_code') or 0 for r in b})
+        size_a = _median([r.get('response_size') or 0 for r in a]) if a else 0
+        size_b = _median([r.get('response_size') or 0 for r in b]) if b else 0
+
+        row: Dict[str, Any] = {'samples': [len(times_a), len(times_b)]}
+        if times_a and times_b:
+            median_a, median_b = _median(times_a), _median(times_b)
+            low, high = bootstrap_median_delta(times_a, times_b, self.resamples, 1 - self.alpha, self.seed)
+            p_value = mann_whitney_p(times_a, times_b)
+            row.update(
+                median_a_ms=round(median_a, 2),
+                median_b_ms=round(median_b, 2),
+                delta_ms=round(median_b - median_a, 2),
+                delta_pct=round((median_b - median_a) / median_a * 100, 1) if median_a else None,
+                ci_ms=[round(low, 2), round(high, 2)],
+                p_value=round(p_value, 4),
+                significant=p_value < self.alpha and (low > 0 or high < 0)
+            )
+
+        row['status_codes'] = {'A': codes_a, 'B': codes_b}
+        row['status_mismatch'] = codes_a != codes_b
+        row['response_size'] = {'A': size_a, 'B': size_b}
+        row['size_mismatch'] = abs(size_b - size_a) > self.size_tolerance * max(size_a, size_b)
+        return row
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Сравнение по каждой операции в порядке первого появления."""
+        rows = []
+        for (method, path), by_variant in self.operations.items():
+            row = {'method': method, 'path': path}
+            row.update(self.compare(by_variant['A'], by_variant['B']))
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сводка для JSON отчета."""
+        rows = self.rows()
+        return {
+            'alpha': self.alpha,
+            'significant': sum(1 for row in rows if row.get('significant')),
+            'status_mismatches': sum(1 for row in rows if row['status_mismatch']),
+            'size_mismatches': sum(1 for row in rows if row['size_mismatch']),
+            'operations': rows
+        }
+
+    def format_lines(self) -> List[str]:
+        """Раздел текстового отчета."""
+        lines = ["", "🆚 A/B СРАВНЕНИЕ (B относительно A)", "-" * 40]
+        for row in self.rows():
+            line = f"  {row['method']} {row['path']}:"
+            if 'delta_ms' in row:
+                marker = '🔺' if row['significant'] and row['delta_ms'] > 0 else \
+                    '🔻' if row['significant'] else '≈'
+                pct = f", {row['delta_pct']:+.1f}%" if row['delta_pct'] is not None else ''
+                line += (f" {marker} {row['median_a_ms']:.2f} → {row['median_b_ms']:.2f}ms "
+                         f"(Δ {row['delta_ms']:+.2f}ms{pct}, "
+                         f"ДИ [{row['ci_ms'][0]:+.2f}; {row['ci_ms'][1]:+.2f}], p={row['p_value']:.3f})")
+            else:
+                line += " нет замеров"
+            lines.append(line)
+            if row['status_mismatch']:
+                lines.append(f"    ❗ Статус-коды различаются: A {row['status_codes']['A']}, "
+                             f"B {row['status_codes']['B']}")
+            if row['size_mismatch']:
+                lines.append(f"    ❗ Размер ответа различается: A {row['response_size']['A']:g} байт, "
+                             f"B {row['response_size']['B']:g} байт")
+        return lines
@@ -0,0 +1,202 @@
+"""Комбинаторное покрытие параметров операций (pairwise и t-wise).
+
+Для каждой операции параметры становятся факторами, а их уровнями -
+значения enum, true/false, границы minimum/maximum и отсутствие
+необязательного параметра. Вместо полного декартова произведения строится
+покрывающий массив силы t: любая комбинация значений любых t параметров
+встречается хотя бы в одном запросе. Массив строится жадно (в духе AETG),
+поэтому число запросов растет примерно логарифмически от числа параметров.
+"""
+
+import itertools
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .schema import SchemaResolver
+from .tester import OMIT_PARAMETER
+
+
+# Уровень "значение по умолчанию": параметр получает обычное примерное значение
+DEFAULT_VALUE = object()
+
+Interaction = Tuple[Tuple[int, ...], Tuple[int, ...]]  # (факторы, уровни)
+
+
+def covering_array(
+    levels: Sequence[int],
+    strength: int = 2,
+    max_rows: Optional[int] = None,
+    seed: int = 0,
+    candidates: int = 8
+) -> List[Tuple[int, ...]]:
+    """Строит покрывающий массив жадным алгоритмом.
+
+    Args:
+        levels: Количество уровней каждого фактора
+        strength: Сила покрытия t (2 - pairwise)
+        max_rows: Предельное количество строк (покрытие может остаться неполным)
+        seed: Seed для выбора среди равноценных вариантов
+        candidates: Количество строк-кандидатов на каждом шаге
+
+    Returns:
+        Строки массива: номера уровней для каждого фактора
+    """
+    factors = len(levels)
+    if factors == 0:
+        return [()]
+    strength = max(1, min(strength, factors))
+    rng = random.Random(seed)
+
+    uncovered: Dict[Interaction, None] = dict.fromkeys(
+        (combo, values)
+        for combo in itertools.combinations(range(factors), strength)
+        for values in itertools.product(*(range(levels[f]) for f in combo))
+    )
+
+    def interactions(row: Sequence[Optional[int]], factor: int, assigned: List[int]):
+        """Взаимодействия, которые замыкает фактор factor со значениями row."""
+        for others in itertools.combinations(assigned, strength - 1):
+            combo = tuple(sorted(others + (factor,)))
+            yield combo, tuple(row[f] for f in combo)
+
+    rows: List[Tuple[int, ...]] = []
+    while uncovered and (max_rows is None or len(rows) < max_rows):
+        seed_combo, seed_values = next(iter(uncovered))
+        free = [f for f in range(factors) if f not in seed_combo]
+
+        best_row, best_gain = None, -1
+        for _ in range(candidates):
+            row: List[Optional[int]] = [None] * factors
+            for factor, value in zip(seed_combo, seed_values):
+                row[factor] = value
+            assigned = list(seed_combo)
+            order = free[:]
+            rng.shuffle(order)
+
+            for factor in order:
+                scores = []
+                for value in range(levels[factor]):
+                    row[factor] = value
+                    scores.append(sum(1 for key in interactions(row, factor, assigned) if key in uncovered))
+                top = max(scores)
+                row[factor] = rng.choice([v for v, score in enumerate(scores) if score == top])
+                assigned.append(factor)
+
+            gain = sum(
+                1 for combo in itertools.combinations(range(factors), strength)
+                if (combo, tuple(row[f] for f in combo)) in uncovered
+            )
+            if gain > best_gain:
+                best_row, best_gain = tuple(row), gain
+
+        rows.append(best_row)
+        for combo in itertools.combinations(range(factors), strength):
+            uncovered.pop((combo, tuple(best_row[f] for f in combo)), None)
+
+    return rows
+
+
+class CoveragePlanner:
+    """Разворачивает операции в тестовые случаи с покрытием комбинаций параметров."""
+
+    def __init__(
+        self,
+        strength: int = 2,
+        max_cases: int = 32,
+        max_levels: int = 8,
+        seed: int = 0,
+        resolver: Optional[SchemaResolver] = None
+    ):
+        """Инициализация.
+
+        Args:
+            strength: Сила покрытия (2 - pairwise, 3 - все тройки параметров)
+            max_cases: Предельное количество запросов на операцию
+            max_levels: Предельное количество значений enum на параметр
+            seed: Seed построения покрывающего массива
+            resolver: Резолвер $ref в схемах параметров
+        """
+        self.strength = strength
+        self.max_cases = max_cases
+        self.max_levels = max_levels
+        self.seed = seed
+        self.resolver = resolver or SchemaResolver()
+
+    def levels(self, param: Any) -> List[Any]:
+        """Уровни фактора для параметра."""
+        schema = self.resolver.resolve(param.schema_ or {})
+        if not isinstance(schema, dict):
+            schema = {}
+
+        if schema.get('enum'):
+            values = list(schema['enum'][:self.max_levels])
+        elif schema.get('type') == 'boolean':
+            values = [True, False]
+        elif schema.get('type') in ('integer', 'number'):
+            values = [DEFAULT_VALUE]
+            for bound in ('minimum', 'maximum'):
+                if schema.get(bound) is not None and schema[bound] not in values:
+                    values.append(schema[bound])
+        else:
+            values = [DEFAULT_VALUE]
+
+        if not param.required and param.in_ != 'path':
+            values.append(OMIT_PARAMETER)
+        return values
+
+    def factors(self, operation_info: Dict[str, Any]) -> List[Tuple[str, List[Any]]]:
+        """Параметры операции, у которых больше одного уровня."""
+        factors = []
+        for param in operation_info['parameters']:
+            if param.in_ not in ('query', 'header', 'path'):
+                continue
+            values = self.levels(param)
+            if len(values) > 1:
+                factors.append((param.name, values))
+        return factors
+
+    def cases(self, operation_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Наборы значений параметров (param_overrides) для операции."""
+        factors = self.factors(operation_info)
+        if not factors:
+            return [{}]
+
+        rows = covering_array([len(values) for _, values in factors], self.strength,
+                              self.max_cases, seed=self.seed)
+        cases = []
+        for row in rows:
+            cases.append({
+                name: values[level]
+                for (name, values), level in zip(factors, row)
+                if values[level] is not DEFAULT_VALUE
+            })
+        return cases
+
+    def expand(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Разворачивает операции в тестовые случаи.
+
+        Операции без вариативных параметров остаются как есть. Остальные
+        повторяются для каждого набора значений с ключом 'param_overrides'
+        и описанием набора в summary.
+        """
+        expanded = []
+        for operation_info in operations:
+            cases = self.cases(operation_info)
+            if cases == [{}]:
+                expanded.append(operation_info)
+                continue
+            for overrides in cases:
+                case = dict(operation_info)
+                case['param_overrides'] = overrides
+                case['summary'] = f"{operation_info['summary']} [{self.describe(overrides)}]"
+                expanded.append(case)
+        return expanded
+
+    @staticmethod
+    def describe(overrides: Dict[str, Any]) -> str:
+        """Краткое описание набора значений: 'limit=50, sort=—'."""
+        if not overrides:
+            return 'по умолчанию'
+        return ', '.join(
+            f"{name}={'—' if value is OMIT_PARAMETER else value}" for name, value in overrides.items()
+        )
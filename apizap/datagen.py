@@ -0,0 +1,281 @@
+"""Генерация тестовых данных по схемам OpenAPI.
+
+Схема один раз компилируется в функцию-генератор: ограничения (enum, format,
+minimum/maximum, minLength/maxLength, minItems/maxItems, required) разбираются
+при компиляции, а генерация значения - это вызов замыканий без обхода словаря
+схемы. Значение определяется seed и порядковым номером, поэтому партия из N
+значений детерминирована и, насколько позволяют ограничения, состоит из
+различных значений.
+"""
+
+import base64
+import random
+import string
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .schema import SchemaResolver
+
+
+# Генератор: (rng, номер значения, глубина вложенности) -> значение
+GeneratorFunc = Callable[[random.Random, int, int], Any]
+
+# Глубже этого уровня необязательные массивы и рекурсивные структуры не разворачиваются
+MAX_DEPTH = 4
+
+_ALPHABET = string.digits + string.ascii_lowercase
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _encode_index(index: int) -> str:
+    """Короткое представление номера в base36."""
+    if index == 0:
+        return '0'
+    digits = []
+    while index:
+        index, remainder = divmod(index, 36)
+        digits.append(_ALPHABET[remainder])
+    return ''.join(reversed(digits))
+
+
+def _fit_length(value: str, min_length: int, max_length: Optional[int], index: int) -> str:
+    """Подгоняет строку под minLength/maxLength, сохраняя уникальный суффикс."""
+    if max_length is not None and len(value) > max_length:
+        suffix = _encode_index(index)
+        value = (value[:max(0, max_length - len(suffix))] + suffix)[-max_length:] if max_length else ''
+    if len(value) < min_length:
+        value = value + 'x' * (min_length - len(value))
+    return value
+
+
+_FORMATS: Dict[str, Callable[[random.Random, int], str]] = {
+    'date-time': lambda rng, i: (_EPOCH + timedelta(seconds=i * 3600 + rng.randrange(3600))).isoformat(),
+    'date': lambda rng, i: (date(2024, 1, 1) + timedelta(days=i)).isoformat(),
+    'time': lambda rng, i: f"{(i // 60) % 24:02d}:{i % 60:02d}:{rng.randrange(60):02d}",
+    'email': lambda rng, i: f"user{i}@example.com",
+    'uuid': lambda rng, i: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+    'uri': lambda rng, i: f"https://example.com/resource/{i}",
+    'url': lambda rng, i: f"https://example.com/resource/{i}",
+    'hostname': lambda rng, i: f"host{i}.example.com",
+    'ipv4': lambda rng, i: f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+    'ipv6': lambda rng, i: f"fd00::{i:x}",
+    'byte': lambda rng, i: base64.b64encode(f"test{i}".encode()).decode(),
+    'password': lambda rng, i: f"Passw0rd!{i}",
+}
+
+
+class DataGenerator:
+    """Компилирует схемы в генераторы и выдает значения по seed и номеру."""
+
+    def __init__(self, resolver: Optional[SchemaResolver] = None, seed: int = 0):
+        """Инициализация.
+
+        Args:
+            resolver: Резолвер $ref спецификации (SchemaResolver.from_spec)
+            seed: Seed генерации
+        """
+        self.resolver = resolver or SchemaResolver()
+        self.seed = seed
+        self._cache: Dict[Any, GeneratorFunc] = {}
+        # Генераторы текущей компиляции (в том числе позднее связывание
+        # рекурсивных ссылок); видны только компилирующему потоку под
+        # блокировкой и попадают в _cache все вместе, когда компиляция закончена
+        self._pending: Dict[Any, GeneratorFunc] = {}
+        # Схемы, закэшированные по id(), удерживаются, чтобы id не переиспользовался
+        self._schemas: List[Any] = []
+        self._lock = threading.Lock()
+
+    def compile(self, schema: Any) -> GeneratorFunc:
+        """Возвращает генератор схемы (компилируется один раз)."""
+        key = schema['$ref'] if isinstance(schema, dict) and '$ref' in schema else id(schema)
+        generator = self._cache.get(key)
+        if generator is None:
+            with self._lock:
+                generator = self._cache.get(key)
+                if generator is None:
+                    generator = self._compile_pending(key, schema)
+        return generator
+
+    def generate(self, schema: Any, index: int = 0) -> Any:
+        """Генерирует значение с номером index."""
+        return self.compile(schema)(random.Random(f"{self.seed}:{index}"), index, 0)
+
+    def batch(self, schema: Any, count: int, start: int = 0) -> List[Any]:
+        """Генерирует count значений с номерами start..start+count-1.
+
+        Схема компилируется один раз, а случайные числа берутся из одного
+        генератора, поэтому партия обходится дешевле count вызовов generate.
+        """
+        generator = self.compile(schema)
+        rng = random.Random(f"{self.seed}:batch:{start}")
+        return [generator(rng, index, 0) for index in range(start, start + count)]
+
+    # --- Компиляция ------------------------------------------------------
+
+    def _compile_pending(self, key: Any, schema: Any) -> GeneratorFunc:
+        # Вложенные генераторы могут ссылаться на еще не связанные ссылки
+        # внешней схемы, поэтому публикуются только после ее завершения
+        kept = len(self._schemas)
+        try:
+            generator = self._compile_keyed(key, schema)
+            self._cache.update(self._pending)
+        except Exception:
+            del self._schemas[kept:]
+            raise
+        finally:
+            self._pending.clear()
+        return generator
+
+    def _compile_keyed(self, key: Any, schema: Any) -> GeneratorFunc:
+        if isinstance(key, str):
+            # Ссылка может быть рекурсивной: сначала регистрируем позднее связывание
+            target: List[GeneratorFunc] = []
+            self._pending[key] = lambda rng, i, depth: target[0](rng, i, depth)
+            target.append(self._compile(self.resolver.resolve(schema)))
+            self._pending[key] = target[0]
+            return target[0]
+
+        generator = self._pending[key] = self._compile(schema)
+        self._schemas.append(schema)
+        return generator
+
+    def _child(self, schema: Any) -> GeneratorFunc:
+        key = schema['$ref'] if isinstance(schema, dict) and '$ref' in schema else id(schema)
+        generator = self._cache.get(key) or self._pending.get(key)
+        return generator if generator is not None else self._compile_keyed(key, schema)
+
+    def _compile(self, schema: Any) -> GeneratorFunc:
+        if not isinstance(schema, dict):
+            return lambda rng, i, depth: "test_value"
+
+        if 'enum' in schema and schema['enum']:
+            values = list(schema['enum'])
+            return lambda rng, i, depth: values[i % len(values)]
+        if 'const' in schema:
+            const = schema['const']
+            return lambda rng, i, depth: const
+
+        for keyword in ('oneOf', 'anyOf'):
+            if schema.get(keyword):
+                return self._child(schema[keyword][0])
+        if schema.get('allOf'):
+            return self._compile_all_of(schema['allOf'])
+
+        generator = self._compile_type(schema)
+        if 'example' in schema:
+            example = schema['example']
+            return lambda rng, i, depth: example if i == 0 else generator(rng, i, depth)
+        return generator
+
+    def _compile_type(self, schema: Dict[str, Any]) -> GeneratorFunc:
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != 'null'), 'string')
+        if schema_type is None:
+            schema_type = 'object' if 'properties' in schema else 'string'
+
+        if schema_type == 'string':
+            return self._compile_string(schema)
+        if schema_type == 'integer':
+            return self._compile_integer(schema)
+        if schema_type == 'number':
+            return self._compile_number(schema)
+        if schema_type == 'boolean':
+            return lambda rng, i, depth: i % 2 == 0
+        if schema_type == 'array':
+            return self._compile_array(schema)
+        if schema_type == 'object':
+            return self._compile_object(schema)
+        return lambda rng, i, depth: None
+
+    @staticmethod
+    def _compile_string(schema: Dict[str, Any]) -> GeneratorFunc:
+        min_length = int(schema.get('minLength', 0))
+        max_length = schema.get('maxLength')
+        max_length = int(max_length) if max_length is not None else None
+        format_func = _FORMATS.get(schema.get('format', ''))
+
+        if format_func is not None:
+            return lambda rng, i, depth: _fit_length(format_func(rng, i), min_length, max_length, i)
+        return lambda rng, i, depth: _fit_length(f"test_{i}", min_length, max_length, i)
+
+    @staticmethod
+    def _bounds(schema: Dict[str, Any], step: float) -> tuple:
+        low = schema.get('minimum')
+        high = schema.get('maximum')
+        exclusive_low = schema.get('exclusiveMinimum')
+        exclusive_high = schema.get('exclusiveMaximum')
+        if isinstance(exclusive_low, (int, float)) and not isinstance(exclusive_low, bool):
+            low = exclusive_low + step
+        elif exclusive_low is True and low is not None:
+            low = low + step
+        if isinstance(exclusive_high, (int, float)) and not isinstance(exclusive_high, bool):
+            high = exclusive_high - step
+        elif exclusive_high is True and high is not None:
+            high = high - step
+        return low, high
+
+    def _compile_integer(self, schema: Dict[str, Any]) -> GeneratorFunc:
+        multiple = int(schema.get('multipleOf') or 1)
+        low, high = self._bounds(schema, 1)
+        low = int(low) if low is not None else 1
+        high = int(high) if high is not None else low + 10 ** 6
+        # Значения - кратные multipleOf из [low, high]
+        first = -(-low // multiple) * multiple
+        count = max(1, (high - first) // multiple + 1)
+        return lambda rng, i, depth: first + (i % count) * multiple
+
+    def _compile_number(self, schema: Dict[str, Any]) -> GeneratorFunc:
+        multiple = schema.get('multipleOf')
+        low, high = self._bounds(schema, 0.01)
+        low = float(low) if low is not None else 1.0
+        high = float(high) if high is not None else low + 1000.0
+        span = max(0.0, high - low)
+
+        if multiple:
+            steps = max(1, int(span // multiple) + 1)
+            first = -(-low // multiple) * multiple
+            return lambda rng, i, depth: round(first + (i % steps) * multiple, 10)
+        if not span:
+            return lambda rng, i, depth: low
+        return lambda rng, i, depth: low if i == 0 else round(low + rng.random() * span, 2)
+
+    def _compile_array(self, schema: Dict[str, Any]) -> GeneratorFunc:
+        item = self._child(schema.get('items') or {})
+        min_items = int(schema.get('minItems', 0))
+        max_items = schema.get('maxItems')
+        size = max(min_items, 1)
+        if max_items is not None:
+            size = min(size, int(max_items))
+
+        def generate(rng: random.Random, i: int, depth: int) -> List[Any]:
+            count = size if depth < MAX_DEPTH else min_items
+            return [item(rng, i * size + k, depth + 1) for k in range(count)]
+
+        return generate
+
+    def _compile_object(self, schema: Dict[str, Any]) -> GeneratorFunc:
+        properties = schema.get('properties') or {}
+        # Как и прежде, генерируются только обязательные поля
+        fields = [(name, self._child(properties.get(name, {}))) for name in schema.get('required') or []]
+
+        def generate(rng: random.Random, i: int, depth: int) -> Dict[str, Any]:
+            return {name: field(rng, i, depth + 1) for name, field in fields}
+
+        return generate
+
+    def _compile_all_of(self, schemas: List[Any]) -> GeneratorFunc:
+        parts = [self._child(sub) for sub in schemas]
+
+        def generate(rng: random.Random, i: int, depth: int) -> Any:
+            merged: Dict[str, Any] = {}
+            for part in parts:
+                value = part(rng, i, depth)
+                if not isinstance(value, dict):
+                    return value
+                merged.update(value)
+            return merged
+
+        return generate
@@ -0,0 +1,148 @@
+"""Движки выполнения запросов: последовательный, потоковый, асинхронный и многопроцессный."""
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from .tester import APITester
+
+
+ENGINES = ('serial', 'threaded', 'async', 'process')
+
+
+def run_operations(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    engine: str = 'serial',
+    workers: int = 4
+) -> List[Dict[str, Any]]:
+    """Выполняет операции выбранным движком.
+
+    Порядок результатов совпадает с порядком операций независимо от движка.
+
+    Args:
+        tester_factory: Фабрика тестеров. Для движка process должна быть
+            сериализуемой (например, functools.partial(APITester, ...))
+        base_url: Базовый URL API
+        operations: Операции из OpenAPIParser.get_all_operations
+        engine: Один из ENGINES
+        workers: Количество параллельных исполнителей
+
+    Returns:
+        Список результатов тестирования
+    """
+    if engine == 'serial':
+        return _run_serial(tester_factory, base_url, operations)
+    if engine == 'threaded':
+        return _run_threaded(tester_factory, base_url, operations, workers)
+    if engine == 'async':
+        return _run_async(tester_factory, base_url, operations, workers)
+    if engine == 'process':
+        return _run_process(tester_factory, base_url, operations, workers)
+    raise ValueError(f"Неизвестный движок выполнения: {engine}")
+
+
+def _run_serial(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Последовательно выполняет операции одним тестером."""
+    tester = tester_factory()
+    return [tester.test_operation(base_url, operation_info) for operation_info in operations]
+
+
+class ThreadLocalTesters:
+    """Выдает каждому потоку собственный тестер (и собственный пул соединений)."""
+
+    def __init__(self, tester_factory: Callable[[], APITester]):
+        self._factory = tester_factory
+        self._local = threading.local()
+
+    def get(self) -> APITester:
+        tester = getattr(self._local, 'tester', None)
+        if tester is None:
+            tester = self._factory()
+            self._local.tester = tester
+        return tester
+
+
+def _run_threaded(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """Выполняет операции в пуле потоков."""
+    testers = ThreadLocalTesters(tester_factory)
+
+    def run_one(operation_info: Dict[str, Any]) -> Dict[str, Any]:
+        return testers.get().test_operation(base_url, operation_info)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_one, operations))
+
+
+def _run_async(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """Выполняет операции из цикла событий asyncio.
+
+    HTTP-транспорт APITester (requests) блокирующий, поэтому сами запросы
+    уходят в исполнитель цикла событий, а конкурентность ограничивается семафором.
+    """
+    testers = ThreadLocalTesters(tester_factory)
+
+    async def run_all() -> List[Dict[str, Any]]:
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+        async def run_one(operation_info: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    executor,
+                    lambda: testers.get().test_operation(base_url, operation_info)
+                )
+
+        try:
+            return list(await asyncio.gather(*(run_one(op) for op in operations)))
+        finally:
+            executor.shutdown(wait=True)
+
+    return asyncio.run(run_all())
+
+
+def _run_chunk(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Выполняет часть операций в дочернем процессе."""
+    return _run_serial(tester_factory, base_url, operations)
+
+
+def _run_process(
+    tester_factory: Callable[[], APITester],
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """Выполняет операции в пуле процессов, по одному непрерывному куску на процесс."""
+    if not operations:
+        return []
+
+    chunk_size = -(-len(operations) // workers)
+    chunks = [operations[i:i + chunk_size] for i in range(0, len(operations), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = [executor.submit(_run_chunk, tester_factory, base_url, chunk) for chunk in chunks]
+        for future in futures:
+            results.extend(future.result())
+    return results
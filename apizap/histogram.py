@@ -0,0 +1,109 @@
+"""Гистограмма задержек с логарифмическими корзинами.
+
+Память гистограммы не зависит от количества измерений: значения попадают
+в корзины, ширина которых растет геометрически, поэтому относительная
+погрешность перцентилей ограничена (по умолчанию около 1%).
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """Разреженная логарифмическая гистограмма значений в миллисекундах."""
+
+    __slots__ = ('precision', 'min_value', 'count', 'total', 'min', 'max', 'zero_count',
+                 'buckets', '_log_base')
+
+    def __init__(self, precision: float = 0.02, min_value: float = 0.001):
+        """Инициализация гистограммы.
+
+        Args:
+            precision: Относительная ширина корзины (0.02 - корзины растут на 2%)
+            min_value: Наименьшее различимое значение в миллисекундах
+        """
+        self.precision = precision
+        self.min_value = min_value
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+        self._log_base = math.log1p(precision)
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Добавляет значение (можно сразу несколько одинаковых)."""
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if value < self.min_value:
+            self.zero_count += count
+            return
+        index = int(math.log(value / self.min_value) / self._log_base)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def record_all(self, values: Iterable[float]) -> None:
+        """Добавляет несколько значений."""
+        for value in values:
+            self.record(value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Возвращает приближенный перцентиль (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = self.zero_count
+        if seen >= rank:
+            return self.min if self.min is not None else 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                lower = self.min_value * math.exp(index * self._log_base)
+                value = lower * (1 + self.precision / 2)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Добавляет значения другой гистограммы с теми же параметрами."""
+        if (other.precision, other.min_value) != (self.precision, self.min_value):
+            raise ValueError("Нельзя объединить гистограммы с разными параметрами")
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def reset(self) -> None:
+        """Очищает гистограмму."""
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.zero_count = 0
+        self.buckets = {}
+
+    def to_dict(self, percentiles: Iterable[float] = (50, 95, 99)) -> Dict[str, float]:
+        """Сводка гистограммы: минимум, максимум, среднее и перцентили в мс."""
+        if not self.count:
+            return {}
+        stats = {
+            'min_ms': round(self.min, 2),
+            'max_ms': round(self.max, 2),
+            'avg_ms': round(self.mean, 2)
+        }
+        for percent in percentiles:
+            stats[f"p{percent:g}_ms"] = round(self.percentile(percent), 2)
+        return stats
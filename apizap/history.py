@@ -0,0 +1,92 @@
+"""История предыдущих прогонов: исходы и задержки операций.
+
+Источник истории - JSON отчет прошлого прогона (`--output json`). История
+используется, чтобы чаще выбирать в выборку и раньше запускать операции,
+которые падали или отвечали медленно.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+
+HistoryKey = Tuple[str, str]  # (МЕТОД, путь)
+
+# Множители веса операции по исходу прошлого прогона
+OUTCOME_WEIGHTS = {'FAIL': 4.0, 'WARN': 2.0}
+
+# Предельный множитель веса медленной операции относительно медианы
+MAX_SLOW_FACTOR = 10.0
+
+
+def history_key(operation: Mapping[str, Any]) -> HistoryKey:
+    """Ключ операции или результата в истории."""
+    return (operation['method'].upper(), operation['path'])
+
+
+class RunHistory:
+    """Исходы и задержки операций из предыдущего прогона."""
+
+    def __init__(self, entries: Optional[Dict[HistoryKey, Tuple[str, Optional[float]]]] = None):
+        """Инициализация истории.
+
+        Args:
+            entries: Отображение (метод, путь) -> (исход, задержка в мс)
+        """
+        self.entries = entries or {}
+        latencies = sorted(latency for _, latency in self.entries.values() if latency)
+        self.median_latency = latencies[len(latencies) // 2] if latencies else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def from_results(cls, results: Iterable[Mapping[str, Any]]) -> 'RunHistory':
+        """Строит историю по результатам прогона или записям JSON отчета."""
+        entries = {}
+        for result in results:
+            latency = result.get('response_time', result.get('response_time_ms'))
+            entries[history_key(result)] = (result['status'], latency)
+        return cls(entries)
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path]) -> 'RunHistory':
+        """Загружает историю из JSON отчета APIZap.
+
+        Raises:
+            ValueError: Если файл не является JSON отчетом APIZap
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Не удалось прочитать отчет {file_path}: {e}")
+
+        if not isinstance(report, dict) or not isinstance(report.get('tests'), list):
+            raise ValueError(f"Файл {file_path} не является JSON отчетом APIZap")
+        return cls.from_results(report['tests'])
+
+    def outcome(self, operation: Mapping[str, Any]) -> Optional[str]:
+        """Исход операции в прошлом прогоне (None - операция не запускалась)."""
+        entry = self.entries.get(history_key(operation))
+        return entry[0] if entry else None
+
+    def latency(self, operation: Mapping[str, Any]) -> Optional[float]:
+        """Задержка операции в прошлом прогоне в мс."""
+        entry = self.entries.get(history_key(operation))
+        return entry[1] if entry else None
+
+    def weight(self, operation: Mapping[str, Any]) -> float:
+        """Вес операции: упавшие и медленные операции весят больше.
+
+        Неизвестные истории операции получают нейтральный вес 1.
+        """
+        entry = self.entries.get(history_key(operation))
+        if entry is None:
+            return 1.0
+
+        outcome, latency = entry
+        weight = OUTCOME_WEIGHTS.get(outcome, 1.0)
+        if latency and self.median_latency:
+            weight *= min(max(latency / self.median_latency, 1.0), MAX_SLOW_FACTOR)
+        return weight
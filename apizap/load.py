@@ -0,0 +1,249 @@
+"""Нагрузка с открытым циклом: запросы по расписанию, а не по готовности ответов.
+
+Закрытый цикл (как test_all_endpoints) отправляет следующий запрос только
+после ответа на предыдущий, поэтому при зависании сервера перестает слать
+запросы и недооценивает хвост задержек (coordinated omission). Здесь
+запросы отправляются в заранее рассчитанные моменты времени независимо от
+ответов, а задержка отсчитывается от запланированного момента отправки:
+если свободных исполнителей нет, ожидание в очереди входит в задержку так
+же, как его увидел бы реальный пользователь.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .engines import ThreadLocalTesters
+from .histogram import LatencyHistogram
+from .log import RequestLogger
+
+
+# Последнюю миллисекунду до отправки планировщик не спит, а уступает процессор
+SPIN_SECONDS = 0.001
+
+_RATE_UNITS = {'ms': 0.001, 's': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600}
+_RATE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(?:/\s*([a-z]+))?\s*$')
+_DURATION_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$')
+
+
+def parse_rate(value: str) -> float:
+    """Разбирает интенсивность: '500/s', '30000/min', '50' (в секунду).
+
+    Returns:
+        Запросов в секунду
+
+    Raises:
+        ValueError: Если значение не распознано или не положительно
+    """
+    match = _RATE_PATTERN.match(value.lower())
+    if not match or (match.group(2) or 's') not in _RATE_UNITS:
+        raise ValueError(f"Некорректная интенсивность: {value}")
+    rate = float(match.group(1)) / _RATE_UNITS[match.group(2) or 's']
+    if rate <= 0:
+        raise ValueError(f"Интенсивность должна быть больше нуля: {value}")
+    return rate
+
+
+def parse_duration(value: str) -> float:
+    """Разбирает длительность: '30s', '2m', '1.5h', '500ms', '45' (секунды).
+
+    Raises:
+        ValueError: Если значение не распознано
+    """
+    match = _DURATION_PATTERN.match(value.lower())
+    if not match or (match.group(2) or 's') not in _RATE_UNITS:
+        raise ValueError(f"Некорректная длительность: {value}")
+    return float(match.group(1)) * _RATE_UNITS[match.group(2) or 's']
+
+
+def load_data_file(path: str, description: str) -> Any:
+    """Читает файл настроек в JSON (по расширению .json) или YAML.
+
+    Args:
+        path: Путь к файлу
+        description: Что содержит файл, в родительном падеже (для сообщения об ошибке)
+
+    Raises:
+        ValueError: Если для YAML файла не установлен PyYAML
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if path.endswith('.json'):
+        return json.loads(content)
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"PyYAML не установлен для чтения {description} в YAML") from None
+    return yaml.safe_load(content)
+
+
+def constant_arrivals(rate: float, duration: float) -> Iterator[float]:
+    """Моменты отправки (секунды от начала) при постоянной интенсивности."""
+    interval = 1.0 / rate
+    for index in range(int(rate * duration)):
+        yield index * interval
+
+
+def wait_until(deadline: float) -> None:
+    """Ждет момента deadline (по time.perf_counter) с точностью до долей миллисекунды."""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        if remaining > SPIN_SECONDS:
+            time.sleep(remaining - SPIN_SECONDS)
+        else:
+            time.sleep(0)
+
+
+def _log_failure(future: Any) -> None:
+    """Логирует исключение запроса, результат которого не сохраняется."""
+    error = future.exception()
+    if error is not None:
+        logger.opt(exception=error).error("Ошибка при выполнении запроса нагрузки")
+
+
+class OpenLoopRunner:
+    """Отправляет операции в заданные моменты времени пулом исполнителей."""
+
+    def __init__(
+        self,
+        tester_factory: Callable[[], Any],
+        base_url: str,
+        operations: List[Dict[str, Any]],
+        max_in_flight: int = 100,
+        result_hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None,
+        picker: Optional[Callable[[int], Dict[str, Any]]] = None,
+        log_sample_every: int = 1,
+        progress_interval: Optional[float] = None,
+        keep_results: bool = True,
+        max_pending: Optional[int] = None
+    ):
+        """Инициализация.
+
+        Args:
+            tester_factory: Фабрика тестеров без хуков результатов
+                (хуки вызываются здесь, уже с исправленной задержкой)
+            base_url: Базовый URL API
+            operations: Операции нагрузки
+            max_in_flight: Наибольшее число одновременных запросов
+            result_hooks: Функции, вызываемые с каждым результатом
+            picker: Выбор операции по номеру запроса (по умолчанию - по кругу)
+            log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+            progress_interval: Период строки прогресса в секундах (None - выключена)
+            keep_results: Возвращать результаты из run (False - только хуки,
+                память не растет с длительностью нагрузки)
+            max_pending: Наибольшее число отправленных, но не завершенных
+                запросов, включая ожидающие исполнителя (None - без
+                ограничения). При превышении планировщик ждет, чтобы очередь
+                не росла без границ; задержка по-прежнему отсчитывается от
+                запланированного момента
+        """
+        self.testers = ThreadLocalTesters(tester_factory)
+        self.base_url = base_url
+        self.operations = operations
+        self.max_in_flight = max(1, max_in_flight)
+        self.result_hooks = list(result_hooks or [])
+        self.picker = picker or (lambda index: operations[index % len(operations)])
+        self.log_sample_every = log_sample_every
+        self.progress_interval = progress_interval
+        self.keep_results = keep_results
+        self.dispatch_lag = LatencyHistogram()
+        self.sent = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._request_log: Optional[RequestLogger] = None
+
+    def run(self, arrivals: Iterable[float], expected: int = 0) -> List[Dict[str, Any]]:
+        """Выполняет нагрузку.
+
+        Args:
+            arrivals: Неубывающие моменты отправки в секундах от начала
+                (constant_arrivals или профиль нагрузки)
+            expected: Ожидаемое количество запросов (для строки прогресса)
+
+        Returns:
+            Результаты в порядке запланированной отправки (пустой список при
+            keep_results=False). response_time - задержка от запланированного
+            момента до ответа, service_time - время самого запроса,
+            scheduled_at - запланированный момент в секундах от начала
+        """
+        picker = self.picker
+        return self.run_schedule(
+            ((offset, picker(index)) for index, offset in enumerate(arrivals)), expected
+        )
+
+    def run_schedule(
+        self,
+        schedule: Iterable[Tuple[float, Dict[str, Any]]],
+        expected: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Выполняет нагрузку по готовому расписанию.
+
+        Args:
+            schedule: Пары (момент отправки в секундах от начала, операция);
+                читается лениво, поэтому может быть потоковым генератором
+            expected: Ожидаемое количество запросов (для строки прогресса)
+
+        Returns:
+            Результаты, как в run
+        """
+        self._request_log = RequestLogger(expected, self.log_sample_every, self.progress_interval)
+        futures = []
+        self.sent = 0
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for index, (offset, operation_info) in enumerate(schedule):
+                intended = started + offset
+                wait_until(intended)
+                if self._pending is not None:
+                    self._pending.acquire()
+                self.dispatch_lag.record((time.perf_counter() - intended) * 1000)
+                self._request_log.before(index + 1, operation_info)
+                future = executor.submit(self._send, operation_info, intended, offset)
+                self.sent += 1
+                if self._pending is not None:
+                    future.add_done_callback(self._release)
+                if self.keep_results:
+                    futures.append(future)
+                else:
+                    future.add_done_callback(_log_failure)
+            results = [future.result() for future in futures]
+
+        self.elapsed = time.perf_counter() - started
+        lag_p99 = self.dispatch_lag.percentile(99) if self.dispatch_lag.count else 0.0
+        if lag_p99 > 10:
+            logger.warning(f"Планировщик отстает от расписания: p99 {lag_p99:.1f}ms")
+        return results
+
+    def _release(self, future: Any) -> None:
+        self._pending.release()
+
+    def _send(self, operation_info: Dict[str, Any], intended: float, offset: float) -> Dict[str, Any]:
+        result = self.testers.get().test_operation(self.base_url, operation_info)
+        done = time.perf_counter()
+        result['service_time'] = result.get('response_time')
+        result['response_time'] = round((done - intended) * 1000, 2)
+        result['scheduled_at'] = offset
+
+        for hook in self.result_hooks:
+            hook(result)
+        with self._lock:
+            self._request_log.after(result)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Фактическая интенсивность и отставание планировщика."""
+        return {
+            'sent': self.sent,
+            'elapsed_s': round(self.elapsed, 3),
+            'achieved_rate': round(self.sent / self.elapsed, 2) if self.elapsed else 0.0,
+            'dispatch_lag': self.dispatch_lag.to_dict()
+        }
@@ -0,0 +1,87 @@
+"""Логирование с низкими накладными расходами на горячем пути запросов.
+
+Строки на каждый запрос формируются лениво: loguru подставляет аргументы
+только если сообщение проходит по уровню хотя бы одного обработчика. В
+режиме горячего пути запись в stderr идет через очередь в фоновом потоке,
+строки по отдельным запросам логируются выборочно (каждый N-й запрос и все
+FAIL), а раз в несколько секунд выводится строка прогресса.
+"""
+
+import sys
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from loguru import logger
+
+
+LOG_MODES = ('full', 'hot')
+
+
+def configure_logging(verbose: bool = False, enqueue: bool = False) -> None:
+    """Настраивает единственный обработчик loguru в stderr.
+
+    Args:
+        verbose: Выводить DEBUG сообщения
+        enqueue: Писать через очередь в фоновом потоке, не блокируя запросы
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if verbose else "INFO", enqueue=enqueue)
+
+
+class RequestLogger:
+    """Логирование хода прогона по запросам.
+
+    По умолчанию (sample_every=1, без progress_interval) ведет себя как
+    прежний цикл test_all_endpoints: строка на каждый запрос.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        sample_every: int = 1,
+        progress_interval: Optional[float] = None
+    ):
+        """Инициализация логгера запросов.
+
+        Args:
+            total: Общее количество запросов
+            sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+            progress_interval: Период строки прогресса в секундах (None - выключена)
+        """
+        self.total = total
+        self.sample_every = max(1, sample_every)
+        self.progress_interval = progress_interval
+        self.outcomes: Dict[str, int] = {'PASS': 0, 'WARN': 0, 'FAIL': 0}
+        self.completed = 0
+        self._started = time.monotonic()
+        self._next_progress = self._started + (progress_interval or 0)
+
+    def before(self, index: int, operation_info: Mapping[str, Any]) -> None:
+        """Вызывается перед запросом с его порядковым номером (с 1)."""
+        if self.sample_every == 1 or index % self.sample_every == 1:
+            logger.info("[{}/{}] Тестируем: {} {}", index, self.total,
+                        operation_info['method'], operation_info['path'])
+
+    def after(self, result: Mapping[str, Any]) -> None:
+        """Вызывается после запроса с его результатом."""
+        status = result['status']
+        self.completed += 1
+        self.outcomes[status] = self.outcomes.get(status, 0) + 1
+
+        if status == 'FAIL' and self.sample_every > 1:
+            logger.warning("FAIL {} {} ({}): {}", result['method'], result['path'],
+                           result.get('status_code'), result.get('error'))
+
+        if self.progress_interval:
+            now = time.monotonic()
+            if now >= self._next_progress:
+                self._next_progress = now + self.progress_interval
+                self.log_progress(now)
+
+    def log_progress(self, now: Optional[float] = None) -> None:
+        """Выводит строку прогресса."""
+        elapsed = (now or time.monotonic()) - self._started
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        logger.info("Прогресс: {}/{} | ✅ {} ⚠️ {} ❌ {} | {:.1f} запр/с",
+                    self.completed, self.total, self.outcomes['PASS'],
+                    self.outcomes['WARN'], self.outcomes['FAIL'], rate)
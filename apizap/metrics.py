@@ -0,0 +1,217 @@
+"""Экспорт метрик выполнения в формате OpenMetrics/Prometheus."""
+
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .results import status_class
+
+
+# Границы гистограммы задержек в секундах (как у клиентов Prometheus по умолчанию)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LABEL_NAMES = ('operation_id', 'method', 'status_class', 'outcome')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Индексы в записи шарда: [count, sum_seconds, bytes, bucket_0, ..., bucket_n]
+_COUNT, _SUM, _BYTES, _BUCKETS = 0, 1, 2, 3
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Счетчики и гистограммы задержек по результатам тестов.
+
+    Запись ведется без блокировок: каждый поток пишет в собственный шард,
+    а шарды суммируются только при чтении метрик. Под GIL операции над
+    словарем и списком шарда атомарны, поэтому горячий путь не конкурирует
+    с другими потоками и с обработчиком /metrics.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._shards: List[Dict[Tuple[str, ...], List[float]]] = []
+        self._local = threading.local()
+
+    def _shard(self) -> Dict[Tuple[str, ...], List[float]]:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            self._shards.append(shard)
+        return shard
+
+    def observe(self, result: Dict[str, Any]) -> None:
+        """Учитывает результат теста. Подходит в качестве хука APITester."""
+        labels = (
+            str(result.get('operation_id')),
+            result['method'],
+            status_class(result.get('status_code')),
+            result['status'],
+        )
+        seconds = (result.get('response_time') or 0.0) / 1000.0
+
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = [0, 0.0, 0] + [0] * (len(self.buckets) + 1)
+            shard[labels] = entry
+
+        entry[_COUNT] += 1
+        entry[_SUM] += seconds
+        entry[_BYTES] += result.get('response_size') or 0
+        entry[_BUCKETS + bisect_left(self.buckets, seconds)] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Суммирует шарды всех потоков."""
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in list(self._shards):
+            for labels, entry in dict(shard).items():
+                entry = list(entry)
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = entry
+                else:
+                    for i, value in enumerate(entry):
+                        total[i] += value
+        return merged
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Формирует текстовое представление метрик.
+
+        Args:
+            openmetrics: True - формат OpenMetrics, False - текстовый формат Prometheus
+
+        Returns:
+            Текст для ответа на /metrics
+        """
+        snapshot = sorted(self.snapshot().items())
+        counter_type = 'apizap_requests' if openmetrics else 'apizap_requests_total'
+        bytes_type = 'apizap_response_bytes' if openmetrics else 'apizap_response_bytes_total'
+
+        lines = [
+            f"# HELP {counter_type} Количество выполненных запросов.",
+            f"# TYPE {counter_type} counter",
+        ]
+        for labels, entry in snapshot:
+            lines.append(f"apizap_requests_total{{{self._labels(labels)}}} {int(entry[_COUNT])}")
+
+        lines.extend([
+            f"# HELP {bytes_type} Суммарный размер тел ответов в байтах.",
+            f"# TYPE {bytes_type} counter",
+        ])
+        for labels, entry in snapshot:
+            lines.append(f"apizap_response_bytes_total{{{self._labels(labels)}}} {int(entry[_BYTES])}")
+
+        lines.extend([
+            "# HELP apizap_request_duration_seconds Время ответа на запрос.",
+            "# TYPE apizap_request_duration_seconds histogram",
+        ])
+        for labels, entry in snapshot:
+            label_text = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry[_BUCKETS:]):
+                cumulative += int(count)
+                le = '+Inf' if bound == float('inf') else _format_float(bound)
+                lines.append(f'apizap_request_duration_seconds_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"apizap_request_duration_seconds_count{{{label_text}}} {int(entry[_COUNT])}")
+            lines.append(f"apizap_request_duration_seconds_sum{{{label_text}}} {_format_float(entry[_SUM])}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels: Tuple[str, ...]) -> str:
+        return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(LABEL_NAMES, labels))
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """HTTP сервер, отдающий метрики реестра на /metrics (и состояние на /status) в фоновом потоке."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        port: int,
+        host: str = '127.0.0.1',
+        status: Optional[Callable[[], Dict[str, Any]]] = None
+    ):
+        """Инициализация сервера.
+
+        Args:
+            registry: Реестр метрик
+            port: Порт (0 - выбрать свободный)
+            host: Адрес для прослушивания
+            status: Функция, результат которой отдается в JSON на /status
+                (например, скользящее окно apizap monitor)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.status = status
+        self._server: Optional[HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'MetricsServer':
+        """Запускает сервер в фоновом потоке."""
+        registry = self.registry
+        status = self.status
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/status' and status is not None:
+                    body = json.dumps(status(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                elif path == '/metrics':
+                    openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                    body = registry.render(openmetrics=openmetrics).encode('utf-8')
+                    content_type = OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Метрики доступны на http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MetricsServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,197 @@
+"""Модель смеси трафика для нагрузки.
+
+Каждой операции назначается вес: правилом (operationId, 'METHOD /path',
+tag:ИМЯ, method:МЕТОД) или расширением x-apizap-weight в спецификации.
+Следующая операция выбирается alias-методом Уокера (Vose): таблицы строятся
+один раз за O(n), а выбор - одно случайное число и одно сравнение, O(1)
+независимо от количества операций.
+"""
+
+import os
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .load import load_data_file
+
+
+# Расширение операции OpenAPI с весом в смеси трафика
+WEIGHT_EXTENSION = 'x-apizap-weight'
+
+
+class AliasSampler:
+    """Выбор индекса с заданными весами за O(1) (alias-метод)."""
+
+    __slots__ = ('size', 'probability', 'alias')
+
+    def __init__(self, weights: Sequence[float]):
+        """Строит таблицы вероятностей и псевдонимов.
+
+        Raises:
+            ValueError: Если веса пусты, отрицательны или все нулевые
+        """
+        total = float(sum(weights))
+        if not weights or total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("Веса смеси должны быть неотрицательными и не все нулевыми")
+
+        size = len(weights)
+        scaled = [weight * size / total for weight in weights]
+        probability = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Остатки из-за погрешности округления получают вероятность 1
+
+        self.size = size
+        self.probability = probability
+        self.alias = alias
+
+    def sample(self, uniform: float) -> int:
+        """Индекс по одному равномерному числу из [0, 1)."""
+        scaled = uniform * self.size
+        index = int(scaled)
+        return index if scaled - index < self.probability[index] else self.alias[index]
+
+
+def load_mix_rules(values: Iterable[str]) -> Dict[str, float]:
+    """Разбирает правила смеси из CLI.
+
+    Args:
+        values: Правила 'ключ=вес' (ключ - operationId, 'METHOD /path',
+            'tag:ИМЯ' или 'method:МЕТОД') или пути к файлам JSON/YAML
+            со словарем ключ -> вес
+
+    Raises:
+        ValueError: Если правило или файл некорректны
+    """
+    rules: Dict[str, float] = {}
+    for value in values:
+        if os.path.isfile(value):
+            entries = _load_file(value).items()
+        else:
+            key, separator, weight = value.rpartition('=')
+            if not separator or not key.strip():
+                raise ValueError(f"Некорректное правило смеси '{value}', ожидается ключ=вес")
+            entries = [(key, weight)]
+
+        for key, weight in entries:
+            try:
+                rules[_normalize_key(str(key))] = float(weight)
+            except (TypeError, ValueError):
+                raise ValueError(f"Некорректный вес '{weight}' для '{key}'") from None
+    return rules
+
+
+def _load_file(path: str) -> Dict[str, Any]:
+    data = load_data_file(path, 'смеси трафика')
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: ожидается словарь ключ -> вес")
+    return data
+
+
+def _normalize_key(key: str) -> str:
+    """Приводит ключ правила к виду 'tag:x', 'method:GET', 'GET /path' или operationId."""
+    key = key.strip()
+    prefix, separator, name = key.partition(':')
+    if separator and prefix.lower() == 'method':
+        return f"method:{name.strip().upper()}"
+    if separator and prefix.lower() == 'tag':
+        return f"tag:{name.strip()}"
+    method, space, path = key.partition(' ')
+    if space and path.strip().startswith('/'):
+        return f"{method.upper()} {path.strip()}"
+    return key
+
+
+def operation_weight(operation_info: Dict[str, Any]) -> Optional[float]:
+    """Вес из расширения x-apizap-weight операции.
+
+    Returns:
+        Вес или None, если расширение не задано или не является числом
+    """
+    weight = getattr(operation_info.get('operation'), 'x_apizap_weight', None)
+    if isinstance(weight, bool) or weight is None:
+        return None
+    try:
+        return float(weight)
+    except (TypeError, ValueError):
+        return None
+
+
+class TrafficMix:
+    """Веса операций и выбор следующей операции по ним."""
+
+    def __init__(
+        self,
+        operations: List[Dict[str, Any]],
+        rules: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0
+    ):
+        """Назначает веса операциям.
+
+        Приоритет: правило для operationId или 'METHOD /path', затем
+        x-apizap-weight из спецификации, затем правило тега (первого тега
+        операции, для которого оно задано), затем правило метода, затем
+        default_weight. Операции с нулевым весом в нагрузку не попадают.
+
+        Raises:
+            ValueError: Если все веса нулевые
+        """
+        self.rules = dict(rules or {})
+        self.default_weight = default_weight
+        weighted = [(operation_info, self.weight(operation_info)) for operation_info in operations]
+        self.operations = [operation_info for operation_info, weight in weighted if weight > 0]
+        self.weights = [weight for _, weight in weighted if weight > 0]
+        if not self.operations:
+            raise ValueError("В смеси трафика нет операций с положительным весом")
+        self.sampler = AliasSampler(self.weights)
+
+    @classmethod
+    def has_weights(cls, operations: List[Dict[str, Any]]) -> bool:
+        """Есть ли у операций веса x-apizap-weight."""
+        return any(operation_weight(operation_info) is not None for operation_info in operations)
+
+    def weight(self, operation_info: Dict[str, Any]) -> float:
+        """Вес операции по правилам и расширению спецификации."""
+        for key in (operation_info.get('operation_id'),
+                    f"{operation_info['method']} {operation_info['path']}"):
+            if key in self.rules:
+                return self.rules[key]
+
+        weight = operation_weight(operation_info)
+        if weight is not None:
+            return weight
+
+        for tag in operation_info.get('tags') or ():
+            if f"tag:{tag}" in self.rules:
+                return self.rules[f"tag:{tag}"]
+        return self.rules.get(f"method:{operation_info['method']}", self.default_weight)
+
+    def shares(self) -> List[Tuple[Dict[str, Any], float]]:
+        """Доли операций в смеси, по убыванию."""
+        total = sum(self.weights)
+        return sorted(
+            ((operation_info, weight / total) for operation_info, weight in zip(self.operations, self.weights)),
+            key=lambda item: -item[1]
+        )
+
+    def picker(self, seed: Optional[int] = None) -> Callable[[int], Dict[str, Any]]:
+        """Функция выбора операции для OpenLoopRunner и ProfileRunner.
+
+        Args:
+            seed: Seed последовательности выбора (None - случайный)
+        """
+        uniform = random.Random(seed).random
+        sample = self.sampler.sample
+        operations = self.operations
+
+        def pick(index: int = 0) -> Dict[str, Any]:
+            return operations[sample(uniform())]
+
+        return pick
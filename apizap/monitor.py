@@ -0,0 +1,262 @@
+"""Синтетический мониторинг в одном долгоживущем процессе.
+
+Запуск APIZap из cron каждую минуту каждый раз платит за старт процесса,
+загрузку и валидацию спецификации и новые TCP/TLS соединения. Монитор
+держит разобранную спецификацию, список операций и сессию requests с пулом
+соединений между циклами. Спецификация перезагружается только если она
+изменилась: по ETag/Last-Modified (условный запрос, ответ 304 почти ничего
+не стоит) или по времени изменения файла. Результаты копятся в скользящем
+окне, память которого не зависит от длительности работы.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+import requests
+from loguru import logger
+
+from .aggregator import GroupStats
+from .datagen import DataGenerator
+from .parser import OpenAPIParser, OpenAPISpec
+from .schema import SchemaResolver
+
+
+class SpecWatcher:
+    """Загружает спецификацию заново, только если источник изменился."""
+
+    def __init__(self, source: str, parser: OpenAPIParser, selector: Optional[Any] = None):
+        """Инициализация.
+
+        Args:
+            source: URL спецификации или путь к файлу
+            parser: Парсер (его сессия используется для условных запросов)
+            selector: Критерии отбора операций (apizap.selection.OperationSelector)
+        """
+        self.source = source
+        self.parser = parser
+        self.selector = selector
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.file_stamp: Optional[Tuple[int, int]] = None
+        self.loads = 0
+
+    def poll(self) -> Optional[OpenAPISpec]:
+        """Новая спецификация, если источник изменился, иначе None.
+
+        Ошибки загрузки и валидации логируются и тоже дают None: монитор
+        продолжает работать с прежней спецификацией.
+        """
+        spec = self._poll_url() if self.parser._is_url(self.source) else self._poll_file()
+        if spec is not None:
+            self.loads += 1
+        return spec
+
+    def _poll_url(self) -> Optional[OpenAPISpec]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        elif self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        try:
+            response = self.parser.session.get(self.source, headers=headers, timeout=self.parser.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Не удалось проверить спецификацию {self.source}: {e}")
+            return None
+        if response.status_code == 304:
+            return None
+        if not response.ok:
+            logger.warning(f"HTTP {response.status_code} при проверке спецификации {self.source}")
+            return None
+
+        # Сервер может не поддерживать условные запросы: сравниваем ETag или содержимое
+        etag = response.headers.get('ETag')
+        digest = hashlib.sha1(response.content).hexdigest()
+        if (etag and etag == self.etag) or (not etag and digest == self.digest):
+            return None
+
+        # Валидаторы запоминаются только после успешного разбора, чтобы
+        # исправленная спецификация с тем же ETag не была пропущена
+        try:
+            spec_data = self.parser.decode_response(response, self.source)
+        except Exception as e:  # JSON, YAML или неожиданный формат
+            logger.warning(f"Не удалось разобрать спецификацию {self.source}: {e}")
+            return None
+        self.etag, self.digest = etag, digest
+        self.last_modified = response.headers.get('Last-Modified')
+        return self.parser.build_spec(spec_data, self.selector) if spec_data else None
+
+    def _poll_file(self) -> Optional[OpenAPISpec]:
+        try:
+            stat = os.stat(self.source)
+        except OSError as e:
+            logger.warning(f"Не удалось проверить спецификацию {self.source}: {e}")
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.file_stamp:
+            return None
+        self.file_stamp = stamp
+        return self.parser.parse(self.source, selector=self.selector)
+
+
+class RollingWindow:
+    """Результаты за последние window секунд по операциям.
+
+    Окно разбито на интервалы: в каждом хранятся счетчики и гистограмма
+    задержек по операциям, а устаревшие интервалы отбрасываются целиком.
+    Поэтому память зависит от числа операций и интервалов, но не от
+    количества проверок.
+    """
+
+    def __init__(self, window: float = 300.0, slots: int = 60, clock: Any = time.time):
+        """Инициализация.
+
+        Args:
+            window: Длина окна в секундах
+            slots: Количество интервалов в окне
+            clock: Источник времени (для тестов)
+        """
+        self.window = window
+        self.slot_seconds = window / max(1, slots)
+        self.clock = clock
+        self._slots: Deque[Tuple[int, Dict[str, GroupStats]]] = deque()
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """Учитывает результат проверки (хук результатов APITester)."""
+        now = self.clock()
+        key = f"{result['method']} {result['path']}"
+        slot = int(now // self.slot_seconds)
+        with self._lock:
+            if not self._slots or self._slots[-1][0] != slot:
+                self._slots.append((slot, {}))
+                self._prune(now)
+            groups = self._slots[-1][1]
+            stats = groups.get(key)
+            if stats is None:
+                stats = groups[key] = GroupStats()
+            stats.add(result['status'], result.get('response_time'))
+            self._last[key] = {
+                'status': result['status'],
+                'status_code': result.get('status_code'),
+                'error': result.get('error'),
+                'at': now
+            }
+
+    def _prune(self, now: float) -> None:
+        oldest = int((now - self.window) // self.slot_seconds)
+        while self._slots and self._slots[0][0] <= oldest:
+            self._slots.popleft()
+
+    def snapshot(self) -> Dict[str, GroupStats]:
+        """Статистика по операциям за окно."""
+        merged: Dict[str, GroupStats] = {}
+        with self._lock:
+            self._prune(self.clock())
+            for _, groups in self._slots:
+                for key, stats in groups.items():
+                    if key not in merged:
+                        merged[key] = GroupStats()
+                    merged[key].merge(stats)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Состояние окна для /status и отчета."""
+        snapshot = self.snapshot()
+        total = GroupStats()
+        operations = {}
+        for key in sorted(snapshot):
+            total.merge(snapshot[key])
+            last = self._last.get(key, {})
+            operations[key] = dict(
+                snapshot[key].to_dict(),
+                last_status=last.get('status'),
+                last_status_code=last.get('status_code'),
+                last_error=last.get('error')
+            )
+        return {'window_s': self.window, 'total': total.to_dict(), 'operations': operations}
+
+
+class Monitor:
+    """Проверяет операции по расписанию с разбросом, переиспользуя тестер."""
+
+    def __init__(
+        self,
+        watcher: SpecWatcher,
+        tester: Any,
+        interval: float = 60.0,
+        jitter: float = 0.1,
+        base_url: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        """Инициализация.
+
+        Args:
+            watcher: Источник спецификации
+            tester: APITester, через хуки которого результаты попадают в
+                RollingWindow и метрики; его сессия сохраняет соединения
+            interval: Период циклов проверки в секундах
+            jitter: Разброс периода (доля interval), чтобы несколько
+                мониторов не били в API одновременно
+            base_url: Базовый URL API (по умолчанию - из спецификации)
+            seed: Seed разброса (None - случайный)
+        """
+        self.watcher = watcher
+        self.tester = tester
+        self.interval = interval
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.base_url_override = base_url
+        self.base_url: Optional[str] = None
+        self.operations: List[Dict[str, Any]] = []
+        self.cycles = 0
+        self._random = random.Random(seed)
+
+    def reload(self) -> bool:
+        """Перезагружает спецификацию, если она изменилась.
+
+        Returns:
+            True, если загружена новая спецификация
+        """
+        spec = self.watcher.poll()
+        if spec is None:
+            return False
+        self.operations = self.watcher.parser.get_all_operations(spec)
+        self.base_url = self.base_url_override or self.watcher.parser.get_base_url(spec)
+        self.tester.data_generator = DataGenerator(SchemaResolver.from_spec(spec))
+        logger.info(f"Спецификация загружена ({self.watcher.loads}): {len(self.operations)} операций, {self.base_url}")
+        return True
+
+    def run_cycle(self) -> List[Any]:
+        """Один цикл: проверка спецификации и всех операций."""
+        self.reload()
+        results = [self.tester.test_operation(self.base_url, operation_info) for operation_info in self.operations]
+        self.cycles += 1
+        return results
+
+    def next_delay(self) -> float:
+        """Пауза до следующего цикла с учетом разброса."""
+        return self.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def run(self, stop: Optional[threading.Event] = None, max_cycles: Optional[int] = None) -> None:
+        """Выполняет циклы до stop или max_cycles.
+
+        Начало цикла отсчитывается от расписания, а не от конца прошлого
+        цикла, поэтому медленный цикл не сдвигает последующие. Если цикл
+        длиннее периода, пропущенные запуски не наверстываются.
+        """
+        stop = stop or threading.Event()
+        next_start = time.monotonic()
+        while not stop.is_set():
+            results = self.run_cycle()
+            failed = sum(1 for result in results if result['status'] == 'FAIL')
+            logger.info(f"Цикл {self.cycles}: проверено {len(results)}, ❌ {failed}")
+            if max_cycles and self.cycles >= max_cycles:
+                return
+            next_start = max(next_start + self.next_delay(), time.monotonic())
+            stop.wait(next_start - time.monotonic())
@@ -8,6 +8,44 @@ import requests
 from loguru import logger
 from pydantic import BaseModel, Field, ValidationError
 
+from .profiling import profile_phase
+
+
+HTTP_METHODS = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
+
+
+def make_operation_id(method: str, path: str) -> str:
+    """Формирует operationId для операции, у которой он не задан."""
+    return f"{method.lower()}_{path.replace('/', '_').replace('{', '').replace('}', '')}"
+
+
+def expand_server_url(url: str, variables: Optional[Dict[str, Any]] = None, all_values: bool = True) -> List[str]:
+    """Подставляет переменные сервера OpenAPI в шаблон URL.
+
+    Args:
+        url: Шаблон URL, например https://{region}.api.example.com/{version}
+        variables: Переменные сервера ({'region': {'enum': [...], 'default': ...}})
+        all_values: Перебрать все значения enum (иначе - только default)
+
+    Returns:
+        URL для каждой комбинации значений переменных
+    """
+    if not isinstance(variables, dict) or not variables:
+        return [url.rstrip('/')]
+
+    urls = [url]
+    for name, variable in variables.items():
+        variable = variable if isinstance(variable, dict) else {}
+        values = list(variable.get('enum') or []) if all_values else []
+        default = variable.get('default')
+        if default is not None and default not in values:
+            values.insert(0, default)
+        if not values:
+            continue
+        placeholder = '{' + name + '}'
+        urls = [template.replace(placeholder, str(value)) for template in urls for value in values]
+    return [template.rstrip('/') for template in urls]
+
 
 class Contact(BaseModel):
     """Контактная информация API."""
@@ -60,6 +98,8 @@ class Response(BaseModel):
     description: str
     content: Optional[Dict[str, Any]] = None
     headers: Optional[Dict[str, Any]] = None
+    links: Optional[Dict[str, Any]] = None
+    schema_: Optional[Dict[str, Any]] = Field(default=None, alias='schema')  # Для Swagger 2.0
 
 
 class Operation(BaseModel):
@@ -72,6 +112,7 @@ class Operation(BaseModel):
     requestBody: Optional[RequestBody] = None
     responses: Dict[str, Response]
     security: Optional[List[Dict[str, List[str]]]] = None
+    x_apizap_weight: Any = Field(default=None, alias='x-apizap-weight')
 
 
 class PathItem(BaseModel):
@@ -97,6 +138,7 @@ class OpenAPISpec(BaseModel):
     schemes: Optional[List[str]] = None  # Для Swagger 2.0
     paths: Dict[str, PathItem]
     components: Optional[Dict[str, Any]] = None
+    definitions: Optional[Dict[str, Any]] = None  # Для Swagger 2.0
     security: Optional[List[Dict[str, List[str]]]] = None
     tags: Optional[List[Dict[str, Any]]] = None
 
@@ -104,41 +146,62 @@ class OpenAPISpec(BaseModel):
 class OpenAPIParser:
     """Парсер OpenAPI спецификаций."""
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, profiler: Optional[Any] = None):
         """Инициализация парсера.
         
         Args:
             timeout: Таймаут для HTTP запросов в секундах
+            profiler: Профилировщик фаз (apizap.profiling.PhaseProfiler)
         """
         self.timeout = timeout
+        self.profiler = profiler
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'APIZap/1.0.0 (OpenAPI Parser)',
             'Accept': 'application/json, application/yaml, text/yaml, */*'
         })
     
-    def parse(self, url_or_path: str) -> Optional[OpenAPISpec]:
+    def parse(self, url_or_path: str, selector: Optional[Any] = None) -> Optional[OpenAPISpec]:
         """Парсит OpenAPI спецификацию из URL или файла.
         
         Args:
             url_or_path: URL спецификации или путь к локальному файлу
+            selector: Критерии отбора операций (apizap.selection.OperationSelector);
+                неотобранные операции удаляются до валидации
             
         Returns:
             Распарсенная OpenAPI спецификация или None при ошибке
         """
-        try:
-            # Определяем, это URL или локальный файл
+        # Определяем, это URL или локальный файл
+        with profile_phase(self.profiler, 'load'):
             if self._is_url(url_or_path):
                 spec_data = self._load_from_url(url_or_path)
             else:
                 spec_data = self._load_from_file(url_or_path)
+        
+        if not spec_data:
+            return None
+        return self.build_spec(spec_data, selector)
+    
+    def build_spec(self, spec_data: Dict[str, Any], selector: Optional[Any] = None) -> Optional[OpenAPISpec]:
+        """Отбирает операции и валидирует уже загруженные данные спецификации.
+        
+        Args:
+            spec_data: Словарь спецификации
+            selector: Критерии отбора операций (apizap.selection.OperationSelector)
             
-            if not spec_data:
-                return None
+        Returns:
+            OpenAPI спецификация или None при ошибке
+        """
+        try:
+            if selector is not None and not selector.is_empty:
+                with profile_phase(self.profiler, 'select'):
+                    spec_data = selector.prune_spec_data(spec_data)
             
             # Валидация и парсинг с помощью Pydantic
             logger.debug("Валидация OpenAPI спецификации...")
-            spec = OpenAPISpec(**spec_data)
+            with profile_phase(self.profiler, 'validate'):
+                spec = OpenAPISpec(**spec_data)
             
             logger.info(f"Успешно распарсена спецификация: {spec.info.title} v{spec.info.version}")
             return spec
@@ -174,30 +237,7 @@ class OpenAPIParser:
             
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            
-            # Попытка определить формат по Content-Type или URL
-            content_type = response.headers.get('content-type', '').lower()
-            
-            if 'json' in content_type or url.endswith('.json'):
-                return response.json()
-            elif 'yaml' in content_type or url.endswith(('.yaml', '.yml')):
-                try:
-                    import yaml
-                    return yaml.safe_load(response.text)
-                except ImportError:
-                    logger.warning("PyYAML не установлен, пытаемся парсить как JSON...")
-                    return response.json()
-            else:
-                # Пытаемся сначала JSON, потом YAML
-                try:
-                    return response.json()
-                except json.JSONDecodeError:
-                    try:
-                        import yaml
-                        return yaml.safe_load(response.text)
-                    except ImportError:
-                        logger.error("Не удалось определить формат спецификации и PyYAML не установлен")
-                        return None
+            return self.decode_response(response, url)
             
         except requests.exceptions.Timeout:
             logger.error(f"Таймаут при загрузке спецификации: {url}")
@@ -215,6 +255,36 @@ class OpenAPIParser:
             logger.error(f"Неожиданная ошибка при загрузке спецификации: {str(e)}")
             return None
     
+    def decode_response(self, response: requests.Response, url: str) -> Optional[Dict[str, Any]]:
+        """Разбирает тело ответа со спецификацией в JSON или YAML.
+        
+        Raises:
+            json.JSONDecodeError: Если тело не удалось разобрать
+        """
+        # Попытка определить формат по Content-Type или URL
+        content_type = response.headers.get('content-type', '').lower()
+        
+        if 'json' in content_type or url.endswith('.json'):
+            return response.json()
+        elif 'yaml' in content_type or url.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+                return yaml.safe_load(response.text)
+            except ImportError:
+                logger.warning("PyYAML не установлен, пытаемся парсить как JSON...")
+                return response.json()
+        else:
+            # Пытаемся сначала JSON, потом YAML
+            try:
+                return response.json()
+            except json.JSONDecodeError:
+                try:
+                    import yaml
+                    return yaml.safe_load(response.text)
+                except ImportError:
+                    logger.error("Не удалось определить формат спецификации и PyYAML не установлен")
+                    return None
+    
     def _load_from_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Загружает спецификацию из локального файла.
         
@@ -276,7 +346,8 @@ class OpenAPIParser:
         """
         # OpenAPI 3.0+ с серверами
         if spec.servers and len(spec.servers) > 0:
-            return spec.servers[0].url.rstrip('/')
+            server = spec.servers[0]
+            return expand_server_url(server.url, server.variables, all_values=False)[0]
         
         # Swagger 2.0 с host и basePath
         if spec.host:
@@ -287,6 +358,23 @@ class OpenAPIParser:
         # Fallback для старых версий
         return "http://localhost"
     
+    def get_server_urls(self, spec: OpenAPISpec) -> List[str]:
+        """Получает базовые URL всех серверов спецификации.
+        
+        Переменные серверов раскрываются во все значения enum (или default),
+        повторы удаляются с сохранением порядка.
+        
+        Args:
+            spec: OpenAPI спецификация
+            
+        Returns:
+            Список базовых URL (для спецификации без servers - один URL get_base_url)
+        """
+        urls: List[str] = []
+        for server in spec.servers or []:
+            urls.extend(expand_server_url(server.url, server.variables))
+        return list(dict.fromkeys(urls)) or [self.get_base_url(spec)]
+    
     def get_all_operations(self, spec: OpenAPISpec) -> List[Dict[str, Any]]:
         """Извлекает все операции из спецификации.
         
@@ -296,6 +384,14 @@ class OpenAPIParser:
         Returns:
             Список всех операций с метаданными
         """
+        with profile_phase(self.profiler, 'enumerate'):
+            operations = self._collect_operations(spec)
+        
+        logger.info(f"Найдено операций: {len(operations)}")
+        return operations
+    
+    def _collect_operations(self, spec: OpenAPISpec) -> List[Dict[str, Any]]:
+        """Обходит пути спецификации и собирает операции."""
         operations = []
         
         for path, path_item in spec.paths.items():
@@ -303,7 +399,7 @@ class OpenAPIParser:
             path_parameters = path_item.parameters or []
             
             # Проверяем все HTTP методы
-            for method in ['get', 'post', 'put', 'delete', 'patch', 'head', 'options']:
+            for method in HTTP_METHODS:
                 operation = getattr(path_item, method, None)
                 if operation:
                     # Объединяем параметры пути и операции
@@ -316,10 +412,9 @@ class OpenAPIParser:
                         'path': path,
                         'operation': operation,
                         'parameters': all_parameters,
-                        'operation_id': operation.operationId or f"{method}_{path.replace('/', '_').replace('{', '').replace('}', '')}",
+                        'operation_id': operation.operationId or make_operation_id(method, path),
                         'summary': operation.summary or f"{method.upper()} {path}",
                         'tags': operation.tags or ['default']
                     })
         
-        logger.info(f"Найдено операций: {len(operations)}")
         return operations 
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""Профилирование собственных фаз APIZap.
+
+Фазы прогона: load (загрузка спецификации), validate (валидация моделью
+Pydantic), enumerate (перечисление операций), prepare (подготовка запроса),
+send (сетевой обмен), analyze (разбор ответа) и report (генерация отчета).
+Для каждой фазы накапливаются количество входов, реальное и процессорное
+время, а по запросу - статистика cProfile и пик памяти tracemalloc.
+"""
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+PHASES = ('load', 'select', 'validate', 'enumerate', 'prepare', 'send', 'analyze', 'report')
+
+_NULL_CONTEXT = nullcontext()
+
+
+def profile_phase(profiler: Optional['PhaseProfiler'], name: str):
+    """Возвращает контекст фазы профилировщика или пустой контекст без него."""
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.phase(name)
+
+
+class _PhaseStats:
+    """Накопленная статистика одной фазы."""
+
+    __slots__ = ('calls', 'wall', 'cpu', 'peak_memory', 'profile')
+
+    def __init__(self, with_cprofile: bool):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory = 0
+        self.profile = cProfile.Profile() if with_cprofile else None
+
+
+class PhaseProfiler:
+    """Накопитель времени, CPU и памяти по фазам APIZap."""
+
+    def __init__(self, cprofile: bool = False, memory: bool = False):
+        """Инициализация профилировщика.
+
+        Args:
+            cprofile: Собирать статистику cProfile по каждой фазе
+            memory: Измерять пик выделенной памяти (tracemalloc) по каждой фазе
+        """
+        self.cprofile = cprofile
+        self.memory = memory
+        self._stats: Dict[str, _PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._wall_start = time.perf_counter()
+
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _get_stats(self, name: str) -> _PhaseStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, _PhaseStats(self.cprofile))
+        return stats
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замеряет фазу. Повторные входы в фазу суммируются."""
+        stats = self._get_stats(name)
+
+        memory_base = 0
+        if self.memory:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            memory_base = tracemalloc.get_traced_memory()[0]
+
+        # cProfile допускает только один активный профилировщик на поток
+        profile = stats.profile if threading.current_thread() is threading.main_thread() else None
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            if profile is not None:
+                profile.disable()
+
+            with self._lock:
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                if self.memory:
+                    peak = tracemalloc.get_traced_memory()[1] - memory_base
+                    stats.peak_memory = max(stats.peak_memory, peak)
+
+    def stop(self) -> None:
+        """Завершает профилирование и останавливает tracemalloc, если запускал его."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает статистику фаз в виде словаря."""
+        total_wall = time.perf_counter() - self._wall_start
+        phases = {}
+        for name in self._ordered_names():
+            stats = self._stats[name]
+            phase = {
+                'calls': stats.calls,
+                'wall_ms': round(stats.wall * 1000, 3),
+                'cpu_ms': round(stats.cpu * 1000, 3),
+                'wall_share': round(stats.wall / total_wall * 100, 2) if total_wall > 0 else 0.0
+            }
+            if self.memory:
+                phase['peak_memory_bytes'] = stats.peak_memory
+            phases[name] = phase
+        return {
+            'total_wall_ms': round(total_wall * 1000, 3),
+            'phases': phases
+        }
+
+    def write(self, path: str) -> List[Path]:
+        """Сохраняет профиль в JSON файл и, при включенном cProfile, .prof файлы по фазам.
+
+        Args:
+            path: Путь к JSON файлу профиля
+
+        Returns:
+            Список записанных файлов
+        """
+        profile_path = Path(path)
+        profile_path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding='utf-8')
+        written = [profile_path]
+
+        if self.cprofile:
+            for name in self._ordered_names():
+                profile = self._stats[name].profile
+                if profile is None or not profile.getstats():
+                    continue
+                prof_path = profile_path.with_suffix(f".{name}.prof")
+                pstats.Stats(profile).dump_stats(str(prof_path))
+                written.append(prof_path)
+        return written
+
+    def format_summary(self) -> str:
+        """Форматирует краткую сводку по фазам для вывода на один экран."""
+        data = self.to_dict()
+        lines = [
+            "⏱️  ПРОФИЛЬ ФАЗ APIZap",
+            "=" * 50,
+            f"{'Фаза':<10}{'Вызовы':>8}{'Время, мс':>12}{'CPU, мс':>12}{'Доля':>8}"
+            + (f"{'Пик памяти':>14}" if self.memory else ""),
+        ]
+        for name, phase in data['phases'].items():
+            line = (f"{name:<10}{phase['calls']:>8}{phase['wall_ms']:>12.1f}"
+                    f"{phase['cpu_ms']:>12.1f}{phase['wall_share']:>7.1f}%")
+            if self.memory:
+                line += f"{phase['peak_memory_bytes'] / 1024:>11.1f} КБ"
+            lines.append(line)
+        lines.append(f"Общее время: {data['total_wall_ms']:.1f}ms")
+        return "\n".join(lines)
+
+    def _ordered_names(self) -> List[str]:
+        known = [name for name in PHASES if name in self._stats]
+        return known + sorted(name for name in self._stats if name not in PHASES)
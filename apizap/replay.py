@@ -0,0 +1,381 @@
+"""Воспроизведение трафика из журналов доступа.
+
+Журнал (combined log format или JSON lines) читается потоково, строка за
+строкой: каждая запись сопоставляется с операцией спецификации и сразу
+попадает в расписание OpenLoopRunner, поэтому память не зависит от размера
+журнала. Для сопоставления шаблоны путей компилируются в префиксное дерево
+по сегментам: литеральный сегмент ищется в словаре, а параметр шаблона
+({id}) - отдельная ветвь. Поиск занимает время, пропорциональное глубине
+пути, а не количеству операций, в отличие от перебора регулярных выражений.
+"""
+
+import calendar
+import gzip
+import json
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .selection import split_path
+
+
+LOG_FORMATS = ('auto', 'combined', 'jsonl')
+
+# Наибольшее число различных неопознанных запросов, которые учитываются по отдельности
+MAX_UNMATCHED_KEYS = 1000
+
+_COMBINED_PATTERN = re.compile(
+    r'^\S+ \S+ \S+ \[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2}) ([+-])(\d{2})(\d{2})\] '
+    r'"(\S+) (\S+)[^"]*"'
+)
+_MONTHS = {name: index for index, name in enumerate(calendar.month_abbr) if name}
+_PARAM_SEGMENT = re.compile(r'^\{([^{}]+)\}$')
+_PARAM_IN_SEGMENT = re.compile(r'\{([^{}]+)\}')
+
+_TIME_KEYS = ('timestamp', 'time', 'ts', '@timestamp')
+_METHOD_KEYS = ('method', 'request_method', 'verb')
+_TARGET_KEYS = ('path', 'uri', 'request_uri', 'url')
+
+
+class LogRecord(NamedTuple):
+    """Запрос из журнала доступа."""
+
+    timestamp: Optional[float]  # Unix-время в секундах
+    method: str
+    target: str  # Путь с query-строкой
+
+
+def open_log(path: str) -> Iterator[str]:
+    """Построчно читает журнал: файл, .gz или '-' (stdin)."""
+    if path == '-':
+        yield from sys.stdin
+        return
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def parse_combined(line: str) -> Optional[LogRecord]:
+    """Разбирает строку combined/common log format (None, если не подходит)."""
+    match = _COMBINED_PATTERN.match(line)
+    if not match:
+        return None
+    day, month, year, hour, minute, second, sign, tz_hours, tz_minutes, method, target = match.groups()
+    if month not in _MONTHS:
+        return None
+    timestamp = calendar.timegm((int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second)))
+    shift = int(tz_hours) * 3600 + int(tz_minutes) * 60
+    return LogRecord(float(timestamp - shift if sign == '+' else timestamp + shift), method, target)
+
+
+def parse_json_line(line: str) -> Optional[LogRecord]:
+    """Разбирает строку JSON lines (None, если не подходит).
+
+    Метод берется из method/request_method/verb, путь - из
+    path/uri/request_uri/url (или из строки запроса request, 'GET /x HTTP/1.1'),
+    время - из timestamp/time/ts/@timestamp (Unix-время или ISO 8601).
+    """
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+
+    method = _first(entry, _METHOD_KEYS)
+    target = _first(entry, _TARGET_KEYS)
+    if (method is None or target is None) and isinstance(entry.get('request'), str):
+        parts = entry['request'].split()
+        if len(parts) >= 2:
+            method, target = parts[0], parts[1]
+    if not isinstance(method, str) or not isinstance(target, str):
+        return None
+    if '://' in target:
+        parts = urlsplit(target)
+        target = parts.path + ('?' + parts.query if parts.query else '')
+    return LogRecord(_parse_timestamp(_first(entry, _TIME_KEYS)), method, target)
+
+
+def _first(entry: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        if entry.get(key) is not None:
+            return entry[key]
+    return None
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        # Миллисекунды отличаются от секунд на три порядка
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def detect_format(line: str) -> str:
+    """Определяет формат журнала по первой непустой строке."""
+    return 'jsonl' if line.lstrip().startswith('{') else 'combined'
+
+
+class TemplateTrie:
+    """Префиксное дерево шаблонов путей с параметрами.
+
+    Литеральные сегменты имеют приоритет над сегментами с параметром внутри
+    ('{id}.json'), а те - над сегментом-параметром целиком ('{id}'), как
+    в правилах сопоставления путей OpenAPI.
+    """
+
+    __slots__ = ('literals', 'patterns', 'param', 'operations')
+
+    def __init__(self):
+        self.literals: Dict[str, 'TemplateTrie'] = {}
+        self.patterns: Dict[str, Tuple[Pattern, 'TemplateTrie']] = {}
+        self.param: Optional['TemplateTrie'] = None
+        self.operations: Dict[str, Tuple[Dict[str, Any], List[Tuple[int, List[str], Optional[Pattern]]]]] = {}
+
+    def insert(self, path: str, method: str, operation_info: Dict[str, Any]) -> None:
+        """Добавляет операцию для шаблона пути."""
+        node = self
+        extractors = []
+        for index, segment in enumerate(split_path(path)):
+            whole = _PARAM_SEGMENT.match(segment)
+            if whole:
+                extractors.append((index, [whole.group(1)], None))
+                if node.param is None:
+                    node.param = TemplateTrie()
+                node = node.param
+            elif '{' in segment:
+                names = _PARAM_IN_SEGMENT.findall(segment)
+                if segment not in node.patterns:
+                    parts = _PARAM_IN_SEGMENT.split(segment)
+                    # Нечетные части split - имена параметров, четные - литералы
+                    regex = ''.join(re.escape(part) if i % 2 == 0 else '([^/]+?)' for i, part in enumerate(parts))
+                    node.patterns[segment] = (re.compile(f'^{regex}$'), TemplateTrie())
+                pattern, node = node.patterns[segment]
+                extractors.append((index, names, pattern))
+            else:
+                node = node.literals.setdefault(segment, TemplateTrie())
+        node.operations.setdefault(method.upper(), (operation_info, extractors))
+
+    def match(self, method: str, segments: List[str]) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """Находит операцию по методу и сегментам пути.
+
+        Returns:
+            (операция, значения параметров пути) или None
+        """
+        found = self._find(segments, 0, method)
+        if found is None:
+            return None
+        operation_info, extractors = found
+        params = {}
+        for index, names, pattern in extractors:
+            if pattern is None:
+                params[names[0]] = segments[index]
+            else:
+                params.update(zip(names, pattern.match(segments[index]).groups()))
+        return operation_info, params
+
+    def _find(self, segments: List[str], index: int, method: str) -> Any:
+        if index == len(segments):
+            return self.operations.get(method)
+        segment = segments[index]
+        child = self.literals.get(segment)
+        if child is not None:
+            found = child._find(segments, index + 1, method)
+            if found is not None:
+                return found
+        for pattern, child in self.patterns.values():
+            if pattern.match(segment):
+                found = child._find(segments, index + 1, method)
+                if found is not None:
+                    return found
+        if self.param is not None:
+            return self.param._find(segments, index + 1, method)
+        return None
+
+
+class TemplateMatcher:
+    """Сопоставляет запросы из журнала с операциями спецификации."""
+
+    def __init__(self, operations: List[Dict[str, Any]], base_path: str = ''):
+        """Компилирует шаблоны путей операций.
+
+        Args:
+            operations: Операции из OpenAPIParser.get_all_operations
+            base_path: Путь базового URL сервера ('/v1'), который
+                отбрасывается у путей из журнала
+        """
+        self.base_segments = split_path(base_path)
+        self.trie = TemplateTrie()
+        for operation_info in operations:
+            self.trie.insert(operation_info['path'], operation_info['method'], operation_info)
+
+    def match(self, method: str, target: str) -> Optional[Dict[str, Any]]:
+        """Находит операцию для запроса из журнала.
+
+        Returns:
+            Копия операции с param_overrides из параметров пути и query-строки
+            запроса или None, если операция не найдена
+        """
+        path, _, query = target.partition('?')
+        segments = split_path(path)
+        base = len(self.base_segments)
+        if base and segments[:base] == self.base_segments:
+            segments = segments[base:]
+
+        found = self.trie.match(method.upper(), segments)
+        if found is None:
+            return None
+        operation_info, path_params = found
+        overrides = dict(path_params)
+        for name, value in parse_qsl(query, keep_blank_values=True):
+            if name in path_params:
+                continue
+            previous = overrides.get(name)
+            overrides[name] = value if previous is None else (
+                previous + [value] if isinstance(previous, list) else [previous, value]
+            )
+        return dict(operation_info, param_overrides=overrides)
+
+
+class ReplayStats:
+    """Статистика чтения журнала для отчета."""
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self.lines = 0
+        self.malformed = 0
+        self.matched = 0
+        self.unmatched = 0
+        self.unmatched_requests: Counter = Counter()
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+    def add_unmatched(self, method: str, target: str) -> None:
+        self.unmatched += 1
+        key = f"{method.upper()} {target.partition('?')[0]}"
+        if key in self.unmatched_requests or len(self.unmatched_requests) < MAX_UNMATCHED_KEYS:
+            self.unmatched_requests[key] += 1
+
+    @property
+    def span(self) -> float:
+        """Интервал времени журнала в секундах."""
+        if self.first_timestamp is None or self.last_timestamp is None:
+            return 0.0
+        return max(0.0, self.last_timestamp - self.first_timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Статистика для JSON отчета."""
+        return {
+            'replay': {
+                'lines': self.lines,
+                'malformed': self.malformed,
+                'matched': self.matched,
+                'unmatched': self.unmatched,
+                'speed': self.speed,
+                'log_span_s': round(self.span, 3),
+                'top_unmatched': dict(self.unmatched_requests.most_common(10))
+            }
+        }
+
+    def format_lines(self) -> List[str]:
+        """Строки раздела текстового отчета."""
+        speed = f"x{self.speed:g}" if self.speed > 0 else "максимальная"
+        lines = [
+            "",
+            "📼 ВОСПРОИЗВЕДЕНИЕ ЖУРНАЛА",
+            f"{'-'*30}",
+            f"Строк: {self.lines}, сопоставлено: {self.matched}, не найдено операций: {self.unmatched}, "
+            f"нераспознанных строк: {self.malformed}",
+            f"Интервал журнала: {self.span:.1f} с, скорость: {speed}",
+        ]
+        for key, count in self.unmatched_requests.most_common(10):
+            lines.append(f"   ❔ {key}: {count}")
+        return lines
+
+
+class LogReplayer:
+    """Превращает поток строк журнала в расписание для OpenLoopRunner."""
+
+    def __init__(
+        self,
+        matcher: TemplateMatcher,
+        speed: float = 1.0,
+        log_format: str = 'auto',
+        limit: Optional[int] = None
+    ):
+        """Инициализация.
+
+        Args:
+            matcher: Сопоставление запросов с операциями
+            speed: Множитель скорости относительно журнала (2 - вдвое быстрее,
+                0 - без пауз, с наибольшей возможной скоростью)
+            log_format: Формат журнала: auto, combined или jsonl
+            limit: Наибольшее число воспроизводимых запросов
+        """
+        if speed < 0:
+            raise ValueError("Скорость воспроизведения не может быть отрицательной")
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Неизвестный формат журнала: {log_format}")
+        self.matcher = matcher
+        self.speed = speed
+        self.log_format = log_format
+        self.limit = limit
+        self.stats = ReplayStats(speed)
+
+    def schedule(self, lines: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Пары (момент отправки в секундах от начала, операция).
+
+        Моменты отсчитываются от времени первого сопоставленного запроса и
+        делятся на speed. Записи без времени отправляются вслед за
+        предыдущей. Моменты не убывают: запись с более ранним временем
+        (строки журнала пишутся при завершении запроса, а не при его начале)
+        отправляется вместе с предыдущей, иначе ее задержка отсчитывалась бы
+        от момента в прошлом и завышалась.
+        """
+        parse = None
+        stats = self.stats
+        last_timestamp = None
+        previous_offset = 0.0
+
+        for line in lines:
+            if not line.strip():
+                continue
+            stats.lines += 1
+            if parse is None:
+                log_format = detect_format(line) if self.log_format == 'auto' else self.log_format
+                parse = parse_json_line if log_format == 'jsonl' else parse_combined
+
+            record = parse(line)
+            if record is None:
+                stats.malformed += 1
+                continue
+            operation_case = self.matcher.match(record.method, record.target)
+            if operation_case is None:
+                stats.add_unmatched(record.method, record.target)
+                continue
+
+            if record.timestamp is not None:
+                last_timestamp = record.timestamp
+            if stats.first_timestamp is None:
+                stats.first_timestamp = last_timestamp
+            if last_timestamp is not None:
+                stats.last_timestamp = max(stats.last_timestamp or last_timestamp, last_timestamp)
+
+            offset = 0.0
+            if self.speed > 0 and stats.first_timestamp is not None and last_timestamp is not None:
+                offset = max(0.0, (last_timestamp - stats.first_timestamp) / self.speed)
+            offset = previous_offset = max(offset, previous_offset)
+            stats.matched += 1
+            yield offset, operation_case
+
+            if self.limit and stats.matched >= self.limit:
+                return
@@ -2,17 +2,28 @@
 
 import json
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from .aggregator import ResultAggregator
+from .compare import ABComparison
+from .results import DEFAULT_HEADER_WHITELIST
+from .servers import ServerComparison
 
 
 class TestReporter:
     """Генератор отчетов о результатах тестирования API."""
     
-    def generate_text_report(self, results: List[Dict[str, Any]]) -> str:
+    def generate_text_report(
+        self,
+        results: List[Dict[str, Any]],
+        aggregator: Optional[ResultAggregator] = None
+    ) -> str:
         """Генерирует текстовый отчет.
         
         Args:
             results: Список результатов тестирования
+            aggregator: Агрегатор, накопленный во время прогона
+                (если не передан, строится по results за один проход)
             
         Returns:
             Текстовый отчет
@@ -21,13 +32,15 @@ class TestReporter:
             return "🤷 Нет результатов для отображения"
         
         # Сбор статистики
-        total_tests = len(results)
-        passed_tests = sum(1 for r in results if r['status'] == 'PASS')
-        warning_tests = sum(1 for r in results if r['status'] == 'WARN')
-        failed_tests = sum(1 for r in results if r['status'] == 'FAIL')
+        aggregator = aggregator or ResultAggregator.from_results(results)
+        summary = aggregator.summary()
+        total_tests = summary['total_tests']
+        passed_tests = summary['passed']
+        warning_tests = summary['warnings']
+        failed_tests = summary['failed']
         
         # Расчет времени выполнения
-        total_time = sum(r.get('response_time', 0) for r in results)
+        total_time = summary['total_time_ms']
         avg_time = total_time / total_tests if total_tests > 0 else 0
         
         # Заголовок отчета
@@ -105,6 +118,24 @@ class TestReporter:
                     
                     report_lines.append("")  # Пустая строка между тестами
         
+        # Группировки
+        for dimension, title in (
+            ('tag', '🏷️  ПО ТЕГАМ'),
+            ('method', '🔧 ПО МЕТОДАМ'),
+            ('status_class', '🔢 ПО КЛАССАМ СТАТУС-КОДОВ')
+        ):
+            report_lines.extend(self._format_group_lines(title, aggregator.group_stats(dimension)))
+        
+        # Сравнение серверов (--all-servers)
+        servers = ServerComparison.from_results(results)
+        if servers is not None:
+            report_lines.extend(servers.format_lines())
+        
+        # A/B сравнение (--compare)
+        ab_comparison = ABComparison.from_results(results)
+        if ab_comparison is not None:
+            report_lines.extend(ab_comparison.format_lines())
+        
         # Рекомендации
         report_lines.extend([
             "",
@@ -132,11 +163,36 @@ class TestReporter:
         
         return "\n".join(report_lines)
     
-    def generate_json_report(self, results: List[Dict[str, Any]]) -> str:
+    def _format_group_lines(self, title: str, groups: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Форматирует таблицу статистики по группам одного измерения.
+        
+        Args:
+            title: Заголовок раздела
+            groups: Статистика групп из ResultAggregator.group_stats
+            
+        Returns:
+            Строки раздела текстового отчета
+        """
+        lines = ["", title, "-" * 40]
+        for key, stats in groups.items():
+            line = (f"  {key}: {stats['total']} тестов, ✅ {stats['passed']} "
+                    f"⚠️ {stats['warnings']} ❌ {stats['failed']}")
+            if 'p50_ms' in stats:
+                line += f" | p50 {stats['p50_ms']:.2f}ms, p95 {stats['p95_ms']:.2f}ms"
+            lines.append(line)
+        return lines
+    
+    def generate_json_report(
+        self,
+        results: List[Dict[str, Any]],
+        aggregator: Optional[ResultAggregator] = None
+    ) -> str:
         """Генерирует JSON отчет.
         
         Args:
             results: Список результатов тестирования
+            aggregator: Агрегатор, накопленный во время прогона
+                (если не передан, строится по results за один проход)
             
         Returns:
             JSON отчет в виде строки
@@ -157,25 +213,11 @@ class TestReporter:
             }, indent=2, ensure_ascii=False)
         
         # Сбор статистики
-        total_tests = len(results)
-        passed_tests = sum(1 for r in results if r['status'] == 'PASS')
-        warning_tests = sum(1 for r in results if r['status'] == 'WARN')
-        failed_tests = sum(1 for r in results if r['status'] == 'FAIL')
-        total_time = sum(r.get('response_time', 0) for r in results)
-        avg_time = total_time / total_tests if total_tests > 0 else 0
-        success_rate = passed_tests / total_tests if total_tests > 0 else 0
+        aggregator = aggregator or ResultAggregator.from_results(results)
         
         # Формирование JSON структуры
         report = {
-            "summary": {
-                "total_tests": total_tests,
-                "passed": passed_tests,
-                "warnings": warning_tests,
-                "failed": failed_tests,
-                "success_rate": round(success_rate * 100, 2),
-                "total_time_ms": round(total_time, 2),
-                "average_time_ms": round(avg_time, 2)
-            },
+            "summary": aggregator.summary(),
             "tests": []
         }
         
@@ -194,11 +236,18 @@ class TestReporter:
                 "timestamp": result.get('timestamp')
             }
             
+            if result.get('trace_id'):
+                test_info['trace_id'] = result['trace_id']
+            if result.get('server'):
+                test_info['server'] = result['server']
+            if result.get('variant'):
+                test_info['variant'] = result['variant']
+            
             # Добавляем информацию о заголовках ответа (только ключевые)
             response_headers = result.get('response_headers', {})
             if response_headers:
                 key_headers = {}
-                for header in ['content-type', 'content-length', 'server', 'x-ratelimit-remaining']:
+                for header in DEFAULT_HEADER_WHITELIST:
                     if header in response_headers:
                         key_headers[header] = response_headers[header]
                 
@@ -215,36 +264,93 @@ class TestReporter:
         }
         
         # Добавление статистики по статус-кодам
-        status_codes = {}
-        for result in results:
-            code = result.get('status_code')
-            if code:
-                status_codes[str(code)] = status_codes.get(str(code), 0) + 1
-        
+        status_codes = aggregator.status_code_distribution()
         if status_codes:
             report["status_code_distribution"] = status_codes
         
         # Добавление статистики по времени ответа
-        response_times = [r.get('response_time', 0) for r in results if r.get('response_time')]
-        if response_times:
-            report["response_time_stats"] = {
-                "min_ms": round(min(response_times), 2),
-                "max_ms": round(max(response_times), 2),
-                "avg_ms": round(sum(response_times) / len(response_times), 2)
-            }
+        response_time_stats = aggregator.response_time_stats()
+        if response_time_stats:
+            report["response_time_stats"] = response_time_stats
+        
+        # Группировки по тегу, пути, классу статус-кода и методу
+        report["groups"] = aggregator.to_dict()['groups']
+        
+        # Сравнение задержек по серверам (--all-servers)
+        servers = ServerComparison.from_results(results)
+        if servers is not None:
+            report["servers"] = servers.to_dict()
+        
+        # A/B сравнение (--compare)
+        ab_comparison = ABComparison.from_results(results)
+        if ab_comparison is not None:
+            report["ab_comparison"] = ab_comparison.to_dict()
         
         return json.dumps(report, indent=2, ensure_ascii=False)
     
-    def generate_summary_stats(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_load_report(
+        self,
+        aggregator: ResultAggregator,
+        recorder: Any,
+        output: str = 'text'
+    ) -> str:
+        """Генерирует отчет профиля нагрузки или воспроизведения журнала.
+        
+        Результаты отдельных запросов при нагрузке не хранятся, поэтому отчет
+        строится только по агрегатору и статистике режима.
+        
+        Args:
+            aggregator: Агрегатор, накопленный во время нагрузки
+            recorder: Статистика режима с format_lines и to_dict
+                (apizap.stages.ProfileRecorder, apizap.replay.ReplayStats)
+            output: Формат отчета: text или json
+            
+        Returns:
+            Отчет в виде строки
+        """
+        if output == 'json':
+            report = aggregator.to_dict()
+            report.update(recorder.to_dict())
+            report["generated_at"] = datetime.utcnow().isoformat()
+            return json.dumps(report, indent=2, ensure_ascii=False)
+        
+        summary = aggregator.summary()
+        latency = aggregator.response_time_stats()
+        report_lines = [
+            f"📊 СВОДНАЯ СТАТИСТИКА НАГРУЗКИ",
+            f"{'='*50}",
+            f"📈 Всего запросов: {summary['total_tests']}",
+            f"✅ Успешных: {summary['passed']}",
+            f"⚠️  Предупреждений: {summary['warnings']}",
+            f"❌ Неудачных: {summary['failed']}",
+        ]
+        if latency:
+            report_lines.append(f"⏱️  Задержка: p50 {latency['p50_ms']:.2f}ms, p95 {latency['p95_ms']:.2f}ms, "
+                                f"p99 {latency['p99_ms']:.2f}ms, max {latency['max_ms']:.2f}ms")
+        report_lines.extend(recorder.format_lines())
+        report_lines.extend(self._format_group_lines('🔧 ПО МЕТОДАМ', aggregator.group_stats('method')))
+        report_lines.extend(self._format_group_lines('🔢 ПО КЛАССАМ СТАТУС-КОДОВ', aggregator.group_stats('status_class')))
+        report_lines.extend([
+            "",
+            f"🕐 Отчет сгенерирован: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ])
+        return "\n".join(report_lines)
+    
+    def generate_summary_stats(
+        self,
+        results: List[Dict[str, Any]],
+        aggregator: Optional[ResultAggregator] = None
+    ) -> Dict[str, Any]:
         """Генерирует краткую статистику.
         
         Args:
             results: Список результатов тестирования
+            aggregator: Агрегатор, накопленный во время прогона
             
         Returns:
             Словарь со статистикой
         """
-        if not results:
+        if not results and not (aggregator and aggregator.total):
             return {
                 "total": 0,
                 "passed": 0,
@@ -253,15 +359,12 @@ class TestReporter:
                 "success_rate": 0.0
             }
         
-        total_tests = len(results)
-        passed_tests = sum(1 for r in results if r['status'] == 'PASS')
-        warning_tests = sum(1 for r in results if r['status'] == 'WARN')
-        failed_tests = sum(1 for r in results if r['status'] == 'FAIL')
+        summary = (aggregator or ResultAggregator.from_results(results)).summary()
         
         return {
-            "total": total_tests,
-            "passed": passed_tests,
-            "warnings": warning_tests,
-            "failed": failed_tests,
-            "success_rate": round(passed_tests / total_tests * 100, 2) if total_tests > 0 else 0.0
+            "total": summary['total_tests'],
+            "passed": summary['passed'],
+            "warnings": summary['warnings'],
+            "failed": summary['failed'],
+            "success_rate": summary['success_rate']
         } 
\ No newline at end of file
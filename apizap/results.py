@@ -0,0 +1,184 @@
+"""Компактное представление результатов тестирования."""
+
+import sys
+import time
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+
+# Заголовки ответа, которые сохраняются по умолчанию (их же показывает JSON отчет)
+DEFAULT_HEADER_WHITELIST = ('content-type', 'content-length', 'server', 'x-ratelimit-remaining')
+
+# Специальное значение белого списка: сохранять все заголовки
+ALL_HEADERS = '*'
+
+_FIELDS = (
+    'operation_id', 'method', 'path', 'summary', 'status', 'status_code',
+    'response_time', 'error', 'response_headers', 'response_size', 'timestamp'
+)
+_FIELD_SET = frozenset(_FIELDS)
+_OPTIONAL_FIELDS = ('trace_id', 'tags', 'server')
+
+
+def status_class(status_code: Optional[int]) -> str:
+    """Возвращает класс статус-кода ('2xx', '4xx', ...) или 'none' без ответа."""
+    if not status_code:
+        return 'none'
+    return f"{status_code // 100}xx"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def capture_headers(
+    headers: Mapping[str, str],
+    whitelist: Optional[Tuple[str, ...]] = DEFAULT_HEADER_WHITELIST
+) -> Optional[Dict[str, str]]:
+    """Отбирает заголовки ответа по белому списку в момент получения ответа.
+
+    Args:
+        headers: Заголовки ответа (нечувствительные к регистру, как у requests)
+        whitelist: Имена заголовков в нижнем регистре; ('*',) - все заголовки
+
+    Returns:
+        Словарь отобранных заголовков или None, если ни один не найден
+    """
+    if whitelist and ALL_HEADERS in whitelist:
+        return dict(headers) or None
+
+    captured = None
+    for name in whitelist or ():
+        value = headers.get(name)
+        if value is not None:
+            if captured is None:
+                captured = {}
+            captured[name] = value
+    return captured
+
+
+def normalize_header_whitelist(names: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Приводит белый список заголовков к кортежу имен в нижнем регистре."""
+    if names is None:
+        return DEFAULT_HEADER_WHITELIST
+    return tuple(sys.intern(name.strip().lower()) for name in names if name.strip())
+
+
+class TestResult(MutableMapping):
+    """Результат тестирования одного запроса.
+
+    Хранит поля в __slots__ вместо словаря: строки метода, пути, статуса и
+    operation_id интернируются, заголовки ответа отбираются по белому списку,
+    а время создания хранится числом и превращается в ISO строку при чтении.
+    Снаружи ведет себя как прежний словарь результата, поэтому отчеты и хуки
+    работают через обычный доступ result['status'] и result.get(...).
+    """
+
+    __slots__ = _FIELDS[:-1] + ('created_at',) + _OPTIONAL_FIELDS + ('extra',)
+    __test__ = False  # не собирать класс как набор тестов pytest
+
+    def __init__(
+        self,
+        operation_id: Optional[str],
+        method: str,
+        path: str,
+        summary: Optional[str] = None,
+        status: str = 'FAIL',
+        status_code: Optional[int] = None,
+        response_time: Optional[float] = None,
+        error: Optional[str] = None,
+        response_headers: Optional[Dict[str, str]] = None,
+        response_size: int = 0,
+        created_at: Optional[float] = None
+    ):
+        self.operation_id = _intern(operation_id)
+        self.method = _intern(method)
+        self.path = _intern(path)
+        self.summary = summary
+        self.status = _intern(status)
+        self.status_code = status_code
+        self.response_time = response_time
+        self.error = error
+        self.response_headers = response_headers or None
+        self.response_size = response_size
+        self.created_at = time.time() if created_at is None else created_at
+        self.extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def timestamp(self) -> str:
+        """Время создания результата в формате ISO 8601 (UTC, без зоны)."""
+        return datetime.fromtimestamp(self.created_at, timezone.utc).replace(tzinfo=None).isoformat()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            if key == 'response_headers':
+                return dict(self.response_headers) if self.response_headers else {}
+            return getattr(self, key)
+        if key in _OPTIONAL_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'timestamp':
+            created = datetime.fromisoformat(value)
+            if created.tzinfo is None:
+                created = created.replace(tzinfo=timezone.utc)
+            self.created_at = created.timestamp()
+            return
+        if key in ('method', 'path', 'status', 'operation_id'):
+            value = _intern(value)
+        elif key == 'response_headers':
+            value = value or None
+        if key in _FIELD_SET or key in _OPTIONAL_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _OPTIONAL_FIELDS and hasattr(self, key):
+            delattr(self, key)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _FIELDS
+        for key in _OPTIONAL_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return True
+        if key in _OPTIONAL_FIELDS:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает результат в виде обычного словаря."""
+        return {key: self[key] for key in self}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'TestResult':
+        """Восстанавливает результат из словаря to_dict."""
+        result = cls(data.get('operation_id'), data['method'], data['path'])
+        for key, value in data.items():
+            result[key] = value
+        return result
+
+    def __repr__(self) -> str:
+        return f"TestResult({self.to_dict()!r})"
@@ -0,0 +1,140 @@
+"""Стратифицированная выборка операций для быстрых smoke-прогонов.
+
+Операции делятся на страты по тегу, методу и префиксу пути. Каждая страта
+получает хотя бы одну операцию (если размер выборки позволяет), остаток
+распределяется пропорционально размеру страт. Внутри страты операции
+выбираются взвешенной выборкой без возвращения (ключи Efraimidis-Spirakis),
+а веса берутся из истории прошлого прогона. Случайные числа выводятся из
+seed и ключа операции, поэтому выборка детерминирована и почти не меняется
+при добавлении в спецификацию новых операций.
+"""
+
+import hashlib
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .history import RunHistory
+from .selection import split_path
+
+
+StratumKey = Tuple[str, str, str]  # (тег, МЕТОД, префикс пути)
+
+
+def parse_sample_size(value: str) -> Union[int, float]:
+    """Разбирает размер выборки: количество ('200') или доля ('5%').
+
+    Returns:
+        int для количества операций, float от 0 до 1 для доли
+
+    Raises:
+        ValueError: Если значение некорректно
+    """
+    text = value.strip()
+    if text.endswith('%'):
+        percent = float(text[:-1])
+        if not 0 < percent <= 100:
+            raise ValueError(f"Доля выборки должна быть в диапазоне (0, 100]: {value}")
+        return percent / 100.0
+
+    count = int(text)
+    if count < 1:
+        raise ValueError(f"Размер выборки должен быть положительным: {value}")
+    return count
+
+
+def sample_count(size: Union[int, float], total: int) -> int:
+    """Количество операций в выборке для размера из parse_sample_size."""
+    if isinstance(size, float):
+        return min(total, max(1, int(math.ceil(total * size)))) if total else 0
+    return min(total, size)
+
+
+def _uniform(seed: int, key: str) -> float:
+    """Детерминированное псевдослучайное число в (0, 1) для ключа."""
+    digest = hashlib.blake2b(f"{seed}:{key}".encode('utf-8'), digest_size=8).digest()
+    return (int.from_bytes(digest, 'big') + 1) / (2 ** 64 + 2)
+
+
+class StratifiedSampler:
+    """Стратифицированная взвешенная выборка операций."""
+
+    def __init__(self, seed: int = 0, history: Optional[RunHistory] = None, prefix_depth: int = 1):
+        """Инициализация выборки.
+
+        Args:
+            seed: Seed выборки
+            history: История прошлого прогона для весов операций
+            prefix_depth: Количество сегментов пути в ключе страты
+        """
+        self.seed = seed
+        self.history = history
+        self.prefix_depth = prefix_depth
+
+    def stratum(self, operation: Dict[str, Any]) -> StratumKey:
+        """Ключ страты операции."""
+        tags = operation.get('tags') or ['default']
+        prefix = '/' + '/'.join(split_path(operation['path'])[:self.prefix_depth])
+        return (tags[0], operation['method'], prefix)
+
+    def strata(self, operations: List[Dict[str, Any]]) -> Dict[StratumKey, List[int]]:
+        """Группирует индексы операций по стратам."""
+        groups: Dict[StratumKey, List[int]] = {}
+        for index, operation in enumerate(operations):
+            groups.setdefault(self.stratum(operation), []).append(index)
+        return groups
+
+    def _key(self, operation: Dict[str, Any]) -> float:
+        """Ключ взвешенной выборки: u ** (1 / w), больше - приоритетнее."""
+        weight = self.history.weight(operation) if self.history else 1.0
+        u = _uniform(self.seed, f"{operation['method']} {operation['path']}")
+        return u ** (1.0 / weight)
+
+    def sample(self, operations: List[Dict[str, Any]], size: Union[int, float]) -> List[Dict[str, Any]]:
+        """Выбирает операции, сохраняя их исходный порядок.
+
+        Args:
+            operations: Операции из OpenAPIParser.get_all_operations
+            size: Размер выборки из parse_sample_size
+
+        Returns:
+            Выбранные операции
+        """
+        count = sample_count(size, len(operations))
+        if count >= len(operations):
+            return list(operations)
+
+        keys = [self._key(operation) for operation in operations]
+        strata = sorted(self.strata(operations).items())
+        ranked = [sorted(indexes, key=keys.__getitem__, reverse=True) for _, indexes in strata]
+
+        quotas = self._allocate([len(indexes) for indexes in ranked], [keys[r[0]] for r in ranked], count)
+        chosen = sorted(index for indexes, quota in zip(ranked, quotas) for index in indexes[:quota])
+        return [operations[index] for index in chosen]
+
+    @staticmethod
+    def _allocate(sizes: List[int], priorities: List[float], count: int) -> List[int]:
+        """Распределяет размер выборки по стратам.
+
+        Если выборка меньше числа страт, по одной операции получают страты с
+        наибольшим ключом лучшей операции. Иначе каждая страта получает одну
+        операцию, а остаток делится пропорционально по методу наибольших остатков.
+        """
+        if count < len(sizes):
+            top = sorted(range(len(sizes)), key=priorities.__getitem__, reverse=True)[:count]
+            return [1 if i in top else 0 for i in range(len(sizes))]
+
+        quotas = [1] * len(sizes)
+        capacities = [size - 1 for size in sizes]
+        remaining = count - len(sizes)
+        capacity = sum(capacities)
+        if not remaining or not capacity:
+            return quotas
+
+        shares = [remaining * c / capacity for c in capacities]
+        for i, share in enumerate(shares):
+            quotas[i] += int(share)
+        leftover = count - sum(quotas)
+        by_remainder = sorted(range(len(sizes)), key=lambda i: (shares[i] - int(shares[i]), -i), reverse=True)
+        for i in by_remainder[:leftover]:
+            quotas[i] += 1
+        return quotas
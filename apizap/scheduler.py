@@ -0,0 +1,148 @@
+"""Планирование порядка операций для конкурентных прогонов.
+
+При выполнении в порядке спецификации медленная операция может оказаться в
+конце, и остальные исполнители простаивают, пока она не завершится. Порядок
+longest-processing-time first (по задержкам из истории прошлого прогона)
+вместе с раздачей операций из общей очереди свободным исполнителям дает
+время прогона не более 4/3 от оптимального. Порядок failures-first
+запускает первыми операции, упавшие в прошлый раз, чтобы красный сигнал в
+CI появлялся быстрее; вместе с порогом fail-fast прогон останавливается,
+не дожидаясь остальных операций.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .engines import ThreadLocalTesters
+from .history import RunHistory
+from .log import RequestLogger
+
+
+ORDERS = ('spec', 'slowest-first', 'failures-first')
+
+# Ранг исхода прошлого прогона для порядка failures-first
+_OUTCOME_RANK = {'FAIL': 0, 'WARN': 1}
+
+
+class Scheduler:
+    """Упорядочивает операции по истории прошлого прогона."""
+
+    def __init__(self, history: Optional[RunHistory] = None, order: str = 'spec'):
+        """Инициализация планировщика.
+
+        Args:
+            history: История прошлого прогона
+            order: Один из ORDERS
+        """
+        if order not in ORDERS:
+            raise ValueError(f"Неизвестный порядок операций: {order}")
+        self.history = history or RunHistory()
+        self.order_name = order
+
+    def estimate(self, operation: Dict[str, Any]) -> float:
+        """Ожидаемая задержка операции в мс (медиана истории для новых операций)."""
+        latency = self.history.latency(operation)
+        if latency:
+            return latency
+        return self.history.median_latency or 0.0
+
+    def order(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Возвращает операции в порядке запуска.
+
+        Сортировка устойчивая: операции с равным ключом сохраняют порядок спецификации.
+        """
+        if self.order_name == 'spec':
+            return list(operations)
+        if self.order_name == 'slowest-first':
+            return sorted(operations, key=lambda op: -self.estimate(op))
+        return sorted(
+            operations,
+            key=lambda op: (_OUTCOME_RANK.get(self.history.outcome(op), 2), -self.estimate(op))
+        )
+
+    def estimate_makespan(self, operations: List[Dict[str, Any]], workers: int) -> float:
+        """Оценивает время прогона в мс при раздаче операций по очереди свободным исполнителям."""
+        finish_times = [0.0] * max(1, workers)
+        for operation in operations:
+            heapq.heapreplace(finish_times, finish_times[0] + self.estimate(operation))
+        return max(finish_times)
+
+
+def run_scheduled(
+    tester_factory: Callable[[], Any],
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    workers: int = 1,
+    fail_fast: Optional[int] = None,
+    log_sample_every: int = 1,
+    progress_interval: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Выполняет операции в заданном порядке, раздавая их свободным исполнителям.
+
+    Args:
+        tester_factory: Фабрика тестеров (apizap.tester.APITester)
+        base_url: Базовый URL API
+        operations: Операции в порядке запуска (см. Scheduler.order)
+        workers: Количество параллельных исполнителей
+        fail_fast: Остановить запуск новых операций после указанного числа FAIL
+        log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+        progress_interval: Период строки прогресса в секундах (None - выключена)
+
+    Returns:
+        Результаты выполненных операций в порядке запуска
+    """
+    total = len(operations)
+    testers = ThreadLocalTesters(tester_factory)
+    request_log = RequestLogger(total, log_sample_every, progress_interval)
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    lock = threading.Lock()
+    stopped = threading.Event()
+    state = {'next': 0, 'failed': 0}
+
+    def take() -> Optional[int]:
+        with lock:
+            if stopped.is_set() or state['next'] >= total:
+                return None
+            index = state['next']
+            state['next'] += 1
+            request_log.before(index + 1, operations[index])
+            return index
+
+    def worker() -> None:
+        tester = testers.get()
+        while True:
+            index = take()
+            if index is None:
+                return
+            result = tester.test_operation(base_url, operations[index])
+            results[index] = result
+            with lock:
+                request_log.after(result)
+                if result['status'] == 'FAIL':
+                    state['failed'] += 1
+                    if fail_fast and state['failed'] >= fail_fast and not stopped.is_set():
+                        stopped.set()
+                        logger.warning("Достигнут порог --fail-fast ({} FAIL), новые операции не запускаются",
+                                       fail_fast)
+            if tester.request_delay:
+                time.sleep(tester.request_delay)
+
+    workers = max(1, min(workers, total or 1))
+    logger.info(f"Начинаем тестирование {total} операций (исполнителей: {workers})...")
+    if workers == 1:
+        worker()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                future.result()
+
+    completed = [result for result in results if result is not None]
+    if len(completed) < total:
+        logger.warning(f"Пропущено операций после остановки: {total - len(completed)}")
+    logger.info(f"Тестирование завершено. Обработано операций: {len(completed)}")
+    return completed
@@ -0,0 +1,50 @@
+"""Разрешение локальных $ref в схемах OpenAPI."""
+
+from typing import Any, Dict, Optional
+
+
+class SchemaResolver:
+    """Разрешает ссылки вида #/components/schemas/Name и #/definitions/Name."""
+
+    def __init__(self, root: Optional[Dict[str, Any]] = None):
+        """Инициализация.
+
+        Args:
+            root: Документ, относительно которого разрешаются ссылки
+        """
+        self.root = root or {}
+
+    @classmethod
+    def from_spec(cls, spec: Any) -> 'SchemaResolver':
+        """Создает резолвер по OpenAPISpec (components и definitions)."""
+        return cls({
+            'components': getattr(spec, 'components', None) or {},
+            'definitions': getattr(spec, 'definitions', None) or {},
+        })
+
+    def lookup(self, ref: str) -> Dict[str, Any]:
+        """Возвращает схему по ссылке.
+
+        Raises:
+            KeyError: Если ссылка внешняя или не найдена
+        """
+        if not ref.startswith('#/'):
+            raise KeyError(f"Внешние ссылки не поддерживаются: {ref}")
+        node: Any = self.root
+        for token in ref[2:].split('/'):
+            token = token.replace('~1', '/').replace('~0', '~')
+            if not isinstance(node, dict) or token not in node:
+                raise KeyError(f"Ссылка не найдена: {ref}")
+            node = node[token]
+        return node
+
+    def resolve(self, schema: Any) -> Any:
+        """Следует по цепочке $ref до схемы без ссылки."""
+        seen = set()
+        while isinstance(schema, dict) and '$ref' in schema:
+            ref = schema['$ref']
+            if ref in seen:
+                raise KeyError(f"Циклическая ссылка: {ref}")
+            seen.add(ref)
+            schema = self.lookup(ref)
+        return schema
@@ -0,0 +1,225 @@
+"""Отбор операций по тегам, путям, методам и operationId.
+
+Индекс строится один раз по сырому словарю спецификации, еще до валидации
+моделью Pydantic: теги и методы отображаются на множества операций, а пути
+хранятся в префиксном дереве по сегментам. Поэтому отбор нескольких
+операций из спецификации на десятки тысяч путей не требует ни валидации,
+ни подготовки запросов для остальных.
+"""
+
+import fnmatch
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .parser import HTTP_METHODS, make_operation_id
+
+
+OperationKey = Tuple[str, str]  # (путь, МЕТОД)
+
+_GLOB_CHARS = frozenset('*?[')
+
+
+def split_path(path: str) -> List[str]:
+    """Разбивает путь на сегменты без пустых частей."""
+    return [segment for segment in path.split('/') if segment]
+
+
+def match_segments(pattern: List[str], segments: List[str]) -> bool:
+    """Сопоставляет путь с glob-шаблоном по сегментам.
+
+    '*', '?' и '[...]' действуют внутри одного сегмента, а сегмент '**'
+    соответствует любому числу сегментов, в том числе нулю.
+    """
+    if not pattern:
+        return not segments
+    if pattern[0] == '**':
+        return any(match_segments(pattern[1:], segments[skip:]) for skip in range(len(segments) + 1))
+    return bool(segments) and fnmatch.fnmatchcase(segments[0], pattern[0]) and \
+        match_segments(pattern[1:], segments[1:])
+
+
+class PathTrie:
+    """Префиксное дерево шаблонов путей по сегментам."""
+
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children: Dict[str, 'PathTrie'] = {}
+        self.values: List[Any] = []
+
+    def insert(self, path: str, value: Any) -> None:
+        """Добавляет значение для шаблона пути."""
+        node = self
+        for segment in split_path(path):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = PathTrie()
+            node = child
+        node.values.append(value)
+
+    def _find(self, segments: List[str]) -> Optional['PathTrie']:
+        node = self
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def iter_values(self) -> Iterator[Any]:
+        """Обходит все значения поддерева."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.values
+            stack.extend(node.children.values())
+
+    def prefix(self, prefix: str) -> Iterator[Any]:
+        """Значения всех путей, начинающихся с префикса (по целым сегментам)."""
+        node = self._find(split_path(prefix))
+        if node is not None:
+            yield from node.iter_values()
+
+
+class OperationIndex:
+    """Индекс операций спецификации для быстрого отбора."""
+
+    def __init__(self):
+        self.keys: List[OperationKey] = []
+        self.by_tag: Dict[str, Set[OperationKey]] = {}
+        self.by_method: Dict[str, Set[OperationKey]] = {}
+        self.by_operation_id: Dict[str, Set[OperationKey]] = {}
+        self.paths = PathTrie()
+
+    def add(self, path: str, method: str, tags: Iterable[str], operation_id: str) -> None:
+        """Добавляет операцию в индекс."""
+        key = (path, method.upper())
+        self.keys.append(key)
+        for tag in tags:
+            self.by_tag.setdefault(tag, set()).add(key)
+        self.by_method.setdefault(key[1], set()).add(key)
+        self.by_operation_id.setdefault(operation_id, set()).add(key)
+        self.paths.insert(path, key)
+
+    @classmethod
+    def from_spec_data(cls, spec_data: Dict[str, Any]) -> 'OperationIndex':
+        """Строит индекс по сырому словарю спецификации (до валидации)."""
+        index = cls()
+        for path, path_item in (spec_data.get('paths') or {}).items():
+            if not isinstance(path_item, dict):
+                continue
+            for method in HTTP_METHODS:
+                operation = path_item.get(method)
+                if not isinstance(operation, dict):
+                    continue
+                index.add(
+                    path,
+                    method,
+                    operation.get('tags') or ['default'],
+                    operation.get('operationId') or make_operation_id(method, path)
+                )
+        return index
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[Dict[str, Any]]) -> 'OperationIndex':
+        """Строит индекс по списку операций OpenAPIParser.get_all_operations."""
+        index = cls()
+        for operation_info in operations:
+            index.add(operation_info['path'], operation_info['method'],
+                      operation_info['tags'], operation_info['operation_id'])
+        return index
+
+    def match_path(self, pattern: str) -> Set[OperationKey]:
+        """Операции по префиксу пути или glob-шаблону ('/pets', '/pets/*/photos', '/pets/**').
+
+        Префикс отбирает путь вместе со всеми вложенными, а glob-шаблон
+        сопоставляется со всем путем по сегментам (см. match_segments).
+        """
+        segments = split_path(pattern)
+        literal: List[str] = []
+        for segment in segments:
+            if _GLOB_CHARS & set(segment):
+                break
+            literal.append(segment)
+
+        candidates = self.paths.prefix('/' + '/'.join(literal))
+        if len(literal) == len(segments):
+            return set(candidates)
+        return {key for key in candidates if match_segments(segments, split_path(key[0]))}
+
+
+class OperationSelector:
+    """Критерии отбора операций."""
+
+    def __init__(
+        self,
+        include_tags: Iterable[str] = (),
+        exclude_tags: Iterable[str] = (),
+        paths: Iterable[str] = (),
+        methods: Iterable[str] = (),
+        operation_ids: Iterable[str] = ()
+    ):
+        """Инициализация критериев.
+
+        Args:
+            include_tags: Оставить операции хотя бы с одним из тегов
+            exclude_tags: Исключить операции с любым из тегов
+            paths: Префиксы путей или glob-шаблоны
+            methods: HTTP методы
+            operation_ids: Идентификаторы операций
+        """
+        self.include_tags = tuple(include_tags)
+        self.exclude_tags = tuple(exclude_tags)
+        self.paths = tuple(paths)
+        self.methods = tuple(method.upper() for method in methods)
+        self.operation_ids = tuple(operation_ids)
+
+    @property
+    def is_empty(self) -> bool:
+        """True, если критерии не заданы и отбираются все операции."""
+        return not (self.include_tags or self.exclude_tags or self.paths
+                    or self.methods or self.operation_ids)
+
+    def select_keys(self, index: OperationIndex) -> Set[OperationKey]:
+        """Возвращает ключи операций, удовлетворяющих всем критериям."""
+        selected = set(index.keys)
+        if self.include_tags:
+            selected &= set().union(*(index.by_tag.get(tag, ()) for tag in self.include_tags))
+        if self.methods:
+            selected &= set().union(*(index.by_method.get(method, ()) for method in self.methods))
+        if self.operation_ids:
+            selected &= set().union(*(index.by_operation_id.get(op, ()) for op in self.operation_ids))
+        if self.paths:
+            selected &= set().union(*(index.match_path(pattern) for pattern in self.paths))
+        for tag in self.exclude_tags:
+            selected -= index.by_tag.get(tag, set())
+        return selected
+
+    def prune_spec_data(self, spec_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Удаляет из сырой спецификации неотобранные операции до валидации.
+
+        Исходный словарь не изменяется: возвращается поверхностная копия с
+        новым словарем paths.
+        """
+        if self.is_empty:
+            return spec_data
+
+        selected = self.select_keys(OperationIndex.from_spec_data(spec_data))
+        paths = {}
+        for path, path_item in (spec_data.get('paths') or {}).items():
+            methods = [method for method in HTTP_METHODS if (path, method.upper()) in selected]
+            if not methods:
+                continue
+            pruned = {key: value for key, value in path_item.items() if key not in HTTP_METHODS}
+            for method in methods:
+                pruned[method] = path_item[method]
+            paths[path] = pruned
+
+        pruned_spec = dict(spec_data)
+        pruned_spec['paths'] = paths
+        return pruned_spec
+
+    def select(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Отбирает операции из списка get_all_operations, сохраняя порядок."""
+        if self.is_empty:
+            return operations
+        selected = self.select_keys(OperationIndex.from_operations(operations))
+        return [op for op in operations if (op['path'], op['method']) in selected]
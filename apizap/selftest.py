@@ -0,0 +1,250 @@
+"""Самотестирование производительности: накладные расходы APIZap на запрос.
+
+Поднимает локальный HTTP сервер, отвечающий пустыми 200, и прогоняет через
+него каждый движок выполнения. Так измеряется максимальная пропускная
+способность клиента, процессорное время на запрос и задержка, которую
+добавляет сам инструмент по сравнению с минимальным HTTP клиентом.
+"""
+
+import http.client
+import multiprocessing
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .engines import ENGINES, run_operations
+from .parser import OpenAPIParser, OpenAPISpec
+from .tester import APITester
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+NULL_PATH = '/null'
+
+
+class _NullHandler(BaseHTTPRequestHandler):
+    """Обработчик, отвечающий на любой запрос пустым 200."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def _serve(conn) -> None:
+    """Точка входа процесса null-сервера: отправляет порт и обслуживает запросы."""
+    server = _ThreadingHTTPServer(('127.0.0.1', 0), _NullHandler)
+    conn.send(server.server_address[1])
+    conn.close()
+    server.serve_forever()
+
+
+class NullServer:
+    """Null-сервер в отдельном процессе.
+
+    Отдельный процесс нужен, чтобы процессорное время сервера не попадало
+    в измерения клиента.
+    """
+
+    def __init__(self):
+        self.port: Optional[int] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> 'NullServer':
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child_conn,), daemon=True)
+        self._process.start()
+        self.port = parent_conn.recv()
+        parent_conn.close()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+
+
+def build_null_spec() -> OpenAPISpec:
+    """Строит спецификацию с единственной операцией GET /null."""
+    return OpenAPISpec(**{
+        'openapi': '3.0.0',
+        'info': {'title': 'APIZap null server', 'version': '1.0.0'},
+        'paths': {
+            NULL_PATH: {
+                'get': {
+                    'operationId': 'null',
+                    'responses': {'200': {'description': 'Пустой ответ'}}
+                }
+            }
+        }
+    })
+
+
+def _children_cpu_time() -> float:
+    """Процессорное время завершенных дочерних процессов."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Перцентиль по отсортированному списку (метод ближайшего ранга)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure_baseline(base_url: str, requests_count: int) -> float:
+    """Измеряет медианную задержку минимального клиента (http.client, keep-alive).
+
+    Returns:
+        Медианная задержка в миллисекундах
+    """
+    host, port = base_url.split('://', 1)[1].split(':')
+    connection = http.client.HTTPConnection(host, int(port))
+    latencies = []
+    try:
+        for _ in range(requests_count):
+            start = time.perf_counter()
+            connection.request('GET', NULL_PATH)
+            connection.getresponse().read()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection.close()
+    latencies.sort()
+    return _percentile(latencies, 0.5)
+
+
+def benchmark_engine(
+    engine: str,
+    base_url: str,
+    operations: List[Dict[str, Any]],
+    workers: int,
+    timeout: int = 30
+) -> Dict[str, Any]:
+    """Прогоняет операции одним движком и собирает показатели клиента.
+
+    Returns:
+        Словарь с пропускной способностью, CPU на запрос и задержками
+    """
+    tester_factory = partial(APITester, timeout=timeout, request_delay=0)
+
+    cpu_start = time.process_time()
+    children_start = _children_cpu_time()
+    wall_start = time.perf_counter()
+
+    results = run_operations(tester_factory, base_url, operations, engine=engine, workers=workers)
+
+    wall = time.perf_counter() - wall_start
+    cpu = (time.process_time() - cpu_start) + (_children_cpu_time() - children_start)
+
+    latencies = sorted(r['response_time'] for r in results if r.get('response_time') is not None)
+    errors = sum(1 for r in results if r['status'] != 'PASS')
+    count = len(results)
+
+    return {
+        'engine': engine,
+        'workers': 1 if engine == 'serial' else workers,
+        'requests': count,
+        'errors': errors,
+        'wall_time_s': round(wall, 3),
+        'requests_per_second': round(count / wall, 1) if wall > 0 else 0.0,
+        'cpu_per_request_us': round(cpu / count * 1e6, 1) if count else 0.0,
+        'latency_p50_ms': round(_percentile(latencies, 0.5), 3),
+        'latency_p99_ms': round(_percentile(latencies, 0.99), 3),
+    }
+
+
+def run_selftest(
+    requests_count: int = 2000,
+    workers: int = 4,
+    engines: Sequence[str] = ENGINES,
+    timeout: int = 30
+) -> Dict[str, Any]:
+    """Выполняет самотестирование для всех указанных движков.
+
+    Args:
+        requests_count: Количество запросов на каждый движок
+        workers: Количество параллельных исполнителей для конкурентных движков
+        engines: Движки для измерения
+        timeout: Таймаут HTTP запросов в секундах
+
+    Returns:
+        Словарь с базовой задержкой и результатами по движкам
+    """
+    spec = build_null_spec()
+    operation_info = OpenAPIParser().get_all_operations(spec)[0]
+    operations = [operation_info] * requests_count
+
+    with NullServer() as server:
+        # Прогрев: соединения, импорты, JIT кэшей интерпретатора
+        measure_baseline(server.base_url, min(200, requests_count))
+        baseline_ms = measure_baseline(server.base_url, requests_count)
+
+        engine_results = []
+        for engine in engines:
+            stats = benchmark_engine(engine, server.base_url, operations, workers, timeout)
+            stats['added_latency_ms'] = round(stats['latency_p50_ms'] - baseline_ms, 3)
+            engine_results.append(stats)
+
+    return {
+        'requests_per_engine': requests_count,
+        'baseline_latency_p50_ms': round(baseline_ms, 3),
+        'engines': engine_results,
+    }
+
+
+def format_selftest_report(report: Dict[str, Any]) -> str:
+    """Форматирует результаты самотестирования в виде таблицы."""
+    columns: List[Tuple[str, str]] = [
+        ('engine', 'Движок'),
+        ('workers', 'Потоки'),
+        ('requests_per_second', 'Запр/с'),
+        ('cpu_per_request_us', 'CPU/запр (мкс)'),
+        ('latency_p50_ms', 'p50 (мс)'),
+        ('latency_p99_ms', 'p99 (мс)'),
+        ('added_latency_ms', '+Задержка (мс)'),
+        ('errors', 'Ошибки'),
+    ]
+    rows = [[title for _, title in columns]]
+    for stats in report['engines']:
+        rows.append([str(stats[key]) for key, _ in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+
+    lines = [
+        "⚙️  САМОТЕСТИРОВАНИЕ ПРОИЗВОДИТЕЛЬНОСТИ КЛИЕНТА",
+        "=" * 50,
+        f"📈 Запросов на движок: {report['requests_per_engine']}",
+        f"📏 Базовая задержка (http.client, p50): {report['baseline_latency_p50_ms']}ms",
+        "",
+    ]
+    for i, row in enumerate(rows):
+        lines.append("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines)
@@ -0,0 +1,159 @@
+"""Прогон набора тестов на нескольких серверах и сравнение задержек.
+
+Каждый сервер тестируется в своем потоке своими тестерами, поэтому у
+серверов раздельные пулы соединений, и медленный регион не задерживает
+остальные. Результаты помечаются базовым URL (result['server']), по
+которому ServerComparison строит сравнение задержек операций.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .histogram import LatencyHistogram
+from .scheduler import run_scheduled
+
+
+def run_all_servers(
+    tester_factory: Callable[..., Any],
+    server_urls: List[str],
+    operations: List[Dict[str, Any]],
+    workers: int = 1,
+    fail_fast: Optional[int] = None,
+    log_sample_every: int = 1,
+    progress_interval: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Выполняет операции на всех серверах одновременно.
+
+    Args:
+        tester_factory: Фабрика тестеров (apizap.tester.APITester), принимающая
+            именованный аргумент record_server
+        server_urls: Базовые URL серверов (OpenAPIParser.get_server_urls)
+        operations: Операции в порядке запуска
+        workers: Количество параллельных исполнителей на каждый сервер
+        fail_fast: Порог FAIL, после которого сервер не получает новых операций
+        log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+        progress_interval: Период строки прогресса в секундах (None - выключена)
+
+    Returns:
+        Результаты, сгруппированные по серверам в порядке server_urls
+    """
+    factory = partial(tester_factory, record_server=True)
+
+    def run_server(base_url: str) -> List[Dict[str, Any]]:
+        logger.info(f"Сервер {base_url}: {len(operations)} операций")
+        return run_scheduled(
+            factory,
+            base_url,
+            operations,
+            workers=workers,
+            fail_fast=fail_fast,
+            log_sample_every=log_sample_every,
+            progress_interval=progress_interval
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, len(server_urls))) as executor:
+        futures = [executor.submit(run_server, url) for url in server_urls]
+        return [result for future in futures for result in future.result()]
+
+
+def server_labels(server_urls: List[str]) -> Dict[str, str]:
+    """Короткие подписи серверов: хост, если он однозначен, иначе полный URL."""
+    hosts = {url: urlparse(url).netloc or url for url in server_urls}
+    if len(set(hosts.values())) == len(hosts):
+        return hosts
+    return {url: url for url in server_urls}
+
+
+class ServerComparison:
+    """Задержки операций в разрезе серверов."""
+
+    def __init__(self):
+        self.servers: Dict[str, LatencyHistogram] = {}
+        self.operations: Dict[Tuple[str, str], Dict[str, LatencyHistogram]] = {}
+        self.failed: Dict[str, int] = {}
+
+    @classmethod
+    def from_results(cls, results: List[Mapping[str, Any]]) -> Optional['ServerComparison']:
+        """Строит сравнение по результатам с полем 'server' (None, если их нет)."""
+        comparison = cls()
+        for result in results:
+            if result.get('server'):
+                comparison.add(result)
+        return comparison if comparison.servers else None
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """Учитывает один результат."""
+        server = result['server']
+        overall = self.servers.get(server)
+        if overall is None:
+            overall = self.servers[server] = LatencyHistogram()
+            self.failed[server] = 0
+        by_server = self.operations.setdefault((result['method'], result['path']), {})
+        histogram = by_server.get(server)
+        if histogram is None:
+            histogram = by_server[server] = LatencyHistogram()
+
+        if result['status'] == 'FAIL':
+            self.failed[server] += 1
+        response_time = result.get('response_time')
+        if response_time:
+            overall.record(response_time)
+            histogram.record(response_time)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Медианные задержки операций по серверам.
+
+        Returns:
+            Строки {'method', 'path', 'latency_ms': {server: p50}, 'fastest',
+            'slowest', 'spread'}, где spread - отношение медленного к быстрому
+        """
+        rows = []
+        for (method, path), by_server in self.operations.items():
+            latency = {
+                server: round(histogram.percentile(50), 2)
+                for server, histogram in by_server.items() if histogram.count
+            }
+            row: Dict[str, Any] = {'method': method, 'path': path, 'latency_ms': latency}
+            if latency:
+                fastest = min(latency, key=latency.get)
+                slowest = max(latency, key=latency.get)
+                row.update(fastest=fastest, slowest=slowest)
+                if latency[fastest]:
+                    row['spread'] = round(latency[slowest] / latency[fastest], 2)
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сводка для JSON отчета."""
+        return {
+            'servers': {
+                server: dict(histogram.to_dict(), failed=self.failed[server])
+                for server, histogram in self.servers.items()
+            },
+            'operations': self.rows()
+        }
+
+    def format_lines(self) -> List[str]:
+        """Раздел текстового отчета."""
+        labels = server_labels(list(self.servers))
+        lines = ["", "🌍 СРАВНЕНИЕ СЕРВЕРОВ", "-" * 40]
+        for server, histogram in self.servers.items():
+            line = f"  {labels[server]}: ❌ {self.failed[server]}"
+            if histogram.count:
+                line += f" | p50 {histogram.percentile(50):.2f}ms, p95 {histogram.percentile(95):.2f}ms"
+            lines.append(line)
+
+        lines.append("")
+        for row in sorted(self.rows(), key=lambda row: -row.get('spread', 0)):
+            cells = [
+                f"{labels[server]} {latency:.2f}ms" for server, latency in row['latency_ms'].items()
+            ]
+            line = f"  {row['method']} {row['path']}: {' | '.join(cells) or 'нет данных'}"
+            if row.get('spread', 1) > 1:
+                line += f" (×{row['spread']:.1f}, медленнее всего {labels[row['slowest']]})"
+            lines.append(line)
+        return lines
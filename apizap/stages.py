@@ -0,0 +1,427 @@
+"""Профили нагрузки из стадий: разгон, ступени, всплески и длительная нагрузка.
+
+Профиль - последовательность стадий, у каждой из которых длительность и цель:
+интенсивность (запросов в секунду, открытый цикл) или конкурентность (число
+виртуальных пользователей, закрытый цикл). Стадия ramp линейно меняет цель
+от значения предыдущей стадии (или from) до своей, остальные держат цель
+постоянной. Статистика стадий и посекундный временной ряд занимают
+ограниченную память: закрытые секунды сворачиваются в сводки, хранится
+только последнее окно, а полный ряд можно выгружать в файл JSON Lines.
+"""
+
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .aggregator import GroupStats
+from .engines import ThreadLocalTesters
+from .histogram import LatencyHistogram
+from .load import OpenLoopRunner, load_data_file, parse_duration, parse_rate
+
+
+STAGE_TYPES = ('ramp', 'step', 'hold', 'spike', 'soak')
+
+# Суффиксы цели-конкурентности во встроенной записи: 50u, 50vu
+_CONCURRENCY_SUFFIXES = ('vu', 'u')
+
+
+@dataclass
+class Stage:
+    """Стадия профиля нагрузки."""
+    name: str
+    kind: str
+    duration: float
+    target: float
+    start: float
+    mode: str = 'rate'  # 'rate' - запросов в секунду, 'concurrency' - пользователей
+
+    def value_at(self, elapsed: float) -> float:
+        """Цель в момент elapsed секунд от начала стадии."""
+        if not self.duration:
+            return self.target
+        return self.start + (self.target - self.start) * min(1.0, elapsed / self.duration)
+
+    def arrivals(self) -> Iterator[float]:
+        """Моменты отправки внутри стадии при линейно меняющейся интенсивности.
+
+        Число запросов к моменту t равно r0 * t + (r1 - r0) * t^2 / (2T);
+        k-й запрос отправляется в момент, когда оно достигает k.
+        """
+        r0, r1, total = self.start, self.target, self.duration
+        slope = (r1 - r0) / (2 * total) if total else 0.0
+        for k in itertools.count():
+            if abs(slope) < 1e-12:
+                if r0 <= 0:
+                    return
+                t = k / r0
+            else:
+                discriminant = r0 * r0 + 4 * slope * k
+                if discriminant < 0:
+                    return
+                t = (-r0 + math.sqrt(discriminant)) / (2 * slope)
+            if t >= total:
+                return
+            yield t
+
+    def expected_requests(self) -> int:
+        """Ожидаемое количество запросов стадии с интенсивностью."""
+        if self.mode != 'rate':
+            return 0
+        return int((self.start + self.target) / 2 * self.duration)
+
+    def describe(self) -> str:
+        unit = 'запр/с' if self.mode == 'rate' else 'польз.'
+        target = f"{self.start:g}→{self.target:g}" if self.start != self.target else f"{self.target:g}"
+        return f"{self.name} ({self.kind}): {target} {unit}, {self.duration:g} с"
+
+
+def _parse_target(value: Any) -> Tuple[float, str]:
+    """Разбирает цель стадии: '500/s' или 500 - интенсивность, '50u' - пользователи."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), 'rate'
+    text = str(value).strip().lower()
+    for suffix in _CONCURRENCY_SUFFIXES:
+        if text.endswith(suffix) and text[:-len(suffix)].strip().isdigit():
+            return float(text[:-len(suffix)]), 'concurrency'
+    return parse_rate(text), 'rate'
+
+
+def _parse_seconds(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return parse_duration(str(value))
+
+
+class LoadProfile:
+    """Последовательность стадий нагрузки."""
+
+    def __init__(self, stages: List[Stage]):
+        if not stages:
+            raise ValueError("Профиль нагрузки не содержит стадий")
+        self.stages = stages
+
+    @classmethod
+    def from_definitions(cls, definitions: List[Dict[str, Any]]) -> 'LoadProfile':
+        """Строит профиль по описаниям стадий.
+
+        Args:
+            definitions: Словари с ключами type, duration, rate или concurrency
+                и необязательными name и from (начальная цель для ramp)
+
+        Raises:
+            ValueError: Если описание некорректно
+        """
+        stages: List[Stage] = []
+        previous: Dict[str, float] = {}
+        for number, definition in enumerate(definitions, 1):
+            if not isinstance(definition, dict):
+                raise ValueError(f"Стадия {number}: ожидался словарь")
+            kind = str(definition.get('type', 'hold')).lower()
+            if kind not in STAGE_TYPES:
+                raise ValueError(f"Стадия {number}: неизвестный тип '{kind}', ожидается один из {', '.join(STAGE_TYPES)}")
+            if 'duration' not in definition:
+                raise ValueError(f"Стадия {number}: не указана длительность")
+
+            if 'concurrency' in definition:
+                target, mode = float(definition['concurrency']), 'concurrency'
+            elif 'rate' in definition:
+                target, mode = _parse_target(definition['rate'])
+            else:
+                raise ValueError(f"Стадия {number}: укажите rate или concurrency")
+
+            if 'from' in definition:
+                start = _parse_target(definition['from'])[0]
+            elif kind == 'ramp':
+                start = previous.get(mode, 0.0)
+            else:
+                start = target
+
+            stages.append(Stage(
+                name=str(definition.get('name') or f"{number}-{kind}"),
+                kind=kind,
+                duration=_parse_seconds(definition['duration']),
+                target=target,
+                start=start,
+                mode=mode
+            ))
+            previous[mode] = target
+        return cls(stages)
+
+    @classmethod
+    def parse(cls, value: str) -> 'LoadProfile':
+        """Читает профиль из файла (JSON или YAML) или встроенной записи.
+
+        Встроенная запись - стадии через запятую в виде тип:цель:длительность,
+        например 'ramp:500/s:2m,hold:500/s:10m,spike:2000/s:30s,soak:50u:12h'.
+
+        Raises:
+            ValueError: Если профиль некорректен
+        """
+        if os.path.isfile(value):
+            return cls.from_definitions(cls._load_file(value))
+
+        definitions = []
+        for part in filter(None, (item.strip() for item in value.split(','))):
+            fields = part.split(':')
+            if len(fields) not in (3, 4):
+                raise ValueError(f"Некорректная стадия '{part}', ожидается тип:цель:длительность[:имя]")
+            definition = {'type': fields[0], 'rate': fields[1], 'duration': fields[2]}
+            if len(fields) == 4:
+                definition['name'] = fields[3]
+            definitions.append(definition)
+        return cls.from_definitions(definitions)
+
+    @staticmethod
+    def _load_file(path: str) -> List[Dict[str, Any]]:
+        data = load_data_file(path, 'профиля нагрузки')
+        stages = data.get('stages') if isinstance(data, dict) else data
+        if not isinstance(stages, list):
+            raise ValueError(f"{path}: ожидается список стадий (stages)")
+        return stages
+
+    @property
+    def duration(self) -> float:
+        return sum(stage.duration for stage in self.stages)
+
+    def segments(self) -> List[List[Stage]]:
+        """Подряд идущие стадии с одним режимом (интенсивность или конкурентность)."""
+        segments: List[List[Stage]] = []
+        for stage in self.stages:
+            if segments and segments[-1][0].mode == stage.mode:
+                segments[-1].append(stage)
+            else:
+                segments.append([stage])
+        return segments
+
+
+class TimeSeries:
+    """Посекундный временной ряд в ограниченной памяти.
+
+    Открыты только секунды, в которые еще приходят ответы; закрытые
+    сворачиваются в сводку, попадают в окно последних window секунд и,
+    если задан sink, записываются в него строкой JSON.
+    """
+
+    # Сколько секунд после окончания ждать запоздавшие ответы
+    GRACE_SECONDS = 2
+
+    def __init__(self, window: int = 3600, sink: Optional[IO[str]] = None):
+        self.window: deque = deque(maxlen=window)
+        self.sink = sink
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._latest = 0
+
+    def add(self, second: int, stage: str, outcome: str, response_time: Optional[float]) -> None:
+        bucket = self._open.get(second)
+        if bucket is None:
+            bucket = self._open[second] = {'stage': stage, 'requests': 0, 'failed': 0,
+                                           'latency': LatencyHistogram()}
+        bucket['requests'] += 1
+        if outcome == 'FAIL':
+            bucket['failed'] += 1
+        if response_time:
+            bucket['latency'].record(response_time)
+
+        if second > self._latest:
+            self._latest = second
+            self.flush(second - self.GRACE_SECONDS)
+
+    def flush(self, before: Optional[int] = None) -> None:
+        """Закрывает секунды раньше before (все - если before не задан)."""
+        for second in sorted(self._open):
+            if before is not None and second >= before:
+                break
+            bucket = self._open.pop(second)
+            point = {'t': second, 'stage': bucket['stage'], 'requests': bucket['requests'],
+                     'failed': bucket['failed']}
+            point.update(bucket['latency'].to_dict(percentiles=(50, 99)))
+            self.window.append(point)
+            if self.sink is not None:
+                self.sink.write(json.dumps(point, ensure_ascii=False) + "\n")
+
+    def points(self) -> List[Dict[str, Any]]:
+        return list(self.window)
+
+
+class ProfileRecorder:
+    """Статистика стадий и временной ряд; используется как хук результатов."""
+
+    def __init__(self, profile: LoadProfile, window: int = 3600, sink: Optional[IO[str]] = None):
+        self.profile = profile
+        self.stages: Dict[str, GroupStats] = {stage.name: GroupStats() for stage in profile.stages}
+        self.timeseries = TimeSeries(window, sink)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Учитывает результат с полем 'stage'."""
+        second = int(time.perf_counter() - self.started)
+        outcome = result['status']
+        response_time = result.get('response_time')
+        with self._lock:
+            self.stages[result['stage']].add(outcome, response_time)
+            self.timeseries.add(second, result['stage'], outcome, response_time)
+
+    __call__ = add
+
+    def finish(self) -> None:
+        with self._lock:
+            self.timeseries.flush()
+
+    def stage_stats(self) -> List[Dict[str, Any]]:
+        rows = []
+        for stage in self.profile.stages:
+            stats = self.stages[stage.name]
+            row = {'name': stage.name, 'type': stage.kind, 'mode': stage.mode,
+                   'start': stage.start, 'target': stage.target, 'duration_s': stage.duration}
+            row.update(stats.to_dict())
+            row['throughput'] = round(stats.count / stage.duration, 2) if stage.duration else 0.0
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'stages': self.stage_stats(), 'timeseries': self.timeseries.points()}
+
+    def format_lines(self) -> List[str]:
+        """Раздел текстового отчета."""
+        lines = ["", "📈 СТАДИИ НАГРУЗКИ", "-" * 40]
+        for stage, row in zip(self.profile.stages, self.stage_stats()):
+            line = (f"  {stage.describe()} | {row['total']} запросов, {row['throughput']:g} запр/с, "
+                    f"❌ {row['failed']}")
+            if 'p50_ms' in row:
+                line += f" | p50 {row['p50_ms']:.2f}ms, p95 {row['p95_ms']:.2f}ms, p99 {row['p99_ms']:.2f}ms"
+            lines.append(line)
+        return lines
+
+
+class ProfileRunner:
+    """Выполняет профиль нагрузки по операциям спецификации."""
+
+    def __init__(
+        self,
+        tester_factory: Callable[[], Any],
+        base_url: str,
+        operations: List[Dict[str, Any]],
+        recorder: ProfileRecorder,
+        max_in_flight: int = 100,
+        result_hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None,
+        log_sample_every: int = 1,
+        progress_interval: Optional[float] = None,
+        picker: Optional[Callable[..., Dict[str, Any]]] = None,
+        max_pending: Optional[int] = None
+    ):
+        """Инициализация.
+
+        Args:
+            tester_factory: Фабрика тестеров без хуков результатов
+            base_url: Базовый URL API
+            operations: Операции нагрузки
+            recorder: Статистика стадий (ProfileRecorder)
+            max_in_flight: Наибольшее число одновременных запросов в стадиях с интенсивностью
+            result_hooks: Функции, вызываемые с каждым результатом
+            log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+            progress_interval: Период строки прогресса в секундах (None - выключена)
+            picker: Выбор следующей операции (apizap.mix.TrafficMix.picker;
+                по умолчанию - по кругу)
+            max_pending: Наибольшее число отправленных, но не завершенных
+                запросов в стадиях с интенсивностью (по умолчанию -
+                max_in_flight * 2), чтобы при зависшем API очередь и память
+                не росли с длительностью прогона
+        """
+        self.tester_factory = tester_factory
+        self.base_url = base_url
+        self.operations = operations
+        self.recorder = recorder
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending or max_in_flight * 2
+        self.result_hooks = list(result_hooks or [])
+        self.log_sample_every = log_sample_every
+        self.progress_interval = progress_interval
+        self.pick = picker or self._next_in_order
+        self._counter = itertools.count()
+
+    def _next_in_order(self, index: int = 0) -> Dict[str, Any]:
+        """Следующая операция по кругу (общий счетчик для всех стадий)."""
+        return self.operations[next(self._counter) % len(self.operations)]
+
+    def run(self) -> None:
+        """Выполняет все стадии; результаты передаются только хукам и recorder."""
+        self.recorder.started = time.perf_counter()
+        for segment in self.recorder.profile.segments():
+            logger.info("Стадии: {}", "; ".join(stage.describe() for stage in segment))
+            if segment[0].mode == 'rate':
+                self._run_rate(segment)
+            else:
+                self._run_concurrency(segment)
+        self.recorder.finish()
+
+    def _emit(self, result: Dict[str, Any]) -> None:
+        self.recorder.add(result)
+        for hook in self.result_hooks:
+            hook(result)
+
+    def _run_rate(self, stages: List[Stage]) -> None:
+        bounds = list(itertools.accumulate([0.0] + [stage.duration for stage in stages[:-1]]))
+
+        def arrivals() -> Iterator[float]:
+            for offset, stage in zip(bounds, stages):
+                for t in stage.arrivals():
+                    yield offset + t
+
+        def label(result: Dict[str, Any]) -> None:
+            result['stage'] = stages[bisect_right(bounds, result['scheduled_at']) - 1].name
+            self._emit(result)
+
+        runner = OpenLoopRunner(
+            self.tester_factory,
+            self.base_url,
+            self.operations,
+            max_in_flight=self.max_in_flight,
+            result_hooks=[label],
+            picker=self.pick,
+            log_sample_every=self.log_sample_every,
+            progress_interval=self.progress_interval,
+            keep_results=False,
+            max_pending=self.max_pending
+        )
+        runner.run(arrivals(), expected=sum(stage.expected_requests() for stage in stages))
+
+    def _run_concurrency(self, stages: List[Stage]) -> None:
+        users = max(1, int(max(max(stage.start, stage.target) for stage in stages)))
+        bounds = list(itertools.accumulate([0.0] + [stage.duration for stage in stages]))
+        testers = ThreadLocalTesters(self.tester_factory)
+        started = time.perf_counter()
+
+        def current(elapsed: float) -> Tuple[Optional[Stage], float]:
+            index = bisect_right(bounds, elapsed) - 1
+            if index >= len(stages):
+                return None, 0.0
+            stage = stages[index]
+            return stage, stage.value_at(elapsed - bounds[index])
+
+        def user(number: int) -> None:
+            tester = testers.get()
+            while True:
+                stage, target = current(time.perf_counter() - started)
+                if stage is None:
+                    return
+                if number >= round(target):
+                    time.sleep(0.01)
+                    continue
+                result = tester.test_operation(self.base_url, self.pick())
+                result['stage'] = stage.name
+                self._emit(result)
+
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            for future in [executor.submit(user, number) for number in range(users)]:
+                future.result()
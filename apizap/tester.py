@@ -1,30 +1,87 @@
 """Модуль для тестирования API эндпоинтов."""
 
+import itertools
 import json
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from urllib.parse import urljoin
 
 import requests
 from loguru import logger
 
+from .log import RequestLogger
 from .parser import OpenAPISpec, Parameter
+from .profiling import profile_phase
+from .results import TestResult, capture_headers, normalize_header_whitelist
+
+
+# Значение в param_overrides, при котором параметр не передается в запросе
+OMIT_PARAMETER = object()
+
+# Схема тела без 'schema': один объект на все запросы, чтобы генератор данных
+# (он кэширует схемы по id) не заводил новую запись на каждый запрос
+_EMPTY_SCHEMA: Dict[str, Any] = {}
 
 
 class APITester:
     """Тестер API эндпоинтов."""
     
-    def __init__(self, timeout: int = 30, auth_config: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        timeout: int = 30,
+        auth_config: Optional[Dict[str, str]] = None,
+        request_delay: float = 0.1,
+        result_hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None,
+        tracer: Optional[Any] = None,
+        profiler: Optional[Any] = None,
+        header_whitelist: Optional[Iterable[str]] = None,
+        log_sample_every: int = 1,
+        progress_interval: Optional[float] = None,
+        response_validator: Optional[Any] = None,
+        data_generator: Optional[Any] = None,
+        record_server: bool = False,
+        cassette: Optional[Any] = None
+    ):
         """Инициализация тестера.
         
         Args:
             timeout: Таймаут для HTTP запросов в секундах
             auth_config: Конфигурация аутентификации
+            request_delay: Пауза между запросами в test_all_endpoints (в секундах)
+            result_hooks: Функции, вызываемые с каждым результатом сразу после запроса
+            tracer: Трассировщик (apizap.tracing.Tracer) для span'а на каждый запрос
+            profiler: Профилировщик фаз (apizap.profiling.PhaseProfiler)
+            header_whitelist: Заголовки ответа, сохраняемые в результате
+                (по умолчанию - те, что попадают в JSON отчет; '*' - все)
+            log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+            progress_interval: Период строки прогресса в секундах (None - выключена)
+            response_validator: Проверка 2xx ответов по схемам спецификации
+                (apizap.validation.ResponseValidator)
+            data_generator: Генератор параметров и тел запросов по схемам
+                (apizap.datagen.DataGenerator); каждый запрос получает следующее значение
+            record_server: Записывать базовый URL в result['server']
+                (для сравнения серверов в режиме --all-servers)
+            cassette: Кассета (apizap.cassette.Cassette), через которую идут
+                запросы: запись обменов или ответы из файла без сети
         """
         self.timeout = timeout
         self.auth_config = auth_config
+        self.request_delay = request_delay
+        self.result_hooks = list(result_hooks or [])
+        self.tracer = tracer
+        self.profiler = profiler
+        self.header_whitelist = normalize_header_whitelist(header_whitelist)
+        self.log_sample_every = log_sample_every
+        self.progress_interval = progress_interval
+        self.response_validator = response_validator
+        self.data_generator = data_generator
+        self.record_server = record_server
+        self._data_index = itertools.count()
         self.session = requests.Session()
+        if cassette is not None:
+            adapter = cassette.adapter()
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
         
         # Настройка аутентификации
         if auth_config:
@@ -52,47 +109,92 @@ class APITester:
         
         logger.debug(f"Настроена аутентификация: {auth_type}")
     
-    def test_all_endpoints(self, spec: OpenAPISpec) -> List[Dict[str, Any]]:
+    def test_all_endpoints(
+        self,
+        spec: OpenAPISpec,
+        operations: Optional[List[Dict[str, Any]]] = None
+    ) -> List[TestResult]:
         """Тестирует все эндпоинты API.
         
         Args:
             spec: OpenAPI спецификация
+            operations: Уже отобранные операции (по умолчанию - все операции спецификации)
             
         Returns:
             Список результатов тестов
         """
         from .parser import OpenAPIParser
         
-        parser = OpenAPIParser()
+        parser = OpenAPIParser(profiler=self.profiler)
         base_url = parser.get_base_url(spec)
-        operations = parser.get_all_operations(spec)
+        if operations is None:
+            operations = parser.get_all_operations(spec)
         
         results = []
         total_operations = len(operations)
         
         logger.info(f"Начинаем тестирование {total_operations} операций...")
+        request_log = RequestLogger(total_operations, self.log_sample_every, self.progress_interval)
         
         for i, operation_info in enumerate(operations, 1):
-            logger.info(f"[{i}/{total_operations}] Тестируем: {operation_info['method']} {operation_info['path']}")
-            
-            result = self._test_single_endpoint(
-                base_url=base_url,
-                method=operation_info['method'],
-                path=operation_info['path'],
-                operation=operation_info['operation'],
-                parameters=operation_info['parameters'],
-                operation_id=operation_info['operation_id'],
-                summary=operation_info['summary']
-            )
+            request_log.before(i, operation_info)
             
+            result = self.test_operation(base_url, operation_info)
             results.append(result)
+            request_log.after(result)
             
             # Небольшая задержка между запросами
-            time.sleep(0.1)
+            if self.request_delay:
+                time.sleep(self.request_delay)
         
         logger.info(f"Тестирование завершено. Обработано операций: {len(results)}")
         return results
     
+    def test_operation(
+        self,
+        base_url: str,
+        operation_info: Dict[str, Any],
+        param_overrides: Optional[Dict[str, Any]] = None,
+        capture_exchange: bool = False
+    ) -> TestResult:
+        """Тестирует одну операцию из списка get_all_operations.
+        
+        Args:
+            base_url: Базовый URL API
+            operation_info: Описание операции из OpenAPIParser.get_all_operations
+                (ключ 'param_overrides' задает значения параметров тестового случая)
+            param_overrides: Значения параметров по имени вместо примерных
+                (дополняют и перекрывают operation_info['param_overrides'])
+            capture_exchange: Сохранить в result['exchange'] параметры запроса,
+                JSON тело и заголовки ответа (для связывания операций в workflow)
+            
+        Returns:
+            Результат тестирования
+        """
+        case_overrides = operation_info.get('param_overrides')
+        if case_overrides:
+            param_overrides = dict(case_overrides, **(param_overrides or {}))
+        
+        result = self._test_single_endpoint(
+            base_url=base_url,
+            method=operation_info['method'],
+            path=operation_info['path'],
+            operation=operation_info['operation'],
+            parameters=operation_info['parameters'],
+            operation_id=operation_info['operation_id'],
+            summary=operation_info['summary'],
+            param_overrides=param_overrides,
+            capture_exchange=capture_exchange
+        )
+        result['tags'] = operation_info.get('tags')
+        if self.record_server:
+            result['server'] = base_url
+        
+        for hook in self.result_hooks:
+            hook(result)
+        
+        return result
+    
     def _test_single_endpoint(
         self,
         base_url: str,
@@ -101,8 +203,10 @@ class APITester:
         operation: Any,
         parameters: List[Parameter],
         operation_id: str,
-        summary: str
-    ) -> Dict[str, Any]:
+        summary: str,
+        param_overrides: Optional[Dict[str, Any]] = None,
+        capture_exchange: bool = False
+    ) -> TestResult:
         """Тестирует один эндпоинт.
         
         Args:
@@ -113,74 +217,76 @@ class APITester:
             parameters: Список параметров
             operation_id: ID операции
             summary: Краткое описание операции
+            param_overrides: Значения параметров по имени вместо примерных
+            capture_exchange: Сохранить запрос и ответ в result['exchange']
             
         Returns:
             Результат тестирования
         """
         start_time = time.time()
-        test_result = {
-            'operation_id': operation_id,
-            'method': method,
-            'path': path,
-            'summary': summary,
-            'status': 'FAIL',
-            'status_code': None,
-            'response_time': None,
-            'error': None,
-            'response_headers': {},
-            'response_size': 0,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        test_result = TestResult(
+            operation_id=operation_id,
+            method=method,
+            path=path,
+            summary=summary,
+            created_at=start_time
+        )
+        
+        span = None
+        if self.tracer:
+            span = self.tracer.start_span(f"{method} {path}", {
+                'http.request.method': method,
+                'url.template': path,
+                'apizap.operation_id': operation_id
+            })
+            test_result['trace_id'] = span.trace_id
         
         try:
             # Подготовка URL и параметров
-            full_url, query_params, path_params, headers, json_body = self._prepare_request(
-                base_url, path, parameters, operation
-            )
+            with profile_phase(self.profiler, 'prepare'):
+                full_url, query_params, path_params, headers, json_body = self._prepare_request(
+                    base_url, path, parameters, operation, param_overrides
+                )
+                
+                if span:
+                    headers['traceparent'] = span.traceparent
+                    span.attributes['url.full'] = full_url
+                    span.attributes['apizap.phase.prepare_ms'] = round((time.time() - start_time) * 1000, 3)
+                    span.add_event('prepared')
             
             # Выполнение запроса
-            response = self.session.request(
-                method=method.upper(),
-                url=full_url,
-                params=query_params,
-                headers=headers,
-                json=json_body,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
+            with profile_phase(self.profiler, 'send'):
+                response = self.session.request(
+                    method=method.upper(),
+                    url=full_url,
+                    params=query_params,
+                    headers=headers,
+                    json=json_body,
+                    timeout=self.timeout,
+                    allow_redirects=True
+                )
             
             # Измерение времени ответа
             response_time = time.time() - start_time
             
-            # Анализ ответа
-            test_result.update({
-                'status_code': response.status_code,
-                'response_time': round(response_time * 1000, 2),  # в миллисекундах
-                'response_headers': dict(response.headers),
-                'response_size': len(response.content)
-            })
+            if span:
+                span.attributes['apizap.phase.send_ms'] = round(
+                    response_time * 1000 - span.attributes['apizap.phase.prepare_ms'], 3
+                )
+                span.add_event('response_received')
             
-            # Определение статуса теста
-            if 200 <= response.status_code < 300:
-                test_result['status'] = 'PASS'
-            elif 400 <= response.status_code < 500:
-                # Клиентские ошибки могут быть ожидаемыми
-                test_result['status'] = 'WARN'
-                test_result['error'] = f"Клиентская ошибка: {response.status_code}"
-            else:
-                test_result['status'] = 'FAIL'
-                test_result['error'] = f"Серверная ошибка: {response.status_code}"
-            
-            # Попытка парсинга JSON ответа для дополнительной информации
-            try:
-                if response.headers.get('content-type', '').startswith('application/json'):
-                    response_json = response.json()
-                    if isinstance(response_json, dict) and 'error' in response_json:
-                        test_result['error'] = response_json.get('error', 'Неизвестная ошибка')
-            except (json.JSONDecodeError, ValueError):
-                pass  # Игнорируем ошибки парсинга JSON
+            # Анализ ответа
+            with profile_phase(self.profiler, 'analyze'):
+                self._analyze_response(response, response_time, test_result, operation)
+                if capture_exchange:
+                    test_result['exchange'] = {
+                        'path': path_params,
+                        'query': query_params,
+                        'body': self._response_json(response),
+                        'headers': response.headers
+                    }
             
-            logger.debug(f"  -> {test_result['status']} ({test_result['status_code']}) {test_result['response_time']}ms")
+            logger.debug("  -> {} ({}) {}ms", test_result.status, test_result.status_code, test_result.response_time)
             
         except requests.exceptions.Timeout:
             test_result.update({
@@ -188,7 +294,7 @@ class APITester:
                 'error': f'Таймаут запроса ({self.timeout}s)',
                 'response_time': (time.time() - start_time) * 1000
             })
-            logger.warning(f"  -> TIMEOUT после {self.timeout}s")
+            logger.warning("  -> TIMEOUT после {}s", self.timeout)
             
         except requests.exceptions.ConnectionError as e:
             test_result.update({
@@ -196,7 +302,7 @@ class APITester:
                 'error': f'Ошибка подключения: {str(e)}',
                 'response_time': (time.time() - start_time) * 1000
             })
-            logger.warning(f"  -> CONNECTION ERROR: {str(e)}")
+            logger.warning("  -> CONNECTION ERROR: {}", e)
             
         except requests.exceptions.RequestException as e:
             test_result.update({
@@ -204,7 +310,7 @@ class APITester:
                 'error': f'Ошибка запроса: {str(e)}',
                 'response_time': (time.time() - start_time) * 1000
             })
-            logger.warning(f"  -> REQUEST ERROR: {str(e)}")
+            logger.warning("  -> REQUEST ERROR: {}", e)
             
         except Exception as e:
             test_result.update({
@@ -212,16 +318,95 @@ class APITester:
                 'error': f'Неожиданная ошибка: {str(e)}',
                 'response_time': (time.time() - start_time) * 1000
             })
-            logger.error(f"  -> UNEXPECTED ERROR: {str(e)}")
+            logger.error("  -> UNEXPECTED ERROR: {}", e)
+        
+        if span:
+            span.attributes['http.response.status_code'] = test_result['status_code']
+            span.attributes['apizap.outcome'] = test_result['status']
+            if 'apizap.phase.send_ms' in span.attributes:
+                span.attributes['apizap.phase.analyze_ms'] = round(
+                    (time.time() - start_time) * 1000 - test_result['response_time'], 3
+                )
+            if test_result['error']:
+                span.attributes['error.message'] = test_result['error']
+            span.error = test_result['status'] == 'FAIL'
+            self.tracer.end_span(span)
         
         return test_result
     
+    def _analyze_response(
+        self,
+        response: requests.Response,
+        response_time: float,
+        test_result: TestResult,
+        operation: Any = None
+    ) -> None:
+        """Заполняет результат теста по полученному ответу.
+        
+        Args:
+            response: HTTP ответ
+            response_time: Время ответа в секундах
+            test_result: Результат теста для обновления
+            operation: Операция из спецификации (для проверки схемы ответа)
+        """
+        test_result.update({
+            'status_code': response.status_code,
+            'response_time': round(response_time * 1000, 2),  # в миллисекундах
+            'response_headers': capture_headers(response.headers, self.header_whitelist),
+            'response_size': len(response.content)
+        })
+        
+        # Определение статуса теста
+        if 200 <= response.status_code < 300:
+            test_result['status'] = 'PASS'
+        elif 400 <= response.status_code < 500:
+            # Клиентские ошибки могут быть ожидаемыми
+            test_result['status'] = 'WARN'
+            test_result['error'] = f"Клиентская ошибка: {response.status_code}"
+        else:
+            test_result['status'] = 'FAIL'
+            test_result['error'] = f"Серверная ошибка: {response.status_code}"
+        
+        # Проверка контракта: тело успешного ответа должно соответствовать схеме
+        if self.response_validator is not None and test_result['status'] == 'PASS':
+            schema_error = self.response_validator.validate_response(
+                test_result.operation_id,
+                operation,
+                response.status_code,
+                response.headers.get('content-type', ''),
+                response.content
+            )
+            if schema_error:
+                test_result['status'] = 'FAIL'
+                test_result['error'] = f"Ответ не соответствует схеме: {schema_error}"
+                return
+        
+        # Попытка парсинга JSON ответа для дополнительной информации
+        try:
+            if response.headers.get('content-type', '').startswith('application/json'):
+                response_json = response.json()
+                if isinstance(response_json, dict) and 'error' in response_json:
+                    test_result['error'] = response_json.get('error', 'Неизвестная ошибка')
+        except (json.JSONDecodeError, ValueError):
+            pass  # Игнорируем ошибки парсинга JSON
+    
+    @staticmethod
+    def _response_json(response: requests.Response) -> Any:
+        """Возвращает JSON тело ответа или None."""
+        if not response.headers.get('content-type', '').startswith('application/json'):
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+    
     def _prepare_request(
         self,
         base_url: str,
         path: str,
         parameters: List[Parameter],
-        operation: Any
+        operation: Any,
+        param_overrides: Optional[Dict[str, Any]] = None
     ) -> tuple:
         """Подготавливает параметры запроса.
         
@@ -230,6 +415,7 @@ class APITester:
             path: Путь эндпоинта
             parameters: Список параметров
             operation: Операция из спецификации
+            param_overrides: Значения параметров по имени вместо примерных
             
         Returns:
             Кортеж (url, query_params, path_params, headers, json_body)
@@ -239,17 +425,27 @@ class APITester:
         headers = {}
         json_body = None
         
+        overrides = param_overrides or {}
+        index = next(self._data_index) if self.data_generator is not None else 0
+        
         # Обработка параметров
         for param in parameters:
+            if param.name in overrides:
+                value = overrides[param.name]
+                if value is OMIT_PARAMETER:
+                    continue
+            else:
+                value = self._get_example_value(param, index)
+            
             if param.in_ == 'query':
                 # Добавляем query параметры с примерными значениями
-                query_params[param.name] = self._get_example_value(param)
+                query_params[param.name] = value
             elif param.in_ == 'path':
                 # Добавляем path параметры с примерными значениями
-                path_params[param.name] = self._get_example_value(param)
+                path_params[param.name] = value
             elif param.in_ == 'header':
                 # Добавляем заголовки с примерными значениями
-                headers[param.name] = str(self._get_example_value(param))
+                headers[param.name] = str(value)
         
         # Замена path параметров в URL
         processed_path = path
@@ -261,15 +457,16 @@ class APITester:
         
         # Обработка request body для POST/PUT/PATCH запросов
         if operation and operation.requestBody:
-            json_body = self._generate_request_body(operation.requestBody)
+            json_body = self._generate_request_body(operation.requestBody, index)
         
         return full_url, query_params, path_params, headers, json_body
     
-    def _get_example_value(self, param: Parameter) -> Any:
+    def _get_example_value(self, param: Parameter, index: int = 0) -> Any:
         """Генерирует примерное значение для параметра.
         
         Args:
             param: Параметр OpenAPI
+            index: Номер значения для генератора данных
             
         Returns:
             Примерное значение
@@ -278,6 +475,9 @@ class APITester:
         if param.example is not None:
             return param.example
         
+        if self.data_generator is not None and param.schema_:
+            return self.data_generator.generate(param.schema_, index)
+        
         # Если есть схема, анализируем тип
         if param.schema_:
             schema_type = param.schema_.get('type', 'string')
@@ -303,11 +503,12 @@ class APITester:
         else:
             return 'test_value'
     
-    def _generate_request_body(self, request_body: Any) -> Optional[Dict[str, Any]]:
+    def _generate_request_body(self, request_body: Any, index: int = 0) -> Optional[Dict[str, Any]]:
         """Генерирует тело запроса на основе спецификации.
         
         Args:
             request_body: Спецификация тела запроса
+            index: Номер значения для генератора данных
             
         Returns:
             Словарь с телом запроса или None
@@ -316,25 +517,26 @@ class APITester:
             # Ищем application/json content type
             content = request_body.content
             if 'application/json' in content:
-                json_schema = content['application/json'].get('schema', {})
-                return self._generate_json_from_schema(json_schema)
+                json_schema = content['application/json'].get('schema', _EMPTY_SCHEMA)
+                return self._generate_json_from_schema(json_schema, index)
             
             # Если нет JSON, пытаемся найти другие форматы
             for content_type, content_info in content.items():
                 if 'json' in content_type.lower():
-                    json_schema = content_info.get('schema', {})
-                    return self._generate_json_from_schema(json_schema)
+                    json_schema = content_info.get('schema', _EMPTY_SCHEMA)
+                    return self._generate_json_from_schema(json_schema, index)
             
         except Exception as e:
             logger.debug(f"Ошибка генерации request body: {str(e)}")
         
         return None
     
-    def _generate_json_from_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_json_from_schema(self, schema: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
         """Генерирует JSON объект из OpenAPI схемы.
         
         Args:
             schema: OpenAPI схема
+            index: Номер значения для генератора данных
             
         Returns:
             Сгенерированный JSON объект
@@ -342,6 +544,9 @@ class APITester:
         if not isinstance(schema, dict):
             return {}
         
+        if self.data_generator is not None:
+            return self.data_generator.generate(schema, index)
+        
         schema_type = schema.get('type', 'object')
         
         if schema_type == 'object':
@@ -0,0 +1,237 @@
+"""Трассировка запросов в стиле OpenTelemetry с передачей W3C traceparent.
+
+Каждый запрос тестера оформляется как клиентский span. Его идентификаторы
+передаются серверу в заголовке ``traceparent``, а сами span'ы пачками
+выгружаются в формате OTLP/JSON: в локальный файл (работает без сети)
+или в OTLP/HTTP коллектор.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from loguru import logger
+
+
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+class Span:
+    """Завершаемый span одного запроса."""
+
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_span_id', 'name',
+        'start_time_ns', 'end_time_ns', 'attributes', 'events', 'error'
+    )
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                 parent: Optional['Span'] = None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else None
+        self.name = name
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.error = False
+
+    @property
+    def traceparent(self) -> str:
+        """Значение заголовка W3C traceparent для этого span'а."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Добавляет событие с текущей меткой времени."""
+        self.events.append({
+            'name': name,
+            'time_ns': time.time_ns(),
+            'attributes': dict(attributes or {})
+        })
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Преобразует span в представление OTLP/JSON."""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': SPAN_KIND_CLIENT,
+            'startTimeUnixNano': str(self.start_time_ns),
+            'endTimeUnixNano': str(self.end_time_ns or self.start_time_ns),
+            'attributes': _otlp_attributes(self.attributes),
+            'events': [
+                {
+                    'name': event['name'],
+                    'timeUnixNano': str(event['time_ns']),
+                    'attributes': _otlp_attributes(event['attributes'])
+                }
+                for event in self.events
+            ],
+            'status': {'code': STATUS_CODE_ERROR if self.error else STATUS_CODE_OK}
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {'key': key, 'value': _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def build_otlp_request(spans: List[Span], service_name: str = 'apizap') -> Dict[str, Any]:
+    """Формирует тело запроса экспорта OTLP/JSON (ExportTraceServiceRequest)."""
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({'service.name': service_name})},
+            'scopeSpans': [{
+                'scope': {'name': 'apizap', 'version': '1.0.0'},
+                'spans': [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class FileSpanExporter:
+    """Записывает пачки span'ов в файл, по одному OTLP/JSON запросу на строку.
+
+    Формат совместим с приемником otlpjsonfile коллектора OpenTelemetry.
+    """
+
+    def __init__(self, path: str, service_name: str = 'apizap'):
+        self.path = path
+        self.service_name = service_name
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(build_otlp_request(spans, self.service_name), ensure_ascii=False)
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OTLPHttpSpanExporter:
+    """Отправляет пачки span'ов в OTLP/HTTP коллектор в JSON кодировке."""
+
+    def __init__(self, endpoint: str, service_name: str = 'apizap', timeout: int = 10):
+        """Инициализация экспортера.
+
+        Args:
+            endpoint: Адрес коллектора (например, http://localhost:4318)
+            service_name: Значение атрибута ресурса service.name
+            timeout: Таймаут отправки в секундах
+        """
+        endpoint = endpoint.rstrip('/')
+        if not endpoint.endswith('/v1/traces'):
+            endpoint += '/v1/traces'
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            response = self.session.post(
+                self.endpoint,
+                json=build_otlp_request(spans, self.service_name),
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Не удалось экспортировать {len(spans)} span'ов: {str(e)}")
+
+    def shutdown(self) -> None:
+        self.session.close()
+
+
+class Tracer:
+    """Создает span'ы и выгружает завершенные пачками в фоновом потоке."""
+
+    def __init__(self, exporters: List[Any], batch_size: int = 512,
+                 flush_interval: float = 2.0, max_queue_size: int = 8192):
+        """Инициализация трассировщика.
+
+        Args:
+            exporters: Экспортеры с методами export(spans) и shutdown()
+            batch_size: Максимальный размер пачки
+            flush_interval: Максимальное время ожидания пачки в секундах
+            max_queue_size: Размер очереди; при переполнении span'ы отбрасываются
+        """
+        self.exporters = exporters
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: 'queue.Queue[Optional[Span]]' = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[Span] = None) -> Span:
+        """Открывает новый span."""
+        return Span(name, attributes, parent)
+
+    def end_span(self, span: Span) -> None:
+        """Завершает span и ставит его в очередь на экспорт без блокировки."""
+        span.end_time_ns = time.time_ns()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Выгружает оставшиеся span'ы и закрывает экспортеры."""
+        self._queue.put(None)
+        self._worker.join()
+        for exporter in self.exporters:
+            exporter.shutdown()
+        if self.dropped:
+            logger.warning(f"Отброшено span'ов из-за переполнения очереди: {self.dropped}")
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                span = False
+
+            if span is None:
+                self._export(batch)
+                return
+            if span:
+                batch.append(span)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as e:
+                logger.warning(f"Ошибка экспорта span'ов: {str(e)}")
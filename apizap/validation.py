@@ -0,0 +1,413 @@
+"""Проверка ответов на соответствие схемам из спецификации.
+
+Каждая схема ответа один раз компилируется в Python-функцию (генерацией
+исходного кода, как в fastjsonschema), и функция кэшируется по ключу
+(операция, статус-код, content-type). Проверка ответа - это вызов готовой
+функции без обхода словаря схемы. Под нагрузкой можно проверять только
+каждый N-й ответ, а большие JSON массивы проверяются потоково: элементы
+декодируются и проверяются по одному, без построения всего списка.
+"""
+
+import itertools
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .schema import SchemaResolver
+
+
+Validator = Callable[[Any], Optional[str]]
+
+_MISSING = object()
+
+_TYPE_CHECKS = {
+    'string': 'isinstance(data, str)',
+    'integer': '((isinstance(data, int) and not isinstance(data, bool))'
+               ' or (isinstance(data, float) and data.is_integer()))',
+    'number': '(isinstance(data, (int, float)) and not isinstance(data, bool))',
+    'boolean': 'isinstance(data, bool)',
+    'array': 'isinstance(data, list)',
+    'object': 'isinstance(data, dict)',
+    'null': 'data is None',
+}
+
+_NUMBER_GUARD = 'isinstance(data, (int, float)) and not isinstance(data, bool)'
+
+
+def _pointer_token(name: str) -> str:
+    return '/' + str(name).replace('~', '~0').replace('/', '~1')
+
+
+class SchemaCompiler:
+    """Компилирует JSON схемы в функции проверки.
+
+    Функция проверки возвращает None для корректного значения или описание
+    первой ошибки вида '/items/0/id: ожидался тип integer' (путь относительно
+    проверяемого значения).
+    """
+
+    def __init__(self, resolver: Optional[SchemaResolver] = None):
+        self.resolver = resolver or SchemaResolver()
+        self._lines: List[str] = []
+        self._namespace: Dict[str, Any] = {'_MISSING': _MISSING}
+        self._functions: Dict[Any, str] = {}
+        # Схемы, закэшированные по id(), удерживаются, чтобы id не переиспользовался
+        self._schemas: List[Any] = []
+        self._counter = itertools.count()
+
+    def compile(self, schema: Any) -> Validator:
+        """Компилирует схему в функцию проверки.
+
+        Raises:
+            KeyError: Если схема содержит неразрешимую ссылку
+            TypeError: Если ключевое слово схемы имеет неверный тип (например, type)
+        """
+        registered = set(self._functions)
+        try:
+            name = self._function_for(schema)
+        except Exception:
+            # Откатываем функции, тела которых не были сгенерированы
+            for key in set(self._functions) - registered:
+                del self._functions[key]
+            self._lines = []
+            raise
+        if self._lines:
+            source = "\n".join(self._lines)
+            self._lines = []
+            exec(compile(source, '<apizap-validator>', 'exec'), self._namespace)
+        return self._namespace[name]
+
+    def _constant(self, value: Any) -> str:
+        name = f"_c{next(self._counter)}"
+        self._namespace[name] = value
+        return name
+
+    def _function_for(self, schema: Any) -> str:
+        key = schema['$ref'] if isinstance(schema, dict) and '$ref' in schema else id(schema)
+        name = self._functions.get(key)
+        if name is None:
+            name = self._functions[key] = f"_v{next(self._counter)}"
+            self._schemas.append(schema)
+            # Имя регистрируется до генерации тела, поэтому рекурсивные ссылки работают
+            self._emit(name, self.resolver.resolve(schema))
+        return name
+
+    def _emit(self, name: str, schema: Any) -> None:
+        body: List[str] = []
+        if isinstance(schema, dict):
+            self._emit_body(schema, body)
+        self._lines.append(f"def {name}(data):")
+        self._lines.extend("    " + line for line in body)
+        self._lines.append("    return None")
+        self._lines.append("")
+
+    def _child(self, body: List[str], indent: str, schema: Any, value: str, prefix: str) -> None:
+        """Проверка вложенного значения с добавлением пути к ошибке."""
+        function = self._function_for(schema)
+        body.append(f"{indent}_e = {function}({value})")
+        body.append(f"{indent}if _e is not None:")
+        body.append(f"{indent}    return {prefix} + _e")
+
+    def _emit_body(self, schema: Dict[str, Any], body: List[str]) -> None:
+        types = schema.get('type')
+        if isinstance(types, str):
+            types = [types]
+        if schema.get('nullable') or (types and 'null' in types):
+            body.append("if data is None:")
+            body.append("    return None")
+        if types:
+            condition = ' or '.join(_TYPE_CHECKS.get(t, 'True') for t in types)
+            body.append(f"if not ({condition}):")
+            body.append(f"    return {': ожидался тип ' + '|'.join(types)!r}")
+
+        if 'enum' in schema:
+            body.append(f"if data not in {self._constant(list(schema['enum']))}:")
+            body.append("    return ': значение не входит в enum'")
+        if 'const' in schema:
+            body.append(f"if data != {self._constant(schema['const'])}:")
+            body.append("    return ': значение не равно const'")
+
+        self._emit_string(schema, body)
+        self._emit_number(schema, body)
+        self._emit_array(schema, body)
+        self._emit_object(schema, body)
+
+        for sub in schema.get('allOf') or ():
+            self._child(body, '', sub, 'data', "''")
+        for keyword, condition, message in (
+            ('anyOf', 'all(f(data) is not None for f in ({}))', 'не подходит ни одна схема anyOf'),
+            ('oneOf', 'sum(f(data) is None for f in ({})) != 1', 'должна подходить ровно одна схема oneOf'),
+        ):
+            subs = schema.get(keyword)
+            if subs:
+                functions = ', '.join(self._function_for(sub) for sub in subs) + ','
+                body.append(f"if {condition.format(functions)}:")
+                body.append(f"    return {': ' + message!r}")
+
+    def _emit_string(self, schema: Dict[str, Any], body: List[str]) -> None:
+        checks = []
+        if 'minLength' in schema:
+            checks.append((f"len(data) < {int(schema['minLength'])}", f"длина меньше {schema['minLength']}"))
+        if 'maxLength' in schema:
+            checks.append((f"len(data) > {int(schema['maxLength'])}", f"длина больше {schema['maxLength']}"))
+        if 'pattern' in schema:
+            pattern = self._constant(re.compile(schema['pattern']))
+            checks.append((f"{pattern}.search(data) is None", f"не соответствует шаблону {schema['pattern']}"))
+        self._emit_guarded('isinstance(data, str)', checks, body)
+
+    def _emit_number(self, schema: Dict[str, Any], body: List[str]) -> None:
+        checks = []
+        for keyword, exclusive, operator, word in (('minimum', 'exclusiveMinimum', '<', 'меньше'),
+                                                   ('maximum', 'exclusiveMaximum', '>', 'больше')):
+            bound = schema.get(keyword)
+            flag = schema.get(exclusive)
+            if isinstance(flag, (int, float)) and not isinstance(flag, bool):
+                # OpenAPI 3.1: exclusiveMinimum/exclusiveMaximum - число
+                checks.append((f"data {operator}= {flag!r}", f"значение {word} или равно {flag}"))
+            if bound is not None:
+                op = f"{operator}=" if flag is True else operator
+                checks.append((f"data {op} {bound!r}", f"значение {word} {bound}"))
+        if schema.get('multipleOf'):
+            quotient = f"data / {schema['multipleOf']!r}"
+            checks.append((f"abs({quotient} - round({quotient})) > 1e-9", f"значение не кратно {schema['multipleOf']}"))
+        self._emit_guarded(_NUMBER_GUARD, checks, body)
+
+    def _emit_array(self, schema: Dict[str, Any], body: List[str]) -> None:
+        checks = []
+        if 'minItems' in schema:
+            checks.append((f"len(data) < {int(schema['minItems'])}", f"элементов меньше {schema['minItems']}"))
+        if 'maxItems' in schema:
+            checks.append((f"len(data) > {int(schema['maxItems'])}", f"элементов больше {schema['maxItems']}"))
+        items = schema.get('items')
+        if not checks and not isinstance(items, dict):
+            return
+        body.append("if isinstance(data, list):")
+        for condition, message in checks:
+            body.append(f"    if {condition}:")
+            body.append(f"        return {': ' + message!r}")
+        if isinstance(items, dict) and items:
+            function = self._function_for(items)
+            body.append("    for _i, _item in enumerate(data):")
+            body.append(f"        _e = {function}(_item)")
+            body.append("        if _e is not None:")
+            body.append("            return f'/{_i}' + _e")
+
+    def _emit_object(self, schema: Dict[str, Any], body: List[str]) -> None:
+        required = schema.get('required') or []
+        properties = schema.get('properties') or {}
+        additional = schema.get('additionalProperties', True)
+        if not (required or properties or additional is not True):
+            return
+
+        body.append("if isinstance(data, dict):")
+        for name in required:
+            body.append(f"    if {name!r} not in data:")
+            body.append(f"        return {': отсутствует обязательное поле ' + repr(name)!r}")
+        for name, prop_schema in properties.items():
+            body.append(f"    _p = data.get({name!r}, _MISSING)")
+            body.append("    if _p is not _MISSING:")
+            self._child(body, '        ', prop_schema, '_p', repr(_pointer_token(name)))
+
+        if additional is not True:
+            known = self._constant(frozenset(properties))
+            body.append("    for _k, _p in data.items():")
+            body.append(f"        if _k in {known}:")
+            body.append("            continue")
+            if additional is False:
+                body.append("        return f'/{_k}: недопустимое поле'")
+            elif isinstance(additional, dict):
+                self._child(body, '        ', additional, '_p', "f'/{_k}'")
+
+    @staticmethod
+    def _emit_guarded(guard: str, checks: List[Tuple[str, str]], body: List[str]) -> None:
+        if not checks:
+            return
+        body.append(f"if {guard}:")
+        for condition, message in checks:
+            body.append(f"    if {condition}:")
+            body.append(f"        return {': ' + message!r}")
+
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """Декодирует элементы JSON массива по одному.
+
+    Raises:
+        ValueError: Если текст не является JSON массивом
+    """
+    decoder = json.JSONDecoder()
+    whitespace = ' \t\n\r'
+    length = len(text)
+    position = 0
+    while position < length and text[position] in whitespace:
+        position += 1
+    if position >= length or text[position] != '[':
+        raise ValueError("Ожидался JSON массив")
+    position += 1
+
+    expect_item = True
+    while True:
+        while position < length and text[position] in whitespace:
+            position += 1
+        if position >= length:
+            raise ValueError("Незавершенный JSON массив")
+        char = text[position]
+        if char == ']':
+            return
+        if char == ',' and not expect_item:
+            position += 1
+            expect_item = True
+            continue
+        if not expect_item:
+            raise ValueError(f"Ожидалась ',' в позиции {position}")
+        item, position = decoder.raw_decode(text, position)
+        expect_item = False
+        yield item
+
+
+class CompiledResponseSchema:
+    """Скомпилированная схема ответа."""
+
+    __slots__ = ('validate', 'item_validate', 'min_items', 'max_items')
+
+    def __init__(self, compiler: SchemaCompiler, schema: Dict[str, Any]):
+        self.validate = compiler.compile(schema)
+        resolved = compiler.resolver.resolve(schema)
+        items = resolved.get('items') if isinstance(resolved, dict) else None
+        if isinstance(items, dict) and items and not any(
+                keyword in resolved for keyword in ('allOf', 'anyOf', 'oneOf', 'enum', 'const')):
+            self.item_validate = compiler.compile(items)
+            self.min_items = resolved.get('minItems')
+            self.max_items = resolved.get('maxItems')
+        else:
+            self.item_validate = None
+            self.min_items = self.max_items = None
+
+    def check(self, body: Union[bytes, str], stream_threshold: Optional[int] = None) -> Optional[str]:
+        """Проверяет тело ответа.
+
+        Args:
+            body: Тело ответа
+            stream_threshold: Размер тела в байтах, начиная с которого массивы
+                проверяются потоково (None - никогда)
+
+        Returns:
+            Описание ошибки с JSON Pointer ('#/0/id: ...') или None
+        """
+        try:
+            if self.item_validate is not None and stream_threshold is not None and len(body) >= stream_threshold:
+                return self._check_stream(body)
+            error = self.validate(json.loads(body))
+        except ValueError:
+            return "#: тело ответа не является корректным JSON"
+        return None if error is None else '#' + error
+
+    def _check_stream(self, body: Union[bytes, str]) -> Optional[str]:
+        text = body.decode('utf-8') if isinstance(body, bytes) else body
+        count = 0
+        for count, item in enumerate(iter_json_array(text), 1):
+            error = self.item_validate(item)
+            if error is not None:
+                return f"#/{count - 1}{error}"
+        if self.min_items is not None and count < self.min_items:
+            return f"#: элементов меньше {self.min_items}"
+        if self.max_items is not None and count > self.max_items:
+            return f"#: элементов больше {self.max_items}"
+        return None
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def _is_json(media_type: str) -> bool:
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+class ResponseValidator:
+    """Проверка ответов по схемам операций с кэшем скомпилированных функций."""
+
+    def __init__(
+        self,
+        resolver: Optional[SchemaResolver] = None,
+        sample_every: int = 1,
+        stream_threshold: Optional[int] = 1024 * 1024
+    ):
+        """Инициализация.
+
+        Args:
+            resolver: Резолвер $ref спецификации (SchemaResolver.from_spec)
+            sample_every: Проверять каждый N-й ответ
+            stream_threshold: Размер тела в байтах, начиная с которого массивы
+                проверяются потоково (None - никогда)
+        """
+        self.compiler = SchemaCompiler(resolver)
+        self.sample_every = max(1, sample_every)
+        self.stream_threshold = stream_threshold
+        self._cache: Dict[Tuple[str, str, str], Optional[CompiledResponseSchema]] = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    @staticmethod
+    def schema_for(operation: Any, status_code: int, media_type: str) -> Optional[Dict[str, Any]]:
+        """Находит схему ответа: точный статус, диапазон (2XX), затем default."""
+        responses = getattr(operation, 'responses', None) or {}
+        status = str(status_code)
+        response = (responses.get(status) or responses.get(status[0] + 'XX')
+                    or responses.get(status[0] + 'xx') or responses.get('default'))
+        if response is None:
+            return None
+
+        if response.content:
+            for candidate in (media_type, 'application/json', media_type.split('/')[0] + '/*', '*/*'):
+                media = response.content.get(candidate)
+                if isinstance(media, dict) and media.get('schema'):
+                    return media['schema']
+            return None
+        return response.schema_
+
+    def compiled(self, operation_id: str, operation: Any, status_code: int,
+                 media_type: str) -> Optional[CompiledResponseSchema]:
+        """Скомпилированная схема ответа (компилируется один раз на ключ)."""
+        key = (operation_id, str(status_code), media_type)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if key not in self._cache:
+                schema = self.schema_for(operation, status_code, media_type)
+                compiled = None
+                if schema:
+                    try:
+                        compiled = CompiledResponseSchema(self.compiler, schema)
+                    except (KeyError, TypeError, ValueError, re.error) as e:
+                        logger.debug(f"Схема ответа {operation_id} {status_code} не скомпилирована: {e}")
+                self._cache[key] = compiled
+            return self._cache[key]
+
+    def validate_response(
+        self,
+        operation_id: str,
+        operation: Any,
+        status_code: int,
+        content_type: str,
+        body: Union[bytes, str]
+    ) -> Optional[str]:
+        """Проверяет ответ операции.
+
+        Returns:
+            Описание нарушения схемы или None (в том числе, если ответ не попал в выборку)
+        """
+        if self.sample_every > 1 and next(self._counter) % self.sample_every:
+            return None
+        media_type = _media_type(content_type)
+        if not _is_json(media_type):
+            return None
+        compiled = self.compiled(operation_id, operation, status_code, media_type)
+        if compiled is None:
+            return None
+        return compiled.check(body, self.stream_threshold)
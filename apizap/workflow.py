@@ -0,0 +1,383 @@
+"""Stateful workflow: связывание операций и выполнение графа зависимостей.
+
+Без связей операции с параметрами пути получают примерные значения ('1',
+'test_value'), и большинство запросов вида GET /things/{id} заканчиваются
+404. План workflow связывает операции-производители с потребителями:
+
+* явные OpenAPI links в ответах операций (runtime expressions
+  `$response.body#/...`, `$response.header.X`, `$request.path.x`);
+* эвристика коллекций: POST /things создает ресурс, идентификатор которого
+  подставляется в параметр пути {thingId} у /things/{thingId} и вложенных
+  путей.
+
+DELETE ресурса, созданного в прогоне, считается очисткой: такие шаги
+выполняются после всех остальных, в порядке, обратном созданию (сначала
+вложенные ресурсы). Операции, зависящие от шагов очистки (например, по
+links в ответе DELETE), не выполняются и попадают в лог как пропущенные.
+Независимые ветви графа выполняются параллельно.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .engines import ThreadLocalTesters
+from .log import RequestLogger
+from .selection import split_path
+
+
+_MISSING = object()
+
+
+def resolve_pointer(document: Any, pointer: str) -> Any:
+    """Возвращает значение по JSON Pointer (RFC 6901) или _MISSING."""
+    if pointer in ('', '/'):
+        return document
+    for token in pointer.lstrip('/').split('/'):
+        token = token.replace('~1', '/').replace('~0', '~')
+        if isinstance(document, dict) and token in document:
+            document = document[token]
+        elif isinstance(document, list) and token.isdigit() and int(token) < len(document):
+            document = document[int(token)]
+        else:
+            return _MISSING
+    return document
+
+
+def evaluate_expression(expression: str, exchange: Dict[str, Any]) -> Any:
+    """Вычисляет runtime expression OpenAPI по запросу и ответу операции.
+
+    Args:
+        expression: Выражение вида $response.body#/id, $response.header.Location,
+            $request.path.petId или $request.query.limit
+        exchange: Запрос и ответ из result['exchange']
+
+    Returns:
+        Значение или _MISSING, если его нет
+    """
+    if expression.startswith('$response.body'):
+        body = exchange.get('body')
+        if body is None:
+            return _MISSING
+        _, _, pointer = expression.partition('#')
+        return resolve_pointer(body, pointer)
+
+    if expression.startswith('$response.header.'):
+        value = (exchange.get('headers') or {}).get(expression[len('$response.header.'):])
+        if value is None:
+            return _MISSING
+        if expression.lower() == '$response.header.location':
+            # Идентификатор созданного ресурса - последний сегмент Location
+            return value.rstrip('/').rsplit('/', 1)[-1]
+        return value
+
+    for source in ('path', 'query'):
+        prefix = f'$request.{source}.'
+        if expression.startswith(prefix):
+            return (exchange.get(source) or {}).get(expression[len(prefix):], _MISSING)
+
+    return _MISSING
+
+
+class Binding:
+    """Связь параметра потребителя с ответом операции-производителя."""
+
+    __slots__ = ('producer', 'expressions')
+
+    def __init__(self, producer: int, expressions: Tuple[str, ...]):
+        self.producer = producer
+        self.expressions = expressions
+
+    def resolve(self, exchange: Optional[Dict[str, Any]]) -> Any:
+        """Первое вычислимое выражение или _MISSING."""
+        if exchange:
+            for expression in self.expressions:
+                value = evaluate_expression(expression, exchange)
+                if value is not _MISSING and not isinstance(value, (dict, list)):
+                    return value
+        return _MISSING
+
+
+class WorkflowStep:
+    """Операция в плане workflow."""
+
+    __slots__ = ('index', 'operation', 'bindings', 'teardown', 'depth')
+
+    def __init__(self, index: int, operation: Dict[str, Any]):
+        self.index = index
+        self.operation = operation
+        self.bindings: Dict[str, Binding] = {}
+        self.teardown = False
+        self.depth = 0
+
+    @property
+    def dependencies(self) -> Set[int]:
+        return {binding.producer for binding in self.bindings.values()}
+
+
+def _path_parameter(segment: str) -> Optional[str]:
+    if segment.startswith('{') and segment.endswith('}'):
+        return segment[1:-1]
+    return None
+
+
+def _id_expressions(param_name: str) -> Tuple[str, ...]:
+    return (
+        f'$response.body#/{param_name}',
+        '$response.body#/id',
+        '$response.body#/data/id',
+        '$response.header.Location',
+    )
+
+
+class WorkflowPlan:
+    """Граф зависимостей между операциями."""
+
+    def __init__(self, operations: List[Dict[str, Any]]):
+        """Строит план по операциям из OpenAPIParser.get_all_operations.
+
+        Args:
+            operations: Операции (порядок определяет порядок результатов)
+        """
+        self.steps = [WorkflowStep(index, operation) for index, operation in enumerate(operations)]
+        # Шаги основного этапа, которые зависят от шагов очистки и не выполняются
+        self.blocked: Set[int] = set()
+        self._link_explicit()
+        self._link_collections()
+        self._mark_teardown()
+        self._mark_blocked()
+        self._compute_depth()
+
+    @property
+    def link_count(self) -> int:
+        return sum(len(step.bindings) for step in self.steps)
+
+    @property
+    def teardown_steps(self) -> List[WorkflowStep]:
+        """Шаги очистки: сначала самые глубокие ресурсы."""
+        return sorted((step for step in self.steps if step.teardown), key=lambda step: -step.depth)
+
+    def dependents(self) -> Dict[int, List[int]]:
+        """Отображение производитель -> потребители основного этапа."""
+        graph: Dict[int, List[int]] = {}
+        for step in self.steps:
+            if not step.teardown and step.index not in self.blocked:
+                for producer in step.dependencies:
+                    graph.setdefault(producer, []).append(step.index)
+        return graph
+
+    def _reaches(self, start: int, target: int) -> bool:
+        """True, если target зависит (транзитивно) от start."""
+        stack, seen = [target], set()
+        while stack:
+            index = stack.pop()
+            if index == start:
+                return True
+            if index not in seen:
+                seen.add(index)
+                stack.extend(self.steps[index].dependencies)
+        return False
+
+    def _bind(self, consumer: WorkflowStep, param: str, producer: int, expressions: Tuple[str, ...]) -> None:
+        if param in consumer.bindings or producer == consumer.index:
+            return
+        if self._reaches(consumer.index, producer):
+            return  # связь образовала бы цикл
+        consumer.bindings[param] = Binding(producer, expressions)
+
+    def _link_explicit(self) -> None:
+        """Связи из OpenAPI links в успешных ответах."""
+        by_id = {step.operation['operation_id']: step for step in self.steps}
+        by_ref = {
+            '#/paths/' + step.operation['path'].replace('~', '~0').replace('/', '~1')
+            + '/' + step.operation['method'].lower(): step
+            for step in self.steps
+        }
+
+        for source in self.steps:
+            responses = getattr(source.operation['operation'], 'responses', None) or {}
+            for status, response in responses.items():
+                if not str(status).startswith('2') or not getattr(response, 'links', None):
+                    continue
+                for link in response.links.values():
+                    if not isinstance(link, dict):
+                        continue
+                    target = by_id.get(link.get('operationId')) or by_ref.get(link.get('operationRef', ''))
+                    if target is None:
+                        continue
+                    for name, expression in (link.get('parameters') or {}).items():
+                        if isinstance(expression, str) and expression.startswith('$'):
+                            # Имя может быть квалифицировано расположением: path.petId
+                            param = name.split('.', 1)[-1]
+                            self._bind(target, param, source.index, (expression,))
+
+    def _link_collections(self) -> None:
+        """Связи POST коллекции с параметрами пути ее элементов."""
+        producers = {}
+        for step in self.steps:
+            segments = split_path(step.operation['path'])
+            if step.operation['method'] == 'POST' and segments and _path_parameter(segments[-1]) is None:
+                producers.setdefault('/'.join(segments), step.index)
+
+        for step in self.steps:
+            segments = split_path(step.operation['path'])
+            for position, segment in enumerate(segments):
+                param = _path_parameter(segment)
+                if param is None:
+                    continue
+                producer = producers.get('/'.join(segments[:position]))
+                if producer is not None:
+                    self._bind(step, param, producer, _id_expressions(param))
+
+    def _mark_teardown(self) -> None:
+        """DELETE созданного в прогоне ресурса выполняется на этапе очистки."""
+        for step in self.steps:
+            segments = split_path(step.operation['path'])
+            if step.operation['method'] == 'DELETE' and segments:
+                param = _path_parameter(segments[-1])
+                step.teardown = param is not None and param in step.bindings
+
+    def _mark_blocked(self) -> None:
+        """Отмечает шаги, которые (транзитивно) зависят от шагов очистки."""
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps:
+                if step.teardown or step.index in self.blocked:
+                    continue
+                if any(self.steps[p].teardown or p in self.blocked for p in step.dependencies):
+                    self.blocked.add(step.index)
+                    changed = True
+
+    def _compute_depth(self) -> None:
+        remaining = {step.index for step in self.steps}
+        while remaining:
+            progressed = False
+            for index in sorted(remaining):
+                step = self.steps[index]
+                if not step.dependencies & remaining:
+                    step.depth = 1 + max((self.steps[p].depth for p in step.dependencies), default=-1)
+                    remaining.discard(index)
+                    progressed = True
+            if not progressed:  # pragma: no cover - связи без циклов гарантирует _bind
+                break
+
+
+class WorkflowRunner:
+    """Выполняет план workflow с максимальным параллелизмом."""
+
+    def __init__(
+        self,
+        tester_factory: Callable[[], Any],
+        base_url: str,
+        workers: int = 4,
+        fail_fast: Optional[int] = None,
+        log_sample_every: int = 1,
+        progress_interval: Optional[float] = None
+    ):
+        """Инициализация исполнителя.
+
+        Args:
+            tester_factory: Фабрика тестеров (apizap.tester.APITester)
+            base_url: Базовый URL API
+            workers: Количество параллельных исполнителей
+            fail_fast: Не запускать новые шаги основного этапа после указанного числа FAIL
+                (очистка выполняется всегда)
+            log_sample_every: Логировать строку по каждому N-му запросу (FAIL - всегда)
+            progress_interval: Период строки прогресса в секундах (None - выключена)
+        """
+        self.testers = ThreadLocalTesters(tester_factory)
+        self.base_url = base_url
+        self.workers = max(1, workers)
+        self.fail_fast = fail_fast
+        self.log_sample_every = log_sample_every
+        self.progress_interval = progress_interval
+
+    def run(self, plan: WorkflowPlan) -> List[Dict[str, Any]]:
+        """Выполняет план.
+
+        Returns:
+            Результаты выполненных шагов в порядке операций плана
+        """
+        steps = plan.steps
+        dependents = plan.dependents()
+        produces = set(dependents) | {p for step in plan.teardown_steps for p in step.dependencies}
+        request_log = RequestLogger(len(steps), self.log_sample_every, self.progress_interval)
+        results: Dict[int, Dict[str, Any]] = {}
+        exchanges: Dict[int, Dict[str, Any]] = {}
+        lock = threading.Lock()
+        counter = {'started': 0, 'failed': 0}
+
+        def run_step(step: WorkflowStep) -> Dict[str, Any]:
+            overrides = {}
+            for param, binding in step.bindings.items():
+                value = binding.resolve(exchanges.get(binding.producer))
+                if value is not _MISSING:
+                    overrides[param] = value
+            with lock:
+                counter['started'] += 1
+                request_log.before(counter['started'], step.operation)
+
+            tester = self.testers.get()
+            result = tester.test_operation(self.base_url, step.operation, overrides or None,
+                                           capture_exchange=step.index in produces)
+            exchange = result.pop('exchange', None)
+            if exchange is not None:
+                exchanges[step.index] = exchange
+            with lock:
+                request_log.after(result)
+            if tester.request_delay:
+                time.sleep(tester.request_delay)
+            return result
+
+        logger.info(f"Начинаем workflow: {len(steps)} операций, связей: {plan.link_count}, "
+                    f"шагов очистки: {len(plan.teardown_steps)}")
+        if plan.blocked:
+            names = ', '.join(steps[index].operation['operation_id'] for index in sorted(plan.blocked))
+            logger.warning(f"Пропущены операции, зависящие от шагов очистки: {names}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Основной этап: шаг запускается, как только выполнены его производители
+            waiting = {step.index: len(step.dependencies) for step in steps
+                       if not step.teardown and step.index not in plan.blocked}
+            ready = [index for index, count in waiting.items() if count == 0]
+            running = {}
+            stopped = False
+            while ready or running:
+                if not stopped:
+                    for index in ready:
+                        running[executor.submit(run_step, steps[index])] = index
+                ready = []
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    result = results[index] = future.result()
+                    if result['status'] == 'FAIL':
+                        counter['failed'] += 1
+                        if self.fail_fast and counter['failed'] >= self.fail_fast and not stopped:
+                            stopped = True
+                            logger.warning("Достигнут порог --fail-fast ({} FAIL), "
+                                           "переходим к очистке", self.fail_fast)
+                    for consumer in dependents.get(index, ()):
+                        waiting[consumer] -= 1
+                        if waiting[consumer] == 0:
+                            ready.append(consumer)
+
+            # Очистка: уровни в обратном порядке создания, внутри уровня - параллельно
+            teardown = [step for step in plan.teardown_steps if step.dependencies <= set(results)]
+            for depth in sorted({step.depth for step in teardown}, reverse=True):
+                level = [step for step in teardown if step.depth == depth]
+                for step, result in zip(level, executor.map(run_step, level)):
+                    results[step.index] = result
+
+        skipped = len(steps) - len(results) - len(plan.blocked)
+        if skipped:
+            logger.warning(f"Пропущено операций после остановки: {skipped}")
+        logger.info(f"Workflow завершен. Обработано операций: {len(results)}")
+        return [results[index] for index in sorted(results)]
+
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Бенчмарк времени запуска CLI APIZap.
+
+Запускает ``python -X importtime -c "import apizap.cli"`` несколько раз,
+выводит медианное кумулятивное время импорта и самые тяжелые модули, а
+также время выполнения ``apizap --version``. Завершается с кодом 1, если
+превышен бюджет или при импорте CLI загружены тяжелые зависимости.
+
+Примеры:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 60 --output import_time.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые не должны загружаться при импорте apizap.cli
+FORBIDDEN_MODULES = ('requests', 'pydantic', 'loguru', 'urllib3')
+
+
+def measure_importtime(module: str) -> Dict[str, Tuple[int, int]]:
+    """Возвращает {модуль: (собственное время, кумулятивное время)} в микросекундах."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(ROOT), capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_version_wall() -> float:
+    """Возвращает время выполнения `python -m apizap.cli --version` в миллисекундах."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-m', 'apizap.cli', '--version'],
+        cwd=str(ROOT), capture_output=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Количество запусков')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Бюджет кумулятивного времени импорта apizap.cli')
+    parser.add_argument('--top', type=int, default=10, help='Сколько самых тяжелых модулей показать')
+    parser.add_argument('--output', help='Файл для сохранения результатов в JSON')
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [measure_importtime('apizap.cli') for _ in range(args.runs)]
+    cli_ms = statistics.median(run['apizap.cli'][1] for run in runs) / 1000
+    version_ms = statistics.median(measure_version_wall() for _ in range(args.runs))
+
+    last = runs[-1]
+    heaviest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    forbidden = sorted(name for name in last if name.split('.')[0] in FORBIDDEN_MODULES)
+
+    print(f"import apizap.cli (медиана кумулятивного времени): {cli_ms:.1f}ms")
+    print(f"apizap --version (медиана времени процесса): {version_ms:.1f}ms")
+    print("Самые тяжелые модули (собственное время):")
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"  {self_us / 1000:8.2f}ms  {cumulative_us / 1000:8.2f}ms  {name}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            'import_apizap_cli_ms': round(cli_ms, 2),
+            'version_wall_ms': round(version_ms, 2),
+            'heaviest_modules': {name: self_us for name, (self_us, _) in heaviest},
+            'forbidden_modules': forbidden,
+        }, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    failed = False
+    if forbidden:
+        print(f"❌ При импорте CLI загружены тяжелые модули: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None and cli_ms > args.budget_ms:
+        print(f"❌ Превышен бюджет времени импорта: {cli_ms:.1f}ms > {args.budget_ms:.1f}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Бенчмарк накладных расходов логирования на один запрос.
+
+Прогоняет код логирования горячего пути без сетевых запросов и выводит
+стоимость в наносекундах на запрос для нескольких режимов:
+
+* eager-debug-off - прежняя f-строка DEBUG при выключенном DEBUG;
+* lazy-debug-off  - ленивое форматирование DEBUG при выключенном DEBUG;
+* full            - строка INFO на каждый запрос, синхронная запись;
+* hot             - выборочные строки (каждая 100-я), прогресс раз в 5 с, запись через очередь.
+
+Пример:
+
+    python benchmarks/logging_overhead.py --requests 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+from apizap.log import RequestLogger
+from apizap.results import TestResult
+
+
+OPERATION_INFO = {'method': 'GET', 'path': '/users/{id}'}
+
+
+def make_result() -> TestResult:
+    result = TestResult(operation_id='getUser', method='GET', path='/users/{id}')
+    result.update({'status': 'PASS', 'status_code': 200, 'response_time': 12.34})
+    return result
+
+
+def bench_eager_debug(requests_count: int, result: TestResult) -> float:
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        logger.debug(f"  -> {result['status']} ({result['status_code']}) {result['response_time']}ms")
+    return time.perf_counter() - start
+
+
+def bench_lazy_debug(requests_count: int, result: TestResult) -> float:
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        logger.debug("  -> {} ({}) {}ms", result.status, result.status_code, result.response_time)
+    return time.perf_counter() - start
+
+
+def bench_request_logger(requests_count: int, result: TestResult, **kwargs) -> float:
+    request_log = RequestLogger(requests_count, **kwargs)
+    start = time.perf_counter()
+    for i in range(1, requests_count + 1):
+        request_log.before(i, OPERATION_INFO)
+        request_log.after(result)
+    logger.complete()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000, help='Количество запросов')
+    args = parser.parse_args()
+
+    result = make_result()
+    sink = open(os.devnull, 'w')
+    timings = {}
+
+    logger.remove()
+    logger.add(sink, level="INFO")
+    timings['eager-debug-off'] = bench_eager_debug(args.requests, result)
+    timings['lazy-debug-off'] = bench_lazy_debug(args.requests, result)
+    timings['full'] = bench_request_logger(args.requests, result)
+
+    logger.remove()
+    logger.add(sink, level="INFO", enqueue=True)
+    timings['hot'] = bench_request_logger(
+        args.requests, result, sample_every=100, progress_interval=5.0
+    )
+    logger.remove()
+    sink.close()
+
+    print(f"Запросов: {args.requests}")
+    for mode, seconds in timings.items():
+        print(f"  {mode:<16}{seconds / args.requests * 1e9:>10.0f} нс/запрос")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -31,6 +31,10 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        "columnar": ["numpy>=1.17"],
+        "parquet": ["numpy>=1.17", "pyarrow>=8.0.0"],
+    },
     python_requires=">=3.7",
     entry_points={
         "console_scripts": [
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Тесты для кассет HTTP обменов."""
+
+import pytest
+from requests import Request
+
+from apizap.cassette import Cassette, request_key
+from apizap.selftest import NULL_PATH, NullServer
+from apizap.tester import APITester
+
+
+OPERATION = {'method': 'GET', 'path': NULL_PATH, 'parameters': [], 'operation': None,
+             'operation_id': 'null', 'summary': 'null', 'tags': ['default']}
+
+
+class TestRequestKey:
+    """Тесты ключа запроса."""
+
+    def test_normalized(self):
+        """Тест: порядок query-параметров не важен, тело входит в ключ."""
+        first = Request('GET', 'http://api.test/items?b=2&a=1').prepare()
+        second = Request('GET', 'http://api.test/items', params={'a': '1', 'b': '2'}).prepare()
+        post = Request('POST', 'http://api.test/items', json={'name': 'x'}).prepare()
+
+        assert request_key(first) == request_key(second) == 'GET http://api.test/items?a=1&b=2'
+        assert request_key(post).startswith('POST http://api.test/items #')
+        assert request_key(post) != request_key(Request('POST', 'http://api.test/items', json={}).prepare())
+
+
+class TestCassette:
+    """Тесты записи и воспроизведения."""
+
+    def test_record_and_replay(self, tmp_path):
+        """Тест: ответы записываются через APITester и воспроизводятся без сервера."""
+        path = str(tmp_path / 'run.cassette')
+        with NullServer() as server:
+            base_url = server.base_url
+            with Cassette(path, mode='record') as cassette:
+                tester = APITester(cassette=cassette)
+                recorded = [tester.test_operation(base_url, OPERATION) for _ in range(3)]
+        assert [result['status'] for result in recorded] == ['PASS'] * 3
+
+        with Cassette(path, latency='zero') as cassette:
+            assert len(cassette) == 3
+            tester = APITester(cassette=cassette)
+            replayed = [tester.test_operation(base_url, OPERATION) for _ in range(4)]
+            missing = tester.test_operation(base_url, dict(OPERATION, path='/other'))
+
+        assert [result['status_code'] for result in replayed] == [200] * 4
+        assert missing['status'] == 'FAIL' and 'кассете' in missing['error']
+        assert cassette.misses == 1
+
+    def test_index_rebuilt_after_interrupted_recording(self, tmp_path):
+        """Тест: без индекса в конце файла кассета читается построчно."""
+        path = tmp_path / 'run.cassette'
+        with NullServer() as server:
+            with Cassette(str(path), mode='record') as cassette:
+                APITester(cassette=cassette).test_operation(server.base_url, OPERATION)
+        lines = path.read_bytes().splitlines(keepends=True)
+        path.write_bytes(lines[0])
+
+        with Cassette(str(path)) as cassette:
+            assert len(cassette) == 1
+
+    def test_truncated_last_line(self, tmp_path):
+        """Тест: оборванная при записи последняя строка пропускается."""
+        path = tmp_path / 'run.cassette'
+        with NullServer() as server:
+            with Cassette(str(path), mode='record') as cassette:
+                APITester(cassette=cassette).test_operation(server.base_url, OPERATION)
+        lines = path.read_bytes().splitlines(keepends=True)
+        path.write_bytes(lines[0] + lines[0][:len(lines[0]) // 2])
+
+        with Cassette(str(path)) as cassette:
+            assert len(cassette) == 1
+
+    def test_not_a_cassette(self, tmp_path):
+        """Тест: посторонний файл не принимается за кассету."""
+        path = tmp_path / 'notes.txt'
+        path.write_text('hello\n')
+        with pytest.raises(ValueError):
+            Cassette(str(path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Тесты для контрольных точек прогона."""
+
+import pytest
+
+from apizap.checkpoint import Checkpoint, checkpoint_key, load_checkpoint, split_completed
+from apizap.results import TestResult
+
+
+OPERATIONS = [
+    {'operation_id': 'listItems', 'method': 'GET', 'path': '/items', 'summary': 'List'},
+    {'operation_id': 'getItem', 'method': 'GET', 'path': '/items/{id}', 'summary': 'Get [id=1]'},
+    {'operation_id': 'getItem', 'method': 'GET', 'path': '/items/{id}', 'summary': 'Get [id=2]'},
+]
+
+
+def make_result(operation_info, status='PASS'):
+    result = TestResult(operation_info['operation_id'], operation_info['method'], operation_info['path'],
+                        summary=operation_info['summary'], status=status, status_code=200, response_time=12.5)
+    result['tags'] = ['items']
+    result['variant'] = 'A'
+    return result
+
+
+class TestCheckpoint:
+    """Тесты записи и продолжения прогона."""
+
+    def test_resume(self, tmp_path):
+        """Тест: выполненные операции пропускаются, их результаты восстанавливаются."""
+        path = str(tmp_path / 'run.checkpoint')
+        first, third = make_result(OPERATIONS[0]), make_result(OPERATIONS[2], status='FAIL')
+        checkpoint = Checkpoint(path, flush_every=1000, flush_interval=60)
+        checkpoint(first)
+        checkpoint(third)
+        checkpoint.close()
+
+        remaining, previous = split_completed(OPERATIONS, load_checkpoint(path))
+
+        assert remaining == [OPERATIONS[1]]
+        assert [result.to_dict() for result in previous] == [first.to_dict(), third.to_dict()]
+
+        checkpoint = Checkpoint(path, resume=True)
+        checkpoint(make_result(OPERATIONS[1]))
+        checkpoint.close()
+        assert len(load_checkpoint(path)) == 3
+
+    def test_truncated_line(self, tmp_path):
+        """Тест: оборванная при падении последняя строка пропускается и не мешает продолжению."""
+        path = tmp_path / 'run.checkpoint'
+        checkpoint = Checkpoint(str(path))
+        checkpoint(make_result(OPERATIONS[0]))
+        checkpoint.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"key": "getItem Get [id=1]", "result": {"meth')
+
+        assert list(load_checkpoint(str(path))) == [checkpoint_key(OPERATIONS[0])]
+
+        checkpoint = Checkpoint(str(path), resume=True)
+        checkpoint(make_result(OPERATIONS[1]))
+        checkpoint.close()
+        assert list(load_checkpoint(str(path))) == [checkpoint_key(info) for info in OPERATIONS[:2]]
+
+    def test_missing_file(self, tmp_path):
+        """Тест: без файла продолжать нечего."""
+        assert load_checkpoint(str(tmp_path / 'absent')) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Тесты быстрого запуска CLI."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+class TestCliStartup:
+    """Тесты ленивой загрузки тяжелых модулей в apizap.cli."""
+    
+    def test_import_does_not_load_heavy_modules(self):
+        """Импорт CLI не загружает requests, pydantic и loguru."""
+        code = (
+            "import sys, apizap.cli; "
+            "print(','.join(m for m in ('requests', 'pydantic', 'loguru') if m in sys.modules))"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True
+        )
+        assert completed.stdout.strip() == ''
+    
+    def test_version(self):
+        """Тест быстрого пути --version."""
+        completed = subprocess.run(
+            [sys.executable, '-m', 'apizap.cli', '--version'],
+            capture_output=True, text=True, check=True
+        )
+        assert 'APIZap, version 1.0.0' in completed.stdout
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Тесты для колоночного хранения результатов."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from apizap.columnar import ResultColumns
+from apizap.results import TestResult
+
+
+def make_results():
+    """Создает набор результатов с разными исходами."""
+    rows = [
+        ('getUsers', 'GET', '/users', 'PASS', 200, 100.0),
+        ('createUser', 'POST', '/users', 'WARN', 422, 50.0),
+        ('getUsers', 'GET', '/users', 'PASS', 200, 300.0),
+        ('deleteUser', 'DELETE', '/users/{id}', 'FAIL', None, None),
+    ]
+    results = []
+    for operation_id, method, path, status, code, response_time in rows:
+        result = TestResult(operation_id=operation_id, method=method, path=path, created_at=1700000000.0)
+        result.update({'status': status, 'status_code': code, 'response_time': response_time})
+        results.append(result)
+    return results
+
+
+class TestResultColumns:
+    """Тесты для класса ResultColumns."""
+    
+    def test_dictionary_encoding(self):
+        """Тест словарного кодирования строковых колонок."""
+        columns = ResultColumns.from_results(make_results())
+        
+        assert columns.dictionaries['operation_id'] == ['getUsers', 'createUser', 'deleteUser']
+        assert columns.codes['operation_id'].tolist() == [0, 1, 0, 2]
+        assert columns.decode('method') == ['GET', 'POST', 'GET', 'DELETE']
+        assert columns.status_code.dtype == np.int16
+    
+    def test_vectorized_stats(self):
+        """Тест векторизованной статистики."""
+        columns = ResultColumns.from_results(make_results())
+        
+        summary = columns.summary()
+        assert summary['passed'] == 2 and summary['warnings'] == 1 and summary['failed'] == 1
+        assert summary['total_time_ms'] == 450.0
+        assert columns.status_code_distribution() == {'200': 2, '422': 1}
+        assert columns.response_time_stats((50,)) == {
+            'min_ms': 50.0, 'max_ms': 300.0, 'avg_ms': 150.0, 'p50_ms': 100.0
+        }
+    
+    def test_npz_roundtrip(self, tmp_path):
+        """Тест сохранения и загрузки .npz."""
+        columns = ResultColumns.from_results(make_results())
+        path = str(tmp_path / "results.npz")
+        columns.save(path)
+        
+        loaded = ResultColumns.load_npz(path)
+        assert loaded.decode('path') == columns.decode('path')
+        assert np.array_equal(loaded.response_time, columns.response_time, equal_nan=True)
+    
+    def test_parquet(self, tmp_path):
+        """Тест сохранения в Parquet."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "results.parquet")
+        ResultColumns.from_results(make_results()).save(path)
+        
+        table = pq.read_table(path)
+        assert table.num_rows == 4
+        assert table.column('operation_id').to_pylist()[1] == 'createUser'
+        assert table.column('status_code').to_pylist()[3] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Тесты для A/B сравнения."""
+
+import pytest
+
+from apizap.compare import ABComparison, bootstrap_median_delta, mann_whitney_p, run_ab
+
+
+class FakeTester:
+    """Тестер без сети: B медленнее A на 5 мс и отвечает другим статусом на /b."""
+
+    request_delay = 0
+    calls = []
+
+    def __init__(self):
+        self._count = 0
+
+    def test_operation(self, base_url, operation_info):
+        FakeTester.calls.append(base_url)
+        self._count += 1
+        slow = base_url == 'http://b'
+        return {
+            'method': 'GET',
+            'path': operation_info['path'],
+            'status': 'PASS',
+            'status_code': 500 if slow and operation_info['path'] == '/b' else 200,
+            'response_time': 10.0 + (5.0 if slow else 0.0) + self._count % 3,
+            'response_size': 100
+        }
+
+
+class TestStatistics:
+    """Тесты для статистических критериев."""
+
+    def test_mann_whitney(self):
+        """Тест p-значения для разнесенных, одинаковых и связанных выборок."""
+        assert mann_whitney_p(range(1, 11), range(11, 21)) < 0.001
+        assert mann_whitney_p([1, 2, 3, 4], [1, 2, 3, 4]) == pytest.approx(1.0)
+        assert mann_whitney_p([5] * 6, [5] * 6) == 1.0
+        assert 0.05 < mann_whitney_p([1, 3, 5, 7, 9], [2, 4, 6, 8, 10]) < 1.0
+
+    def test_bootstrap(self):
+        """Тест: интервал разницы медиан содержит истинный сдвиг."""
+        a = [10 + (i % 7) for i in range(40)]
+        b = [value + 5 for value in a]
+        low, high = bootstrap_median_delta(a, b, resamples=500)
+        assert low <= 5 <= high
+        assert low > 0
+
+
+class TestABComparison:
+    """Тесты для run_ab и ABComparison."""
+
+    @pytest.fixture
+    def results(self):
+        FakeTester.calls = []
+        operations = [{'method': 'GET', 'path': '/a'}, {'method': 'GET', 'path': '/b'}]
+        return run_ab(FakeTester, ('http://a', 'http://b'), operations, rounds=10)
+
+    def test_interleaving(self, results):
+        """Тест чередования порядка вариантов внутри раундов."""
+        assert len(results) == 40
+        assert FakeTester.calls[:6] == ['http://a', 'http://b', 'http://b', 'http://a', 'http://a', 'http://b']
+        assert [r['variant'] for r in results[:4]] == ['A', 'B', 'B', 'A']
+
+    def test_report(self, results):
+        """Тест значимой разницы задержек и расхождения статус-кодов."""
+        comparison = ABComparison.from_results(results)
+        data = comparison.to_dict()
+        first, second = data['operations']
+
+        assert first['significant'] and first['delta_ms'] == pytest.approx(5, abs=1)
+        assert not first['status_mismatch'] and second['status_mismatch']
+        assert second['status_codes'] == {'A': [200], 'B': [500]}
+        assert data['status_mismatches'] == 1 and data['size_mismatches'] == 0
+        assert any('Статус-коды различаются' in line for line in comparison.format_lines())
+
+    def test_without_variants(self):
+        """Тест: без поля variant сравнение не строится."""
+        assert ABComparison.from_results([{'method': 'GET', 'path': '/', 'status': 'PASS'}]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Тесты для комбинаторного покрытия параметров."""
+
+import itertools
+from unittest.mock import Mock
+
+import pytest
+
+from apizap.coverage import CoveragePlanner, covering_array
+from apizap.parser import Parameter
+from apizap.tester import OMIT_PARAMETER, APITester
+
+
+def is_covered(rows, levels, strength):
+    """Проверяет, что каждая комбинация уровней любых strength факторов встречается."""
+    for combo in itertools.combinations(range(len(levels)), strength):
+        seen = {tuple(row[f] for f in combo) for row in rows}
+        if len(seen) != len(list(itertools.product(*(range(levels[f]) for f in combo)))):
+            return False
+    return True
+
+
+def make_operation(parameters):
+    return {
+        'path': '/items',
+        'method': 'GET',
+        'summary': 'GET /items',
+        'operation_id': 'listItems',
+        'parameters': parameters,
+        'request_body': None,
+        'operation': None,
+        'responses': {},
+        'tags': []
+    }
+
+
+class TestCoveringArray:
+    """Тесты для построения покрывающего массива."""
+
+    @pytest.mark.parametrize('levels, strength, bound', [
+        ([2] * 10, 2, 12),
+        ([3] * 13, 2, 24),
+        ([5, 4, 3, 2, 2, 2], 2, 25),
+        ([2] * 6, 3, 16),
+    ])
+    def test_full_coverage_with_few_rows(self, levels, strength, bound):
+        """Тест: все t-комбинации покрыты много меньшим числом строк, чем перебор."""
+        rows = covering_array(levels, strength)
+        assert is_covered(rows, levels, strength)
+        assert len(rows) <= bound
+
+    def test_deterministic_and_limited(self):
+        """Тест детерминированности по seed и ограничения числа строк."""
+        assert covering_array([3] * 6, seed=5) == covering_array([3] * 6, seed=5)
+        assert len(covering_array([3] * 6, max_rows=4)) == 4
+        assert covering_array([], 2) == [()]
+
+
+class TestCoveragePlanner:
+    """Тесты для CoveragePlanner."""
+
+    @pytest.fixture
+    def operation(self):
+        return make_operation([
+            Parameter(name='sort', **{'in': 'query'}, schema={'type': 'string', 'enum': ['asc', 'desc']}),
+            Parameter(name='limit', **{'in': 'query'}, schema={'type': 'integer', 'minimum': 1, 'maximum': 50}),
+            Parameter(name='full', **{'in': 'query'}, required=True, schema={'type': 'boolean'}),
+            Parameter(name='q', **{'in': 'query'}, required=True, schema={'type': 'string'}),
+        ])
+
+    def test_factors(self, operation):
+        """Тест уровней: enum, границы, boolean и отсутствие необязательного параметра."""
+        factors = dict(CoveragePlanner().factors(operation))
+
+        assert factors['sort'] == ['asc', 'desc', OMIT_PARAMETER]
+        assert factors['limit'][1:] == [1, 50, OMIT_PARAMETER]
+        assert factors['full'] == [True, False]
+        assert 'q' not in factors
+
+    def test_expand(self, operation):
+        """Тест разворачивания операции в тестовые случаи."""
+        planner = CoveragePlanner(max_cases=100)
+        cases = planner.expand([operation, make_operation([])])
+
+        assert cases[-1]['summary'] == 'GET /items'
+        cases = cases[:-1]
+        assert 12 <= len(cases) < 3 * 4 * 2
+        assert any(case['param_overrides'].get('sort') is OMIT_PARAMETER for case in cases)
+        assert {case['param_overrides']['full'] for case in cases} == {True, False}
+        assert cases[0]['summary'].startswith('GET /items [')
+
+    def test_overrides_applied(self, operation):
+        """Тест: отсутствующий параметр не отправляется, остальные подставляются."""
+        tester = APITester()
+        tester.session = Mock()
+        tester.session.request.return_value = Mock(
+            status_code=200, elapsed=Mock(total_seconds=Mock(return_value=0.01)),
+            headers={}, content=b'', text=''
+        )
+        operation['param_overrides'] = {'sort': OMIT_PARAMETER, 'full': False}
+
+        tester.test_operation('http://api.test', operation)
+        params = tester.session.request.call_args.kwargs['params']
+
+        assert 'sort' not in params
+        assert params['full'] is False
+        assert 'limit' in params and 'q' in params
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
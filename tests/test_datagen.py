@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Тесты для генератора тестовых данных."""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from apizap.datagen import DataGenerator
+from apizap.parser import RequestBody
+from apizap.schema import SchemaResolver
+from apizap.tester import APITester
+from apizap.validation import SchemaCompiler
+
+
+COMPONENTS = {
+    "schemas": {
+        "NewItem": {
+            "type": "object",
+            "required": ["name", "kind", "price", "tags", "owner"],
+            "properties": {
+                "name": {"type": "string", "minLength": 3, "maxLength": 6},
+                "kind": {"type": "string", "enum": ["a", "b", "c"]},
+                "price": {"type": "number", "minimum": 0, "exclusiveMinimum": True, "maximum": 10},
+                "count": {"type": "integer"},
+                "tags": {"type": "array", "items": {"type": "string", "format": "uuid"}, "minItems": 2},
+                "owner": {"$ref": "#/components/schemas/Owner"}
+            }
+        },
+        "Owner": {
+            "type": "object",
+            "required": ["email", "age"],
+            "properties": {
+                "email": {"type": "string", "format": "email"},
+                "age": {"type": "integer", "minimum": 18, "maximum": 20}
+            }
+        },
+        "Tree": {
+            "type": "object",
+            "required": ["children"],
+            "properties": {"children": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}}}
+        }
+    }
+}
+
+
+@pytest.fixture
+def resolver():
+    return SchemaResolver({'components': COMPONENTS})
+
+
+class TestDataGenerator:
+    """Тесты для DataGenerator."""
+
+    def test_values_respect_constraints(self, resolver):
+        """Тест: сгенерированные значения проходят проверку той же схемой."""
+        schema = {"$ref": "#/components/schemas/NewItem"}
+        validate = SchemaCompiler(resolver).compile(schema)
+        values = DataGenerator(resolver, seed=3).batch(schema, 50)
+
+        assert all(validate(value) is None for value in values)
+        assert 'count' not in values[0]
+        uuid.UUID(values[0]['tags'][0])
+
+    def test_batch_is_distinct_and_deterministic(self, resolver):
+        """Тест различных значений в партии и детерминированности по seed."""
+        schema = {"$ref": "#/components/schemas/NewItem"}
+        first = DataGenerator(resolver, seed=1).batch(schema, 20)
+        second = DataGenerator(resolver, seed=1).batch(schema, 20)
+        other = DataGenerator(resolver, seed=2).batch(schema, 20)
+
+        assert first == second
+        assert first != other
+        assert len({value['name'] for value in first}) == 20
+        assert [value['kind'] for value in first[:4]] == ['a', 'b', 'c', 'a']
+        assert {value['owner']['age'] for value in first} == {18, 19, 20}
+
+    def test_generate_matches_index(self, resolver):
+        """Тест генерации отдельного значения по номеру."""
+        generator = DataGenerator(resolver)
+        assert generator.generate({"type": "integer", "minimum": 5, "multipleOf": 5}, 0) == 5
+        assert generator.generate({"type": "integer", "minimum": 5, "multipleOf": 5}, 2) == 15
+        assert generator.generate({"type": "string", "example": "demo"}) == "demo"
+        assert generator.generate({"type": "string", "maxLength": 2}, 100) == "2s"
+
+    def test_recursive_schema(self, resolver):
+        """Тест: рекурсивная схема разворачивается до ограниченной глубины."""
+        value = DataGenerator(resolver).generate({"$ref": "#/components/schemas/Tree"})
+        depth = 0
+        while value['children']:
+            value = value['children'][0]
+            depth += 1
+        assert 0 < depth < 10
+
+    def test_compiled_once(self, resolver):
+        """Тест кэширования скомпилированных генераторов."""
+        generator = DataGenerator(resolver)
+        schema = {"type": "string"}
+        assert generator.compile(schema) is generator.compile(schema)
+        assert generator.compile({"$ref": "#/components/schemas/Owner"}) is \
+            generator.compile({"$ref": "#/components/schemas/Owner"})
+
+    def test_body_without_schema(self, resolver):
+        """Тест: тело без схемы не добавляет запись в кэш генератора на каждый запрос."""
+        generator = DataGenerator(resolver)
+        tester = APITester(data_generator=generator)
+        body = RequestBody(content={'application/json': {}})
+
+        for index in range(100):
+            tester._generate_request_body(body, index)
+
+        assert len(generator._cache) == 1 and len(generator._schemas) == 1
+
+    def test_concurrent_compile(self, resolver):
+        """Тест: пока ссылка компилируется, другой поток не получает незавершенный генератор."""
+        entered, release = threading.Event(), threading.Event()
+
+        class SlowResolver(SchemaResolver):
+            def resolve(self, schema):
+                entered.set()
+                release.wait(5)
+                return super().resolve(schema)
+
+        generator = DataGenerator(SlowResolver({'components': COMPONENTS}))
+        schema = {"$ref": "#/components/schemas/Owner"}
+        values, errors = [], []
+
+        def worker():
+            try:
+                values.append(generator.generate(schema))
+            except Exception as e:
+                errors.append(e)
+
+        first = threading.Thread(target=worker)
+        first.start()
+        entered.wait(5)
+        second = threading.Thread(target=worker)
+        second.start()
+        time.sleep(0.05)
+        release.set()
+        first.join()
+        second.join()
+
+        assert errors == []
+        assert len(values) == 2 and values[0] == values[1]
+
+    def test_concurrent_mutual_recursion(self):
+        """Тест: генераторы взаимно рекурсивных ссылок публикуются только вместе с внешней схемой."""
+        entered, release = threading.Event(), threading.Event()
+        components = {"schemas": {
+            "A": {"type": "object", "required": ["b", "c"], "properties": {
+                "b": {"type": "array", "items": {"$ref": "#/components/schemas/B"}},
+                "c": {"$ref": "#/components/schemas/C"}
+            }},
+            "B": {"type": "object", "required": ["a"], "properties": {
+                "a": {"type": "array", "items": {"$ref": "#/components/schemas/A"}}
+            }},
+            "C": {"type": "string"}
+        }}
+
+        class SlowResolver(SchemaResolver):
+            def resolve(self, schema):
+                if schema == {"$ref": "#/components/schemas/C"}:
+                    entered.set()
+                    release.wait(5)
+                return super().resolve(schema)
+
+        generator = DataGenerator(SlowResolver({'components': components}))
+        errors = []
+
+        def worker(ref):
+            try:
+                generator.generate({"$ref": ref})
+            except Exception as e:
+                errors.append(e)
+
+        first = threading.Thread(target=worker, args=("#/components/schemas/A",))
+        first.start()
+        entered.wait(5)
+        second = threading.Thread(target=worker, args=("#/components/schemas/B",))
+        second.start()
+        time.sleep(0.05)
+        release.set()
+        first.join()
+        second.join()
+
+        assert errors == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
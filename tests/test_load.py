@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Тесты для нагрузки с открытым циклом."""
+
+import time
+
+import pytest
+
+from apizap.load import OpenLoopRunner, constant_arrivals, load_data_file, parse_duration, parse_rate
+
+
+class StallingTester:
+    """Тестер без сети: первый запрос зависает на 100 мс, остальные - мгновенные."""
+
+    calls = 0
+
+    def test_operation(self, base_url, operation_info):
+        StallingTester.calls += 1
+        service = 100.0 if StallingTester.calls == 1 else 1.0
+        time.sleep(service / 1000)
+        return {'method': 'GET', 'path': operation_info['path'], 'status': 'PASS', 'response_time': service}
+
+
+class TestParsing:
+    """Тесты для разбора интенсивности и длительности."""
+
+    @pytest.mark.parametrize('value, expected', [
+        ('500/s', 500.0), ('500', 500.0), ('30000/min', 500.0), ('2/ms', 2000.0), ('0.5/s', 0.5),
+    ])
+    def test_rate(self, value, expected):
+        """Тест единиц интенсивности."""
+        assert parse_rate(value) == expected
+
+    @pytest.mark.parametrize('value', ['fast', '10/week', '0/s', '-5'])
+    def test_invalid_rate(self, value):
+        """Тест ошибок разбора интенсивности."""
+        with pytest.raises(ValueError):
+            parse_rate(value)
+
+    def test_duration(self):
+        """Тест единиц длительности."""
+        assert parse_duration('30s') == 30
+        assert parse_duration('2m') == 120
+        assert parse_duration('500ms') == 0.5
+        assert parse_duration('45') == 45
+        with pytest.raises(ValueError):
+            parse_duration('soon')
+
+    def test_data_file(self, tmp_path):
+        """Тест: файл настроек читается как JSON по расширению, иначе как YAML."""
+        json_path = tmp_path / 'mix.json'
+        json_path.write_text('{"getItem": 3}')
+        yaml_path = tmp_path / 'mix.yaml'
+        yaml_path.write_text('getItem: 3\n')
+
+        assert load_data_file(str(json_path), 'смеси трафика') == {'getItem': 3}
+        assert load_data_file(str(yaml_path), 'смеси трафика') == {'getItem': 3}
+
+    def test_constant_arrivals(self):
+        """Тест равномерного расписания."""
+        assert list(constant_arrivals(4, 1)) == [0.0, 0.25, 0.5, 0.75]
+
+
+class TestOpenLoopRunner:
+    """Тесты для OpenLoopRunner."""
+
+    def test_latency_from_intended_time(self):
+        """Тест: ожидание за зависшим запросом входит в задержку (coordinated omission)."""
+        StallingTester.calls = 0
+        seen = []
+        operations = [{'method': 'GET', 'path': '/a'}, {'method': 'GET', 'path': '/b'}]
+        runner = OpenLoopRunner(StallingTester, 'http://api.test', operations,
+                                max_in_flight=1, result_hooks=[seen.append])
+
+        started = time.perf_counter()
+        results = runner.run(constant_arrivals(100, 0.1), expected=10)
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 10 == len(seen) == runner.sent
+        assert [r['path'] for r in results[:3]] == ['/a', '/b', '/a']
+        # Второй запрос запланирован через 10 мс, но ждал окончания первого (100 мс)
+        assert results[1]['service_time'] == 1.0
+        assert results[1]['response_time'] >= 85
+        assert all(r['response_time'] >= r['service_time'] * 0.9 for r in results)
+        assert elapsed >= 0.09
+        assert runner.summary()['sent'] == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Тесты для экспорта метрик."""
+
+import threading
+import urllib.request
+
+import pytest
+
+from apizap.metrics import MetricsRegistry, MetricsServer, status_class
+
+
+def make_result(status='PASS', status_code=200, response_time=42.0, operation_id='getUsers'):
+    """Создает минимальный результат теста."""
+    return {
+        'operation_id': operation_id,
+        'method': 'GET',
+        'status': status,
+        'status_code': status_code,
+        'response_time': response_time,
+        'response_size': 10
+    }
+
+
+class TestMetricsRegistry:
+    """Тесты для класса MetricsRegistry."""
+    
+    def test_status_class(self):
+        """Тест определения класса статус-кода."""
+        assert status_class(204) == '2xx'
+        assert status_class(503) == '5xx'
+        assert status_class(None) == 'none'
+    
+    def test_render_counters_and_histogram(self):
+        """Тест текстового представления счетчиков и гистограммы."""
+        registry = MetricsRegistry()
+        registry.observe(make_result(response_time=42.0))
+        registry.observe(make_result(response_time=300.0))
+        registry.observe(make_result(status='WARN', status_code=404, response_time=5.0))
+        
+        text = registry.render()
+        labels = 'operation_id="getUsers",method="GET",status_class="2xx",outcome="PASS"'
+        assert f'apizap_requests_total{{{labels}}} 2' in text
+        assert f'apizap_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in text
+        assert f'apizap_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert 'status_class="4xx",outcome="WARN"} 1' in text
+        assert '# EOF' not in text
+        assert registry.render(openmetrics=True).endswith('# EOF\n')
+    
+    def test_shards_from_threads_are_merged(self):
+        """Тест суммирования шардов разных потоков."""
+        registry = MetricsRegistry()
+        
+        def worker():
+            for _ in range(100):
+                registry.observe(make_result())
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        entry = next(iter(registry.snapshot().values()))
+        assert entry[0] == 400
+    
+    def test_server_serves_metrics(self):
+        """Тест HTTP эндпоинта /metrics."""
+        registry = MetricsRegistry()
+        registry.observe(make_result())
+        
+        with MetricsServer(registry, port=0) as server:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode('utf-8')
+        
+        assert 'apizap_requests_total' in body
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
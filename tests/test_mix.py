@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Тесты для смеси трафика."""
+
+from collections import Counter
+
+import pytest
+
+from apizap.mix import AliasSampler, TrafficMix, load_mix_rules
+from apizap.parser import OpenAPIParser, OpenAPISpec
+
+
+SPEC_DATA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {
+        "/items": {
+            "get": {"operationId": "listItems", "tags": ["items"], "responses": {"200": {"description": "OK"}}},
+            "post": {"operationId": "createItem", "tags": ["items"], "x-apizap-weight": 5,
+                     "responses": {"201": {"description": "Created"}}}
+        },
+        "/items/{id}": {
+            "delete": {"operationId": "deleteItem", "tags": ["items"], "responses": {"204": {"description": "OK"}}}
+        },
+        "/admin": {
+            "get": {"operationId": "admin", "tags": ["admin"], "responses": {"200": {"description": "OK"}}}
+        }
+    }
+}
+
+
+@pytest.fixture
+def operations():
+    return OpenAPIParser().get_all_operations(OpenAPISpec(**SPEC_DATA))
+
+
+class TestAliasSampler:
+    """Тесты для alias-метода."""
+
+    def test_exact_distribution(self):
+        """Тест: на равномерной сетке частоты совпадают с весами."""
+        weights = [80, 15, 4, 1, 0]
+        sampler = AliasSampler(weights)
+        grid = 100000
+        counts = Counter(sampler.sample((i + 0.5) / grid) for i in range(grid))
+
+        for index, weight in enumerate(weights):
+            assert counts[index] / grid == pytest.approx(weight / 100, abs=1e-4)
+
+    @pytest.mark.parametrize('weights', [[], [0, 0], [1, -1]])
+    def test_invalid(self, weights):
+        """Тест некорректных весов."""
+        with pytest.raises(ValueError):
+            AliasSampler(weights)
+
+
+class TestTrafficMix:
+    """Тесты для TrafficMix."""
+
+    def test_rules(self):
+        """Тест разбора правил и нормализации ключей."""
+        assert load_mix_rules(['get /items=80', 'METHOD:delete=1', 'tag:admin=0', 'listItems=2.5']) == {
+            'GET /items': 80.0, 'method:DELETE': 1.0, 'tag:admin': 0.0, 'listItems': 2.5
+        }
+        with pytest.raises(ValueError):
+            load_mix_rules(['listItems'])
+        with pytest.raises(ValueError):
+            load_mix_rules(['listItems=many'])
+
+    def test_weights(self, operations):
+        """Тест приоритета: операция, x-apizap-weight, тег, метод, по умолчанию."""
+        mix = TrafficMix(operations, load_mix_rules(['GET /items=80', 'tag:items=3', 'method:DELETE=1',
+                                                     'tag:admin=0']))
+        weights = {op['operation_id']: weight for op, weight in zip(mix.operations, mix.weights)}
+
+        assert weights == {'listItems': 80, 'createItem': 5, 'deleteItem': 3}
+        assert TrafficMix.has_weights(operations)
+        shares = mix.shares()
+        assert shares[0][0]['operation_id'] == 'listItems'
+        assert sum(share for _, share in shares) == pytest.approx(1)
+
+    def test_picker(self, operations):
+        """Тест выбора операций по весам и воспроизводимости по seed."""
+        mix = TrafficMix(operations, {'listItems': 90, 'createItem': 10, 'deleteItem': 0, 'admin': 0})
+        pick = mix.picker(seed=7)
+        picked = [pick(i)['operation_id'] for i in range(5000)]
+
+        assert set(picked) == {'listItems', 'createItem'}
+        assert picked.count('listItems') / len(picked) == pytest.approx(0.9, abs=0.02)
+        other = mix.picker(seed=7)
+        assert [other(i)['operation_id'] for i in range(100)] == picked[:100]
+
+    def test_non_numeric_extension(self):
+        """Тест: нечисловой x-apizap-weight не ломает разбор спецификации и не учитывается."""
+        data = {**SPEC_DATA, "paths": {"/a": {"get": {"x-apizap-weight": "heavy", "responses": {}},
+                                              "post": {"x-apizap-weight": "2.5", "responses": {}}}}}
+        operations = OpenAPIParser().get_all_operations(OpenAPISpec(**data))
+
+        assert [TrafficMix(operations).weight(op) for op in operations] == [1.0, 2.5]
+
+    def test_all_zero(self, operations):
+        """Тест: смесь без положительных весов."""
+        with pytest.raises(ValueError):
+            TrafficMix(operations, default_weight=0, rules={'createItem': 0})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Тесты для синтетического мониторинга."""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from apizap.monitor import Monitor, RollingWindow, SpecWatcher
+from apizap.parser import OpenAPIParser
+
+
+def make_spec(*paths):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "servers": [{"url": "http://api.test"}],
+        "paths": {path: {"get": {"responses": {"200": {"description": "OK"}}}} for path in paths}
+    }
+
+
+class SpecServer:
+    """HTTP сервер спецификации с ETag и условными запросами."""
+
+    def __init__(self):
+        self.body = b''
+        self.content_type = 'application/json'
+        self.etag = None
+        self.statuses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.etag and self.headers.get('If-None-Match') == server.etag:
+                    server.statuses.append(304)
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                server.statuses.append(200)
+                self.send_response(200)
+                self.send_header('Content-Type', server.content_type)
+                self.send_header('ETag', server.etag)
+                self.send_header('Content-Length', str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/openapi.json"
+
+    def publish(self, spec, etag, content_type='application/json'):
+        self.body = spec if isinstance(spec, bytes) else json.dumps(spec).encode('utf-8')
+        self.content_type = content_type
+        self.etag = etag
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeTester:
+    """Тестер без сети."""
+
+    def __init__(self, hooks=()):
+        self.hooks = hooks
+        self.data_generator = None
+
+    def test_operation(self, base_url, operation_info):
+        result = {'method': operation_info['method'], 'path': operation_info['path'],
+                  'status': 'PASS', 'response_time': 3.0}
+        for hook in self.hooks:
+            hook(result)
+        return result
+
+
+class TestSpecWatcher:
+    """Тесты перезагрузки спецификации."""
+
+    def test_etag(self):
+        """Тест: без изменения ETag спецификация не скачивается и не валидируется заново."""
+        with SpecServer() as server:
+            server.publish(make_spec('/a'), '"v1"')
+            watcher = SpecWatcher(server.url, OpenAPIParser())
+
+            assert list(watcher.poll().paths) == ['/a']
+            assert watcher.poll() is None
+            server.publish(make_spec('/a', '/b'), '"v2"')
+            assert list(watcher.poll().paths) == ['/a', '/b']
+
+        assert server.statuses == [200, 304, 200]
+        assert watcher.loads == 2
+
+    def test_invalid_yaml(self):
+        """Тест: нечитаемая спецификация не останавливает монитор и не запоминается."""
+        pytest.importorskip('yaml')
+        with SpecServer() as server:
+            server.publish(b'openapi: [3.0.0\npaths: {', '"v1"', 'text/yaml')
+            watcher = SpecWatcher(server.url.replace('.json', '.yaml'), OpenAPIParser())
+
+            assert watcher.poll() is None
+            assert watcher.etag is None
+            server.publish(make_spec('/a'), '"v1"')
+            assert list(watcher.poll().paths) == ['/a']
+
+    def test_file(self, tmp_path):
+        """Тест: файл перечитывается только при изменении."""
+        path = tmp_path / 'openapi.json'
+        path.write_text(json.dumps(make_spec('/a')))
+        watcher = SpecWatcher(str(path), OpenAPIParser())
+
+        assert watcher.poll() is not None
+        assert watcher.poll() is None
+        path.write_text(json.dumps(make_spec('/a', '/b')))
+        os.utime(path, ns=(0, 1))
+        assert list(watcher.poll().paths) == ['/a', '/b']
+
+
+class TestRollingWindow:
+    """Тесты скользящего окна."""
+
+    def test_expiry(self):
+        """Тест: результаты старше окна не учитываются."""
+        now = [1000.0]
+        window = RollingWindow(window=60, slots=6, clock=lambda: now[0])
+        window.add({'method': 'GET', 'path': '/a', 'status': 'FAIL', 'response_time': 100.0})
+        now[0] += 30
+        window.add({'method': 'GET', 'path': '/a', 'status': 'PASS', 'response_time': 10.0})
+        window.add({'method': 'GET', 'path': '/b', 'status': 'PASS', 'response_time': 20.0})
+
+        assert window.to_dict()['total']['total'] == 3
+        now[0] += 45
+        state = window.to_dict()
+        assert state['operations']['GET /a']['total'] == 1
+        assert state['operations']['GET /a']['last_status'] == 'PASS'
+        assert state['total']['failed'] == 0
+        assert len(window._slots) == 1
+
+
+class TestMonitor:
+    """Тесты циклов мониторинга."""
+
+    def test_cycles(self, tmp_path):
+        """Тест: тестер и операции переиспользуются между циклами."""
+        path = tmp_path / 'openapi.json'
+        path.write_text(json.dumps(make_spec('/a', '/b')))
+        window = RollingWindow(window=60)
+        monitor = Monitor(SpecWatcher(str(path), OpenAPIParser()), FakeTester([window.add]),
+                          interval=0.01, jitter=0.5, seed=1)
+
+        monitor.run(max_cycles=3)
+
+        assert monitor.cycles == 3 and monitor.watcher.loads == 1
+        assert monitor.base_url == 'http://api.test'
+        assert window.to_dict()['operations']['GET /b']['total'] == 3
+        assert all(0.005 <= monitor.next_delay() <= 0.015 for _ in range(100))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Тесты для профилирования фаз."""
+
+import json
+
+import pytest
+
+from apizap.profiling import PhaseProfiler, profile_phase
+
+
+class TestPhaseProfiler:
+    """Тесты для класса PhaseProfiler."""
+    
+    def test_phases_accumulate(self):
+        """Тест накопления повторных входов в фазу."""
+        profiler = PhaseProfiler()
+        for _ in range(3):
+            with profiler.phase('send'):
+                pass
+        with profiler.phase('load'):
+            pass
+        
+        data = profiler.to_dict()
+        assert list(data['phases']) == ['load', 'send']
+        assert data['phases']['send']['calls'] == 3
+    
+    def test_without_profiler_is_noop(self):
+        """Тест пустого контекста без профилировщика."""
+        with profile_phase(None, 'send'):
+            value = 1
+        assert value == 1
+    
+    def test_write_with_cprofile_and_memory(self, tmp_path):
+        """Тест сохранения профиля, .prof файлов и пика памяти."""
+        profiler = PhaseProfiler(cprofile=True, memory=True)
+        with profiler.phase('validate'):
+            data = [bytes(1024) for _ in range(100)]
+        profiler.stop()
+        
+        written = profiler.write(str(tmp_path / "profile.json"))
+        
+        profile = json.loads((tmp_path / "profile.json").read_text(encoding='utf-8'))
+        assert profile['phases']['validate']['peak_memory_bytes'] >= 100 * 1024
+        assert tmp_path / "profile.validate.prof" in written
+        assert 'validate' in profiler.format_summary()
+        assert len(data) == 100
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Тесты для воспроизведения журнала доступа."""
+
+import pytest
+
+from apizap.load import OpenLoopRunner
+from apizap.replay import LogReplayer, TemplateMatcher, parse_combined, parse_json_line
+
+
+OPERATIONS = [
+    {'method': 'GET', 'path': '/items', 'operation_id': 'listItems'},
+    {'method': 'GET', 'path': '/items/{itemId}', 'operation_id': 'getItem'},
+    {'method': 'DELETE', 'path': '/items/{itemId}', 'operation_id': 'deleteItem'},
+    {'method': 'GET', 'path': '/items/search', 'operation_id': 'searchItems'},
+    {'method': 'GET', 'path': '/items/{itemId}/photos/{photoId}', 'operation_id': 'getPhoto'},
+    {'method': 'GET', 'path': '/files/{name}.{ext}', 'operation_id': 'getFile'},
+]
+
+
+def combined(second, request):
+    return f'10.0.0.1 - - [19/Oct/2026:10:00:{second:02d} +0300] "{request} HTTP/1.1" 200 5 "-" "curl/8"'
+
+
+class FakeTester:
+    """Тестер без сети."""
+
+    def test_operation(self, base_url, operation_info):
+        return {'method': operation_info['method'], 'path': operation_info['path'],
+                'status': 'PASS', 'response_time': 1.0, 'params': operation_info['param_overrides']}
+
+
+class TestParsing:
+    """Тесты разбора строк журнала."""
+
+    def test_combined(self):
+        """Тест combined log format с часовым поясом."""
+        record = parse_combined(combined(5, 'GET /items?limit=5'))
+
+        assert record.method == 'GET' and record.target == '/items?limit=5'
+        assert record.timestamp == 1792393205.0
+        assert parse_combined('not a log line') is None
+
+    def test_json_line(self):
+        """Тест JSON lines с разными именами полей."""
+        assert parse_json_line('{"method": "GET", "path": "/items", "timestamp": 1700000000500}') == (
+            1700000000.5, 'GET', '/items')
+        record = parse_json_line('{"request": "DELETE /items/3 HTTP/1.1", "time": "2026-10-19T07:00:05Z"}')
+        assert record == (1792393205.0, 'DELETE', '/items/3')
+        assert parse_json_line('{"url": "http://api.test/items?a=1", "verb": "GET"}').target == '/items?a=1'
+        assert parse_json_line('[1, 2]') is None
+
+
+class TestTemplateMatcher:
+    """Тесты сопоставления путей с шаблонами."""
+
+    @pytest.mark.parametrize('method, target, operation_id, params', [
+        ('GET', '/items/search', 'searchItems', {}),
+        ('GET', '/items/42', 'getItem', {'itemId': '42'}),
+        ('delete', '/items/42/', 'deleteItem', {'itemId': '42'}),
+        ('GET', '/items/7/photos/9', 'getPhoto', {'itemId': '7', 'photoId': '9'}),
+        ('GET', '/files/report.tar.gz', 'getFile', {'name': 'report', 'ext': 'tar.gz'}),
+        ('GET', '/v1/items?limit=5&tag=a&tag=b', 'listItems', {'limit': '5', 'tag': ['a', 'b']}),
+    ])
+    def test_match(self, method, target, operation_id, params):
+        """Тест: литералы важнее параметров, параметры берутся из пути и query."""
+        case = TemplateMatcher(OPERATIONS, base_path='/v1').match(method, target)
+
+        assert case['operation_id'] == operation_id
+        assert case['param_overrides'] == params
+
+    @pytest.mark.parametrize('method, target', [('POST', '/items/1'), ('GET', '/items/1/photos'), ('GET', '/')])
+    def test_no_match(self, method, target):
+        """Тест запросов без подходящей операции."""
+        assert TemplateMatcher(OPERATIONS).match(method, target) is None
+
+
+class TestLogReplayer:
+    """Тесты расписания воспроизведения."""
+
+    def test_schedule(self):
+        """Тест: моменты отправки делятся на скорость, неопознанные строки учитываются."""
+        lines = [combined(0, 'GET /items/1'), 'garbage', '', combined(2, 'GET /unknown'),
+                 combined(4, 'DELETE /items/2'), combined(3, 'GET /items')]
+        replayer = LogReplayer(TemplateMatcher(OPERATIONS), speed=2)
+        schedule = list(replayer.schedule(lines))
+
+        assert [(offset, case['operation_id']) for offset, case in schedule] == [
+            (0.0, 'getItem'), (2.0, 'deleteItem'), (2.0, 'listItems')
+        ]
+        stats = replayer.stats
+        assert (stats.lines, stats.matched, stats.unmatched, stats.malformed) == (5, 3, 1, 1)
+        assert stats.unmatched_requests == {'GET /unknown': 1}
+        assert stats.span == 4
+
+    def test_out_of_order_timestamps(self):
+        """Тест: запись с более ранним временем не сдвигает расписание назад."""
+        lines = [combined(second, 'GET /items') for second in (0, 5, 3, 5)]
+        schedule = list(LogReplayer(TemplateMatcher(OPERATIONS)).schedule(lines))
+
+        assert [offset for offset, _ in schedule] == [0.0, 5.0, 5.0, 5.0]
+
+    def test_streaming_replay(self):
+        """Тест: журнал читается лениво и воспроизводится через OpenLoopRunner."""
+        consumed = []
+
+        def lines():
+            for i in range(200):
+                consumed.append(i)
+                yield f'{{"method": "GET", "path": "/items/{i}", "ts": 1000}}'
+
+        replayer = LogReplayer(TemplateMatcher(OPERATIONS), speed=0, limit=50)
+        seen = []
+        runner = OpenLoopRunner(FakeTester, 'http://api.test', OPERATIONS, max_in_flight=4,
+                                result_hooks=[seen.append], keep_results=False, max_pending=8)
+        runner.run_schedule(replayer.schedule(lines()))
+
+        assert len(consumed) == 50
+        assert sorted(int(result['params']['itemId']) for result in seen) == list(range(50))
+
+    def test_invalid(self):
+        """Тест некорректных параметров."""
+        with pytest.raises(ValueError):
+            LogReplayer(TemplateMatcher(OPERATIONS), speed=-1)
+        with pytest.raises(ValueError):
+            LogReplayer(TemplateMatcher(OPERATIONS), log_format='xml')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
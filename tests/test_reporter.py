@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Тесты для агрегатора результатов и генератора отчетов."""
+
+import json
+
+import pytest
+
+from apizap.aggregator import ResultAggregator
+from apizap.histogram import LatencyHistogram
+from apizap.reporter import TestReporter
+
+
+RESULTS = [
+    {'status': 'PASS', 'method': 'GET', 'path': '/users', 'status_code': 200,
+     'response_time': 120.5, 'tags': ['users']},
+    {'status': 'PASS', 'method': 'POST', 'path': '/users', 'status_code': 201,
+     'response_time': 245.8, 'tags': ['users']},
+    {'status': 'WARN', 'method': 'GET', 'path': '/admin', 'status_code': 403,
+     'response_time': 89.2, 'tags': ['admin']},
+    {'status': 'FAIL', 'method': 'DELETE', 'path': '/users/1', 'response_time': 0},
+]
+
+
+class TestLatencyHistogram:
+    """Тесты для класса LatencyHistogram."""
+    
+    def test_percentiles_within_precision(self):
+        """Перцентили укладываются в относительную погрешность корзин."""
+        histogram = LatencyHistogram()
+        histogram.record_all(float(v) for v in range(1, 1001))
+        
+        assert histogram.count == 1000
+        assert histogram.min == 1.0 and histogram.max == 1000.0
+        assert abs(histogram.percentile(50) - 500) / 500 < 0.02
+        assert abs(histogram.percentile(99) - 990) / 990 < 0.02
+    
+    def test_merge(self):
+        """Тест объединения гистограмм."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(10.0)
+        second.record(20.0, count=3)
+        first.merge(second)
+        
+        assert first.count == 4
+        assert first.max == 20.0
+
+
+class TestResultAggregator:
+    """Тесты для класса ResultAggregator."""
+    
+    def test_summary_and_groups(self):
+        """Тест сводки и группировок за один проход."""
+        aggregator = ResultAggregator.from_results(RESULTS)
+        
+        summary = aggregator.summary()
+        assert summary['total_tests'] == 4
+        assert summary['passed'] == 2 and summary['warnings'] == 1 and summary['failed'] == 1
+        assert summary['total_time_ms'] == 455.5
+        assert aggregator.status_code_distribution() == {'200': 1, '201': 1, '403': 1}
+        
+        by_tag = aggregator.group_stats('tag')
+        assert by_tag['users']['total'] == 2
+        assert by_tag['default']['failed'] == 1
+        assert aggregator.group_stats('status_class')['none']['total'] == 1
+        assert aggregator.group_stats('method')['GET']['total'] == 2
+
+
+class TestTestReporter:
+    """Тесты для класса TestReporter."""
+    
+    def test_json_report_from_live_aggregator(self):
+        """Отчет строится из агрегатора, накопленного во время прогона."""
+        aggregator = ResultAggregator()
+        for result in RESULTS:
+            aggregator.add(result)
+        
+        report = json.loads(TestReporter().generate_json_report(RESULTS, aggregator=aggregator))
+        
+        assert report['summary']['success_rate'] == 50.0
+        assert report['response_time_stats']['min_ms'] == 89.2
+        assert report['groups']['by_path']['/users']['passed'] == 2
+    
+    def test_text_report_and_summary_stats(self):
+        """Тест текстового отчета и краткой статистики."""
+        reporter = TestReporter()
+        
+        text = reporter.generate_text_report(RESULTS)
+        assert "Всего тестов: 4" in text
+        assert "users: 2 тестов" in text
+        assert reporter.generate_summary_stats(RESULTS)['warnings'] == 1
+        assert reporter.generate_summary_stats([])['total'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
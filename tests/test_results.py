@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Тесты для компактных результатов тестирования."""
+
+import pickle
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from apizap.reporter import TestReporter
+from apizap.results import TestResult, capture_headers
+
+
+class TestTestResult:
+    """Тесты для класса TestResult."""
+    
+    def test_dict_like_view(self):
+        """Тест доступа к результату как к словарю."""
+        result = TestResult(operation_id='getUsers', method='GET', path='/users', summary='Get users')
+        result.update({'status': 'PASS', 'status_code': 200, 'response_time': 12.5})
+        
+        assert result['status'] == 'PASS'
+        assert result.get('error') is None
+        assert result.get('trace_id') is None
+        assert result['response_headers'] == {}
+        assert 'trace_id' not in result
+        
+        result['trace_id'] = 'abc'
+        result['custom'] = 1
+        data = dict(result)
+        assert data['trace_id'] == 'abc'
+        assert data['custom'] == 1
+        assert data['timestamp'] == result.timestamp
+        assert not hasattr(result, '__dict__')
+    
+    def test_strings_are_interned(self):
+        """Тест интернирования повторяющихся строк."""
+        path = ''.join(['/users/', '{id}'])
+        first = TestResult(operation_id='a', method='GET', path=path)
+        second = TestResult(operation_id='b', method='GET', path=''.join(['/users/', '{id}']))
+        assert first.path is second.path
+    
+    def test_capture_headers_whitelist(self):
+        """Тест отбора заголовков по белому списку."""
+        headers = CaseInsensitiveDict({'Content-Type': 'application/json', 'Set-Cookie': 'x', 'Server': 'nginx'})
+        
+        assert capture_headers(headers) == {'content-type': 'application/json', 'server': 'nginx'}
+        assert capture_headers(headers, ('x-missing',)) is None
+        assert len(capture_headers(headers, ('*',))) == 3
+    
+    def test_pickle_and_report(self):
+        """Тест сериализации и работы отчетов через словарное представление."""
+        result = TestResult(operation_id='getUsers', method='GET', path='/users')
+        result.update({
+            'status': 'PASS',
+            'status_code': 200,
+            'response_time': 10.0,
+            'response_headers': {'content-type': 'application/json'}
+        })
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored == result
+        
+        report = TestReporter().generate_json_report([restored])
+        assert '"content-type": "application/json"' in report
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
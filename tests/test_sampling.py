@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Тесты для стратифицированной выборки и истории прогонов."""
+
+import json
+
+import pytest
+
+from apizap.history import RunHistory
+from apizap.sampling import StratifiedSampler, parse_sample_size, sample_count
+
+
+def make_operations():
+    operations = []
+    for tag, count in (('users', 40), ('orders', 20), ('admin', 2)):
+        for i in range(count):
+            operations.append({'method': 'GET', 'path': f'/{tag}/{i}', 'tags': [tag]})
+        operations.append({'method': 'POST', 'path': f'/{tag}', 'tags': [tag]})
+    return operations
+
+
+class TestSampleSize:
+    """Тесты для разбора размера выборки."""
+
+    def test_count_and_percent(self):
+        """Тест количества и доли."""
+        assert parse_sample_size('200') == 200
+        assert parse_sample_size('5%') == 0.05
+        assert sample_count(200, 50) == 50
+        assert sample_count(0.05, 1000) == 50
+        assert sample_count(0.01, 10) == 1
+
+    @pytest.mark.parametrize('value', ['0', '-3', '0%', '150%', 'abc'])
+    def test_invalid(self, value):
+        """Тест некорректных значений."""
+        with pytest.raises(ValueError):
+            parse_sample_size(value)
+
+
+class TestStratifiedSampler:
+    """Тесты для StratifiedSampler."""
+
+    def test_every_stratum_is_covered(self):
+        """Тест: каждая страта получает операцию, остаток - пропорционально."""
+        operations = make_operations()
+        sampler = StratifiedSampler(seed=1)
+        sample = sampler.sample(operations, 12)
+
+        assert len(sample) == 12
+        assert {sampler.stratum(op) for op in sample} == set(sampler.strata(operations))
+        users = [op for op in sample if op['tags'] == ['users'] and op['method'] == 'GET']
+        orders = [op for op in sample if op['tags'] == ['orders'] and op['method'] == 'GET']
+        assert len(users) > len(orders)
+
+    def test_deterministic_and_ordered(self):
+        """Тест детерминированности и сохранения исходного порядка."""
+        operations = make_operations()
+        first = StratifiedSampler(seed=7).sample(operations, 0.2)
+        second = StratifiedSampler(seed=7).sample(list(operations), 0.2)
+        other = StratifiedSampler(seed=8).sample(operations, 0.2)
+
+        assert first == second
+        assert first != other
+        assert first == sorted(first, key=operations.index)
+
+    def test_full_sample(self):
+        """Тест: выборка не больше спецификации возвращает все операции."""
+        operations = make_operations()
+        assert StratifiedSampler().sample(operations, 1000) == operations
+
+    def test_history_weights_failed_operations(self):
+        """Тест: упавшие в прошлом прогоне операции выбираются чаще."""
+        operations = [{'method': 'GET', 'path': f'/items/{i}', 'tags': ['items']} for i in range(50)]
+        failed = operations[3]
+        history = RunHistory.from_results(
+            [dict(op, status='PASS', response_time=10.0) for op in operations[1:]]
+            + [dict(failed, status='FAIL', response_time=500.0)]
+        )
+
+        hits = sum(
+            failed in StratifiedSampler(seed=seed, history=history).sample(operations, 5)
+            for seed in range(40)
+        )
+        assert hits > 30
+
+
+class TestRunHistory:
+    """Тесты для RunHistory."""
+
+    def test_load_json_report(self, tmp_path):
+        """Тест загрузки JSON отчета и весов операций."""
+        report = {'tests': [
+            {'method': 'GET', 'path': '/a', 'status': 'PASS', 'response_time_ms': 10.0},
+            {'method': 'GET', 'path': '/b', 'status': 'PASS', 'response_time_ms': 20.0},
+            {'method': 'GET', 'path': '/c', 'status': 'FAIL', 'response_time_ms': 200.0},
+        ]}
+        report_file = tmp_path / 'report.json'
+        report_file.write_text(json.dumps(report), encoding='utf-8')
+
+        history = RunHistory.load(report_file)
+        assert len(history) == 3
+        assert history.outcome({'method': 'get', 'path': '/c'}) == 'FAIL'
+        assert history.weight({'method': 'GET', 'path': '/a'}) == 1.0
+        assert history.weight({'method': 'GET', 'path': '/c'}) == 40.0
+        assert history.weight({'method': 'GET', 'path': '/new'}) == 1.0
+
+    def test_invalid_report(self, tmp_path):
+        """Тест ошибки для файла, не являющегося отчетом."""
+        report_file = tmp_path / 'report.json'
+        report_file.write_text('[1, 2]', encoding='utf-8')
+        with pytest.raises(ValueError):
+            RunHistory.load(report_file)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
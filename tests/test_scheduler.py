@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Тесты для планировщика операций."""
+
+import threading
+
+import pytest
+
+from apizap.history import RunHistory
+from apizap.scheduler import Scheduler, run_scheduled
+
+
+OPERATIONS = [
+    {'method': 'GET', 'path': '/fast'},
+    {'method': 'GET', 'path': '/slow'},
+    {'method': 'GET', 'path': '/broken'},
+    {'method': 'GET', 'path': '/new'},
+]
+
+HISTORY = RunHistory.from_results([
+    {'method': 'GET', 'path': '/fast', 'status': 'PASS', 'response_time': 10.0},
+    {'method': 'GET', 'path': '/slow', 'status': 'PASS', 'response_time': 900.0},
+    {'method': 'GET', 'path': '/broken', 'status': 'FAIL', 'response_time': 50.0},
+])
+
+
+class RecordingTester:
+    """Тестер, который записывает порядок операций и возвращает заданный исход."""
+
+    request_delay = 0
+
+    def __init__(self, calls, failing=()):
+        self.calls = calls
+        self.failing = failing
+
+    def test_operation(self, base_url, operation_info):
+        self.calls.append((threading.get_ident(), operation_info['path']))
+        status = 'FAIL' if operation_info['path'] in self.failing else 'PASS'
+        return {'method': operation_info['method'], 'path': operation_info['path'], 'status': status}
+
+
+class TestScheduler:
+    """Тесты для Scheduler."""
+
+    def test_spec_order(self):
+        """Тест: порядок spec не меняет операции."""
+        assert Scheduler(HISTORY).order(OPERATIONS) == OPERATIONS
+
+    def test_slowest_first(self):
+        """Тест LPT порядка; новые операции оцениваются медианой."""
+        ordered = Scheduler(HISTORY, 'slowest-first').order(OPERATIONS)
+        assert [op['path'] for op in ordered] == ['/slow', '/broken', '/new', '/fast']
+
+    def test_failures_first(self):
+        """Тест порядка failures-first."""
+        ordered = Scheduler(HISTORY, 'failures-first').order(OPERATIONS)
+        assert [op['path'] for op in ordered] == ['/broken', '/slow', '/new', '/fast']
+
+    def test_makespan_estimate(self):
+        """Тест: LPT порядок не хуже порядка спецификации."""
+        operations = [{'method': 'GET', 'path': f'/op/{i}'} for i in range(6)]
+        history = RunHistory.from_results([
+            dict(op, status='PASS', response_time=latency)
+            for op, latency in zip(operations, [10.0, 10.0, 10.0, 10.0, 10.0, 50.0])
+        ])
+        spec = Scheduler(history)
+        lpt = Scheduler(history, 'slowest-first')
+        assert spec.estimate_makespan(operations, 2) == 70.0
+        assert lpt.estimate_makespan(lpt.order(operations), 2) == 50.0
+
+    def test_unknown_order(self):
+        """Тест ошибки для неизвестного порядка."""
+        with pytest.raises(ValueError):
+            Scheduler(order='random')
+
+
+class TestRunScheduled:
+    """Тесты для run_scheduled."""
+
+    def test_runs_all_in_order(self):
+        """Тест выполнения всех операций несколькими исполнителями."""
+        calls = []
+        results = run_scheduled(lambda: RecordingTester(calls), 'http://api', OPERATIONS, workers=3)
+
+        assert [r['path'] for r in results] == [op['path'] for op in OPERATIONS]
+        assert sorted(path for _, path in calls) == sorted(op['path'] for op in OPERATIONS)
+
+    def test_fail_fast(self):
+        """Тест остановки после порога неудачных операций."""
+        calls = []
+        operations = [{'method': 'GET', 'path': f'/op/{i}'} for i in range(10)]
+        results = run_scheduled(
+            lambda: RecordingTester(calls, failing={'/op/1', '/op/2'}),
+            'http://api', operations, fail_fast=2
+        )
+
+        assert [r['path'] for r in results] == ['/op/0', '/op/1', '/op/2']
+        assert len(calls) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
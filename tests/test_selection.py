@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Тесты для отбора операций."""
+
+import pytest
+
+from apizap.parser import OpenAPIParser, OpenAPISpec
+from apizap.selection import OperationIndex, OperationSelector, PathTrie
+
+
+SPEC_DATA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {
+        "/pets": {
+            "get": {"operationId": "listPets", "tags": ["pets"], "responses": {"200": {"description": "OK"}}},
+            "post": {"operationId": "createPet", "tags": ["pets"], "responses": {"201": {"description": "Created"}}}
+        },
+        "/pets/{petId}": {
+            "parameters": [{"name": "petId", "in": "path", "required": True, "schema": {"type": "integer"}}],
+            "get": {"operationId": "getPet", "tags": ["pets"], "responses": {"200": {"description": "OK"}}}
+        },
+        "/pets/{petId}/photos": {
+            "get": {"tags": ["pets", "media"], "responses": {"200": {"description": "OK"}}}
+        },
+        "/petstore": {
+            "get": {"operationId": "storeInfo", "tags": ["admin"], "responses": {"200": {"description": "OK"}}}
+        },
+        "/health": {
+            "get": {"responses": {"200": {"description": "OK"}}}
+        }
+    }
+}
+
+
+class TestPathTrie:
+    """Тесты для префиксного дерева путей."""
+
+    def test_prefix_matches_whole_segments(self):
+        """Тест отбора по префиксу из целых сегментов."""
+        trie = PathTrie()
+        for path in ['/pets', '/pets/{petId}', '/petstore', '/health']:
+            trie.insert(path, path)
+
+        assert sorted(trie.prefix('/pets')) == ['/pets', '/pets/{petId}']
+        assert sorted(trie.prefix('/')) == ['/health', '/pets', '/pets/{petId}', '/petstore']
+        assert list(trie.prefix('/users')) == []
+
+
+class TestOperationSelector:
+    """Тесты для критериев отбора."""
+
+    def select(self, **criteria):
+        selector = OperationSelector(**criteria)
+        return selector.select_keys(OperationIndex.from_spec_data(SPEC_DATA))
+
+    def test_empty_selector_keeps_spec(self):
+        """Тест: без критериев спецификация не изменяется."""
+        selector = OperationSelector()
+        assert selector.is_empty
+        assert selector.prune_spec_data(SPEC_DATA) is SPEC_DATA
+
+    def test_tags(self):
+        """Тест отбора по тегам, включая тег по умолчанию."""
+        assert self.select(include_tags=['media']) == {('/pets/{petId}/photos', 'GET')}
+        assert self.select(include_tags=['default']) == {('/health', 'GET')}
+        assert ('/pets', 'GET') not in self.select(exclude_tags=['pets'])
+
+    def test_path_prefix_and_glob(self):
+        """Тест отбора по префиксу пути и glob-шаблону: '*' не выходит за сегмент, '**' - любые сегменты."""
+        assert self.select(paths=['/pets/{petId}']) == {
+            ('/pets/{petId}', 'GET'), ('/pets/{petId}/photos', 'GET')
+        }
+        assert self.select(paths=['/pets/*/photos']) == {('/pets/{petId}/photos', 'GET')}
+        assert self.select(paths=['/pet*']) == {('/pets', 'GET'), ('/pets', 'POST'), ('/petstore', 'GET')}
+        assert self.select(paths=['/pets/*']) == {('/pets/{petId}', 'GET')}
+        assert self.select(paths=['/pet*/**']) == {
+            ('/pets', 'GET'), ('/pets', 'POST'), ('/pets/{petId}', 'GET'),
+            ('/pets/{petId}/photos', 'GET'), ('/petstore', 'GET')
+        }
+        assert self.select(paths=['/**/photos']) == {('/pets/{petId}/photos', 'GET')}
+
+    def test_criteria_are_combined(self):
+        """Тест пересечения критериев и operationId по умолчанию."""
+        assert self.select(paths=['/pets'], methods=['post']) == {('/pets', 'POST')}
+        assert self.select(operation_ids=['get__pets_petId_photos', 'storeInfo']) == {
+            ('/pets/{petId}/photos', 'GET'), ('/petstore', 'GET')
+        }
+
+    def test_pruned_spec_validates(self):
+        """Тест: после отбора спецификация валидна и содержит только нужные операции."""
+        selector = OperationSelector(operation_ids=['getPet'])
+        pruned = selector.prune_spec_data(SPEC_DATA)
+
+        assert list(SPEC_DATA['paths']) != list(pruned['paths'])
+        spec = OpenAPISpec(**pruned)
+        operations = OpenAPIParser().get_all_operations(spec)
+        assert [op['operation_id'] for op in operations] == ['getPet']
+        assert operations[0]['parameters'][0].name == 'petId'
+
+    def test_select_operations_list(self):
+        """Тест отбора из списка операций с сохранением порядка."""
+        operations = OpenAPIParser().get_all_operations(OpenAPISpec(**SPEC_DATA))
+        selected = OperationSelector(include_tags=['pets'], methods=['GET']).select(operations)
+        assert [op['path'] for op in selected] == ['/pets', '/pets/{petId}', '/pets/{petId}/photos']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Тесты для самотестирования производительности."""
+
+import pytest
+
+from apizap.engines import ENGINES
+from apizap.selftest import format_selftest_report, run_selftest
+
+
+class TestSelftest:
+    """Тесты для run_selftest и движков выполнения."""
+    
+    def test_all_engines_against_null_server(self):
+        """Каждый движок выполняет все запросы без ошибок."""
+        report = run_selftest(requests_count=20, workers=2)
+        
+        assert [stats['engine'] for stats in report['engines']] == list(ENGINES)
+        for stats in report['engines']:
+            assert stats['requests'] == 20
+            assert stats['errors'] == 0
+            assert stats['requests_per_second'] > 0
+        
+        text = format_selftest_report(report)
+        assert 'serial' in text and 'process' in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Тесты для прогона на нескольких серверах."""
+
+import pytest
+
+from apizap.parser import OpenAPIParser, OpenAPISpec, expand_server_url
+from apizap.servers import ServerComparison, run_all_servers, server_labels
+
+
+SPEC_DATA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "servers": [
+        {
+            "url": "https://{region}.api.example.com/{version}/",
+            "variables": {
+                "region": {"default": "eu", "enum": ["eu", "us", "apac"]},
+                "version": {"default": "v1"}
+            }
+        },
+        {"url": "https://eu.api.example.com/v1"},
+        {"url": "https://staging.example.com"}
+    ],
+    "paths": {}
+}
+
+
+class FakeTester:
+    """Тестер без сети: задержка зависит от сервера."""
+
+    request_delay = 0
+    latency = {'http://eu': 10.0, 'http://us': 40.0}
+
+    def __init__(self, record_server=False):
+        self.record_server = record_server
+
+    def test_operation(self, base_url, operation_info):
+        result = {
+            'method': operation_info['method'],
+            'path': operation_info['path'],
+            'status': 'FAIL' if base_url == 'http://us' and operation_info['path'] == '/b' else 'PASS',
+            'response_time': self.latency[base_url] * (2 if operation_info['path'] == '/b' else 1),
+            'tester': self
+        }
+        if self.record_server:
+            result['server'] = base_url
+        return result
+
+
+class TestServerUrls:
+    """Тесты для раскрытия серверов спецификации."""
+
+    def test_expand_variables(self):
+        """Тест подстановки переменных: все значения enum или только default."""
+        variables = SPEC_DATA['servers'][0]['variables']
+        url = SPEC_DATA['servers'][0]['url']
+
+        assert expand_server_url(url, variables) == [
+            "https://eu.api.example.com/v1",
+            "https://us.api.example.com/v1",
+            "https://apac.api.example.com/v1",
+        ]
+        assert expand_server_url(url, variables, all_values=False) == ["https://eu.api.example.com/v1"]
+        assert expand_server_url("https://api.example.com/") == ["https://api.example.com"]
+
+    def test_get_server_urls(self):
+        """Тест списка серверов без повторов и базового URL по умолчанию."""
+        parser = OpenAPIParser()
+        spec = OpenAPISpec(**SPEC_DATA)
+
+        assert parser.get_server_urls(spec) == [
+            "https://eu.api.example.com/v1",
+            "https://us.api.example.com/v1",
+            "https://apac.api.example.com/v1",
+            "https://staging.example.com",
+        ]
+        assert parser.get_base_url(spec) == "https://eu.api.example.com/v1"
+
+    def test_labels(self):
+        """Тест коротких подписей серверов."""
+        assert server_labels(["https://eu.example.com/v1", "https://us.example.com/v1"]) == {
+            "https://eu.example.com/v1": "eu.example.com",
+            "https://us.example.com/v1": "us.example.com",
+        }
+        urls = ["https://example.com/v1", "https://example.com/v2"]
+        assert server_labels(urls) == {url: url for url in urls}
+
+
+class TestAllServers:
+    """Тесты для run_all_servers и ServerComparison."""
+
+    @pytest.fixture
+    def results(self):
+        operations = [{'method': 'GET', 'path': '/a'}, {'method': 'GET', 'path': '/b'}]
+        return run_all_servers(FakeTester, ['http://eu', 'http://us'], operations)
+
+    def test_run(self, results):
+        """Тест: каждый сервер получает все операции своими тестерами."""
+        assert [(r['server'], r['path']) for r in results] == [
+            ('http://eu', '/a'), ('http://eu', '/b'), ('http://us', '/a'), ('http://us', '/b')
+        ]
+        assert results[0]['tester'] is not results[2]['tester']
+
+    def test_comparison(self, results):
+        """Тест сравнения задержек операций по серверам."""
+        comparison = ServerComparison.from_results(results)
+        data = comparison.to_dict()
+
+        assert data['servers']['http://us']['failed'] == 1
+        row = data['operations'][1]
+        assert row['path'] == '/b'
+        assert row['fastest'] == 'http://eu' and row['slowest'] == 'http://us'
+        assert row['spread'] == pytest.approx(4.0, rel=0.05)
+        assert any('×4.0' in line for line in comparison.format_lines())
+
+    def test_without_servers(self):
+        """Тест: без поля server сравнение не строится."""
+        assert ServerComparison.from_results([{'method': 'GET', 'path': '/', 'status': 'PASS'}]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Тесты для профилей нагрузки."""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from apizap.stages import LoadProfile, ProfileRecorder, ProfileRunner, TimeSeries
+
+
+class FakeTester:
+    """Тестер без сети с учетом одновременных запросов."""
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def test_operation(self, base_url, operation_info):
+        with FakeTester.lock:
+            FakeTester.active += 1
+            FakeTester.peak = max(FakeTester.peak, FakeTester.active)
+        time.sleep(0.005)
+        with FakeTester.lock:
+            FakeTester.active -= 1
+        return {'method': 'GET', 'path': operation_info['path'], 'status': 'PASS', 'response_time': 5.0}
+
+
+class TestLoadProfile:
+    """Тесты для описания профиля."""
+
+    def test_parse_inline(self):
+        """Тест встроенной записи: ramp начинается с цели предыдущей стадии."""
+        profile = LoadProfile.parse("hold:100/s:1m:warm,ramp:500/s:2m,spike:2000/s:30s,soak:50u:12h")
+        warm, ramp, spike, soak = profile.stages
+
+        assert (warm.name, warm.start, warm.target, warm.duration) == ('warm', 100, 100, 60)
+        assert (ramp.start, ramp.target, ramp.duration) == (100, 500, 120)
+        assert spike.start == spike.target == 2000
+        assert (soak.mode, soak.target, soak.duration) == ('concurrency', 50, 43200)
+        assert [len(segment) for segment in profile.segments()] == [3, 1]
+
+    def test_parse_file(self, tmp_path):
+        """Тест профиля из YAML файла."""
+        path = tmp_path / 'profile.yaml'
+        path.write_text("stages:\n"
+                        "  - {type: ramp, concurrency: 20, duration: 30s, name: knee}\n"
+                        "  - {type: ramp, rate: 50, from: 10, duration: 10}\n")
+        knee, ramp = LoadProfile.parse(str(path)).stages
+
+        assert (knee.name, knee.mode, knee.start, knee.target) == ('knee', 'concurrency', 0, 20)
+        assert (ramp.mode, ramp.start, ramp.target, ramp.duration) == ('rate', 10, 50, 10)
+
+    @pytest.mark.parametrize('value', ['jump:10/s:1m', 'hold:10/s', 'hold:fast:1m', ''])
+    def test_invalid(self, value):
+        """Тест ошибок описания профиля."""
+        with pytest.raises(ValueError):
+            LoadProfile.parse(value)
+
+    def test_ramp_arrivals(self):
+        """Тест: при разгоне 0→100 за 2 с отправляется 100 запросов с растущей частотой."""
+        stage = LoadProfile.parse("ramp:100/s:2s").stages[0]
+        arrivals = list(stage.arrivals())
+
+        assert len(arrivals) == stage.expected_requests() == 100
+        assert arrivals == sorted(arrivals) and arrivals[-1] < 2
+        assert arrivals[1] - arrivals[0] > arrivals[-1] - arrivals[-2]
+
+
+class TestTimeSeries:
+    """Тесты для посекундного ряда."""
+
+    def test_bounded_window_and_sink(self):
+        """Тест: в памяти остается окно закрытых секунд, полный ряд - в sink."""
+        sink = io.StringIO()
+        series = TimeSeries(window=3, sink=sink)
+        for second in range(10):
+            for _ in range(second + 1):
+                series.add(second, 'soak', 'FAIL' if second == 9 else 'PASS', 10.0)
+        assert len(series._open) <= TimeSeries.GRACE_SECONDS + 1
+        series.flush()
+
+        points = series.points()
+        assert [point['t'] for point in points] == [7, 8, 9]
+        assert points[-1]['requests'] == 10 and points[-1]['failed'] == 10
+        assert [json.loads(line)['t'] for line in sink.getvalue().splitlines()] == list(range(10))
+
+
+class TestProfileRunner:
+    """Тесты для выполнения профиля."""
+
+    def test_run(self):
+        """Тест стадий с интенсивностью и с конкурентностью."""
+        FakeTester.peak = 0
+        profile = LoadProfile.parse("hold:200/s:0.2s:flat,hold:3u:0.3s:users")
+        recorder = ProfileRecorder(profile)
+        seen = []
+        operations = [{'method': 'GET', 'path': '/a'}, {'method': 'GET', 'path': '/b'}]
+
+        ProfileRunner(FakeTester, 'http://api.test', operations, recorder, result_hooks=[seen.append]).run()
+        flat, users = recorder.stage_stats()
+
+        assert flat['total'] == 40
+        assert users['total'] > 10
+        assert len(seen) == flat['total'] + users['total']
+        assert {result['path'] for result in seen} == {'/a', '/b'}
+        assert FakeTester.peak >= 3
+        assert sum(point['requests'] for point in recorder.timeseries.points()) == len(seen)
+
+    def test_pending_bounded(self):
+        """Тест: при зависшем API планировщик не набирает очередь без границ."""
+        release = threading.Event()
+        picked = []
+
+        class StalledTester:
+            def test_operation(self, base_url, operation_info):
+                release.wait(5)
+                return {'method': 'GET', 'path': '/a', 'status': 'PASS', 'response_time': 1.0}
+
+        def picker(index):
+            picked.append(index)
+            return {'method': 'GET', 'path': '/a'}
+
+        profile = LoadProfile.parse("hold:1000/s:0.2s")
+        runner = ProfileRunner(StalledTester, 'http://api.test', [], ProfileRecorder(profile),
+                               max_in_flight=2, picker=picker)
+        thread = threading.Thread(target=runner.run)
+        thread.start()
+        time.sleep(0.1)
+        stalled = len(picked)
+        release.set()
+        thread.join()
+
+        assert stalled <= 5
+        assert len(picked) == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
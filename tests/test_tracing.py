@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Тесты для трассировки запросов."""
+
+import json
+import re
+
+import pytest
+
+from apizap.tracing import FileSpanExporter, Tracer
+
+
+class TestTracer:
+    """Тесты для классов Tracer и FileSpanExporter."""
+    
+    def test_traceparent_format(self):
+        """Тест формата заголовка W3C traceparent."""
+        tracer = Tracer([])
+        span = tracer.start_span("GET /users")
+        child = tracer.start_span("child", parent=span)
+        tracer.shutdown()
+        
+        assert re.fullmatch(r"00-[0-9a-f]{32}-[0-9a-f]{16}-01", span.traceparent)
+        assert child.trace_id == span.trace_id
+        assert child.parent_span_id == span.span_id
+    
+    def test_file_exporter_writes_otlp_batches(self, tmp_path):
+        """Тест выгрузки span'ов пачками в файл OTLP/JSON."""
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer([FileSpanExporter(str(path))], batch_size=2)
+        
+        for i in range(3):
+            span = tracer.start_span(f"GET /items/{i}", {'http.response.status_code': 200})
+            span.error = i == 2
+            tracer.end_span(span)
+        tracer.shutdown()
+        
+        batches = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        spans = [
+            span
+            for batch in batches
+            for span in batch['resourceSpans'][0]['scopeSpans'][0]['spans']
+        ]
+        assert len(batches) == 2
+        assert [span['name'] for span in spans] == ["GET /items/0", "GET /items/1", "GET /items/2"]
+        assert spans[0]['attributes'][0]['value'] == {'intValue': '200'}
+        assert spans[2]['status']['code'] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
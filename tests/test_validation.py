@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Тесты для проверки ответов по схемам."""
+
+import json
+
+import pytest
+
+from apizap.parser import OpenAPISpec
+from apizap.schema import SchemaResolver
+from apizap.validation import ResponseValidator, SchemaCompiler, iter_json_array
+
+
+COMPONENTS = {
+    "schemas": {
+        "Node": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                "id": {"type": "integer", "minimum": 1},
+                "name": {"type": "string", "maxLength": 5, "nullable": True},
+                "kind": {"type": "string", "enum": ["a", "b"]},
+                "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}}
+            },
+            "additionalProperties": False
+        }
+    }
+}
+
+SPEC_DATA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {
+        "/nodes": {
+            "get": {
+                "operationId": "listNodes",
+                "responses": {"2XX": {"description": "OK", "content": {"application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}, "maxItems": 3}
+                }}}}
+            }
+        }
+    },
+    "components": COMPONENTS
+}
+
+
+class TestSchemaCompiler:
+    """Тесты для компиляции схем."""
+
+    @pytest.fixture
+    def validate(self):
+        return SchemaCompiler(SchemaResolver({'components': COMPONENTS})).compile(
+            {"$ref": "#/components/schemas/Node"}
+        )
+
+    def test_valid(self, validate):
+        """Тест корректных значений, включая рекурсию и nullable."""
+        assert validate({"id": 1, "name": None, "children": [{"id": 2, "kind": "a"}]}) is None
+
+    @pytest.mark.parametrize('value, error', [
+        ([], ': ожидался тип object'),
+        ({}, ": отсутствует обязательное поле 'id'"),
+        ({"id": True}, '/id: ожидался тип integer'),
+        ({"id": 0}, '/id: значение меньше 1'),
+        ({"id": 1, "name": "toolong"}, '/name: длина больше 5'),
+        ({"id": 1, "kind": "c"}, '/kind: значение не входит в enum'),
+        ({"id": 1, "extra": 1}, '/extra: недопустимое поле'),
+        ({"id": 1, "children": [{"id": 2}, {"id": -1}]}, '/children/1/id: значение меньше 1'),
+    ])
+    def test_errors(self, validate, value, error):
+        """Тест описаний ошибок с путем к значению."""
+        assert validate(value) == error
+
+    def test_combinators(self):
+        """Тест allOf, anyOf и oneOf."""
+        compiler = SchemaCompiler()
+        any_of = compiler.compile({"anyOf": [{"type": "string"}, {"type": "integer"}]})
+        one_of = compiler.compile({"oneOf": [{"type": "number"}, {"type": "integer"}]})
+        all_of = compiler.compile({"allOf": [{"type": "number"}, {"minimum": 2}]})
+
+        assert any_of("x") is None and any_of(1.5) is not None
+        assert one_of(1.5) is None and one_of(1) is not None
+        assert all_of(3) is None and all_of(1) == ': значение меньше 2'
+
+
+class TestResponseValidator:
+    """Тесты для ResponseValidator."""
+
+    @pytest.fixture
+    def spec(self):
+        return OpenAPISpec(**SPEC_DATA)
+
+    def check(self, validator, spec, body, content_type='application/json; charset=utf-8'):
+        operation = spec.paths['/nodes'].get
+        return validator.validate_response('listNodes', operation, 200, content_type, body)
+
+    def test_validate_and_cache(self, spec):
+        """Тест проверки по диапазону статусов и кэша скомпилированных схем."""
+        validator = ResponseValidator(SchemaResolver.from_spec(spec))
+
+        assert self.check(validator, spec, b'[{"id": 1}]') is None
+        assert self.check(validator, spec, b'[{"id": 1}, {"id": "x"}]') == '#/1/id: ожидался тип integer'
+        assert self.check(validator, spec, b'not json') == '#: тело ответа не является корректным JSON'
+        assert self.check(validator, spec, b'<html/>', 'text/html') is None
+
+        compiled = validator.compiled('listNodes', spec.paths['/nodes'].get, 200, 'application/json')
+        assert list(validator._cache.values()) == [compiled]
+
+    def test_malformed_schema(self):
+        """Тест: некорректная схема отключает проверку операции, а не роняет запрос."""
+        data = json.loads(json.dumps(SPEC_DATA))
+        media = data['paths']['/nodes']['get']['responses']['2XX']['content']['application/json']
+        media['schema'] = {"type": ["integer", ["string"]]}
+        spec = OpenAPISpec(**data)
+        validator = ResponseValidator(SchemaResolver.from_spec(spec))
+
+        assert self.check(validator, spec, b'[{"id": "x"}]') is None
+        assert list(validator._cache.values()) == [None]
+
+    def test_stream_mode(self, spec):
+        """Тест потоковой проверки больших массивов."""
+        validator = ResponseValidator(SchemaResolver.from_spec(spec), stream_threshold=0)
+
+        assert self.check(validator, spec, '[{"id": 1}, {"id": 2}]') is None
+        assert self.check(validator, spec, '[{"id": 1}, {"id": 0}]') == '#/1/id: значение меньше 1'
+        assert self.check(validator, spec, json.dumps([{"id": 1}] * 4)) == '#: элементов больше 3'
+
+    def test_sampling(self, spec):
+        """Тест проверки каждого N-го ответа."""
+        validator = ResponseValidator(SchemaResolver.from_spec(spec), sample_every=3)
+        errors = [self.check(validator, spec, b'[{"id": 0}]') for _ in range(6)]
+        assert sum(error is not None for error in errors) == 2
+
+
+class TestIterJsonArray:
+    """Тесты для потокового декодирования массива."""
+
+    def test_items(self):
+        """Тест декодирования элементов и ошибок формата."""
+        assert list(iter_json_array(' [1, {"a": [2]} , "x"] ')) == [1, {"a": [2]}, "x"]
+        assert list(iter_json_array('[]')) == []
+        with pytest.raises(ValueError):
+            list(iter_json_array('{"a": 1}'))
+        with pytest.raises(ValueError):
+            list(iter_json_array('[1 2]'))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Тесты для stateful workflow."""
+
+import copy
+import threading
+
+import pytest
+
+from apizap.parser import OpenAPIParser, OpenAPISpec
+from apizap.workflow import _MISSING, WorkflowPlan, WorkflowRunner, evaluate_expression
+
+
+OK = {"200": {"description": "OK"}}
+
+SPEC_DATA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {
+        "/users": {
+            "post": {"operationId": "createUser", "responses": {"201": {"description": "Created"}}}
+        },
+        "/users/{userId}": {
+            "parameters": [{"name": "userId", "in": "path", "required": True, "schema": {"type": "integer"}}],
+            "get": {"operationId": "getUser", "responses": OK},
+            "delete": {"operationId": "deleteUser", "responses": {"204": {"description": "Deleted"}}}
+        },
+        "/users/{userId}/posts": {
+            "parameters": [{"name": "userId", "in": "path", "required": True, "schema": {"type": "integer"}}],
+            "post": {
+                "operationId": "createPost",
+                "responses": {"201": {
+                    "description": "Created",
+                    "links": {"GetPost": {
+                        "operationId": "getPost",
+                        "parameters": {"path.postId": "$response.body#/post/key", "userId": "$request.path.userId"}
+                    }}
+                }}
+            }
+        },
+        "/users/{userId}/posts/{postId}": {
+            "parameters": [
+                {"name": "userId", "in": "path", "required": True, "schema": {"type": "integer"}},
+                {"name": "postId", "in": "path", "required": True, "schema": {"type": "string"}}
+            ],
+            "get": {"operationId": "getPost", "responses": OK},
+            "delete": {"operationId": "deletePost", "responses": {"204": {"description": "Deleted"}}}
+        },
+        "/health": {"get": {"operationId": "health", "responses": OK}}
+    }
+}
+
+
+def make_plan():
+    operations = OpenAPIParser().get_all_operations(OpenAPISpec(**SPEC_DATA))
+    return WorkflowPlan(operations)
+
+
+def step(plan, operation_id):
+    return next(s for s in plan.steps if s.operation['operation_id'] == operation_id)
+
+
+class FakeTester:
+    """Тестер, имитирующий API, которое создает пользователей и посты."""
+
+    request_delay = 0
+
+    def __init__(self, calls, lock):
+        self.calls = calls
+        self.lock = lock
+
+    def test_operation(self, base_url, operation_info, param_overrides=None, capture_exchange=False):
+        overrides = param_overrides or {}
+        with self.lock:
+            self.calls.append((operation_info['operation_id'], dict(overrides)))
+        result = {'method': operation_info['method'], 'path': operation_info['path'], 'status': 'PASS'}
+        if capture_exchange:
+            body = {'id': 7} if operation_info['operation_id'] == 'createUser' else {'post': {'key': 'p-1'}}
+            result['exchange'] = {'path': overrides, 'query': {}, 'body': body, 'headers': {}}
+        return result
+
+
+class TestExpressions:
+    """Тесты для runtime expressions."""
+
+    def test_evaluate(self):
+        """Тест вычисления выражений по запросу и ответу."""
+        exchange = {
+            'path': {'id': 3},
+            'query': {},
+            'body': {'items': [{'id': 'a/b'}]},
+            'headers': {'Location': 'http://api/things/42/'}
+        }
+        assert evaluate_expression('$response.body#/items/0/id', exchange) == 'a/b'
+        assert evaluate_expression('$response.header.Location', exchange) == '42'
+        assert evaluate_expression('$request.path.id', exchange) == 3
+        assert evaluate_expression('$response.body#/missing', exchange) is _MISSING
+
+
+class TestWorkflowPlan:
+    """Тесты для построения плана."""
+
+    def test_collection_and_explicit_links(self):
+        """Тест связей POST коллекции и OpenAPI links."""
+        plan = make_plan()
+        create_user = step(plan, 'createUser').index
+        create_post = step(plan, 'createPost').index
+
+        assert step(plan, 'getUser').dependencies == {create_user}
+        assert step(plan, 'createPost').dependencies == {create_user}
+        assert step(plan, 'getPost').bindings['postId'].expressions == ('$response.body#/post/key',)
+        assert step(plan, 'getPost').dependencies == {create_post}
+        assert step(plan, 'health').dependencies == set()
+
+    def test_teardown_is_reverse_of_creation(self):
+        """Тест: очистка удаляет сначала вложенные ресурсы."""
+        plan = make_plan()
+        teardown = [s.operation['operation_id'] for s in plan.teardown_steps]
+        assert teardown == ['deletePost', 'deleteUser']
+
+    def test_consumer_of_teardown_is_blocked(self):
+        """Тест: операция, зависящая от шага очистки, исключается из основного этапа."""
+        data = copy.deepcopy(SPEC_DATA)
+        data['paths']['/users/{userId}']['delete']['responses']['204']['links'] = {
+            'GetJob': {'operationId': 'getJob', 'parameters': {'jobId': '$response.header.Location'}}
+        }
+        data['paths']['/jobs/{jobId}'] = {'get': {'operationId': 'getJob', 'responses': OK}}
+        plan = WorkflowPlan(OpenAPIParser().get_all_operations(OpenAPISpec(**data)))
+
+        assert plan.blocked == {step(plan, 'getJob').index}
+        assert step(plan, 'getJob').index not in sum(plan.dependents().values(), [])
+
+        calls, lock = [], threading.Lock()
+        results = WorkflowRunner(lambda: FakeTester(calls, lock), 'http://api').run(plan)
+        assert len(results) == len(plan.steps) - 1
+        assert 'getJob' not in dict(calls)
+
+
+class TestWorkflowRunner:
+    """Тесты для выполнения плана."""
+
+    def test_values_flow_to_consumers(self):
+        """Тест подстановки значений и порядка выполнения."""
+        calls, lock = [], threading.Lock()
+        plan = make_plan()
+        results = WorkflowRunner(lambda: FakeTester(calls, lock), 'http://api', workers=4).run(plan)
+
+        assert len(results) == len(plan.steps)
+        assert all('exchange' not in result for result in results)
+
+        order = [operation_id for operation_id, _ in calls]
+        overrides = dict(calls)
+        assert overrides['getUser'] == {'userId': 7}
+        assert overrides['createPost'] == {'userId': 7}
+        assert overrides['getPost'] == {'postId': 'p-1', 'userId': 7}
+        assert order.index('createUser') < order.index('createPost') < order.index('getPost')
+        assert order[-2:] == ['deletePost', 'deleteUser']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])